@@ -0,0 +1,51 @@
+import binascii
+
+import tensorflow as tf
+from flask import Flask, request, jsonify, render_template
+from flask_cors import CORS, cross_origin
+from src.config.configuration import ConfigurationManager
+from src.inference.prediction import Prediction
+from src.models.registry import get_model_registry
+
+
+app = Flask(__name__)
+CORS(app)
+
+prediction = Prediction(ConfigurationManager().get_prediction_config())
+
+
+@app.route("/", methods=["GET"])
+@cross_origin()
+def home():
+    return render_template("index.html")
+
+
+@app.route("/health", methods=["GET"])
+@cross_origin()
+def health():
+    return jsonify({
+        "status": "ok",
+        "batching": prediction.batcher.stats(),
+        "prediction_cache": prediction.cache.stats() if prediction.cache is not None else None,
+        "model_registry": get_model_registry().stats()
+    })
+
+
+@app.route("/predict", methods=["POST"])
+@cross_origin()
+def predict():
+    body = request.get_json(silent=True)
+    if not isinstance(body, dict):
+        return jsonify({"error": "Expected a JSON object body"}), 400
+    image = body.get("image")
+    if not isinstance(image, str):
+        return jsonify({"error": "\"image\" must be a base64 encoded image string"}), 400
+    try:
+        return jsonify(prediction.predict(image))
+    except (binascii.Error, tf.errors.InvalidArgumentError):
+        return jsonify({"error": "Could not decode the image; expected a base64 encoded JPEG, PNG, GIF or BMP"}), 400
+
+
+if __name__ == "__main__":
+    # threaded=True lets concurrent requests reach the micro-batcher together.
+    app.run(host="0.0.0.0", port=8080, threaded=True)
@@ -0,0 +1,44 @@
+"""
+Compare FLOPs, parameter counts and batch-1 CPU latency of every backbone/head combination.
+
+Backbones are built with random weights (nothing is downloaded) and the
+same head-building code as ``BaseModel._prepare_full_model``. Run from the
+repository root:
+
+    python -m benchmarks.bench_architectures --samples 20
+"""
+import argparse
+
+import tensorflow as tf
+
+from src.models.architectures import BACKBONES, HEADS, build_backbone, profile_model
+from src.models.base_model import BaseModel
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--image-size", type=int, default=224)
+    parser.add_argument("--classes", type=int, default=2)
+    parser.add_argument("--samples", type=int, default=20)
+    parser.add_argument("--backbones", nargs="+", default=sorted(BACKBONES), choices=sorted(BACKBONES))
+    parser.add_argument("--heads", nargs="+", default=sorted(HEADS), choices=sorted(HEADS))
+    args = parser.parse_args()
+
+    print(f"{'backbone':<18}{'head':<14}{'GFLOPs':>10}{'params':>14}{'head params':>14}{'CPU ms':>10}")
+    for name in args.backbones:
+        for head in args.heads:
+            backbone = build_backbone(name, [args.image_size, args.image_size, 3], weights=None, include_top=False)
+            model = BaseModel._prepare_full_model(
+                model=backbone, classes=args.classes, freeze_all=True, freeze_till=None,
+                learning_rate=0.01, head=head, dropout=0.2
+            )
+            report = profile_model(model, backbone, args.samples)
+            print(
+                f"{name:<18}{head:<14}{report['flops'] / 1e9:>10.2f}{report['parameters']:>14}"
+                f"{report['head_parameters']:>14}{report['cpu_latency_ms']:>10.1f}"
+            )
+            tf.keras.backend.clear_session()
+
+
+if __name__ == "__main__":
+    main()
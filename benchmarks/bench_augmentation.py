@@ -0,0 +1,71 @@
+"""
+Compare augmented images/sec of ImageDataGenerator and the vectorized AffineAugmentation.
+
+Both augment the same synthetic batch with the training ranges (rotation 40,
+shifts, shear and zoom of 0.2, horizontal flip, nearest fill), so only the
+augmentation itself is timed. Run from the repository root:
+
+    python -m benchmarks.bench_augmentation --batch-size 16 --batches 20
+"""
+import argparse
+import time
+
+import numpy as np
+import tensorflow as tf
+
+from src.preprocess.augmentation import AffineAugmentation
+
+
+def time_batches(augment, images, num_batches: int, warmup: int = 2) -> float:
+    """
+    Time ``num_batches`` calls of ``augment(images)`` after a short warm-up.
+
+    Returns:
+    - float: Images per second over the timed batches.
+    """
+    for _ in range(warmup):
+        augment(images)
+
+    start = time.perf_counter()
+    for _ in range(num_batches):
+        augment(images)
+    return num_batches * len(images) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--batches", type=int, default=20)
+    parser.add_argument("--image-size", type=int, default=224)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    images = rng.random((args.batch_size, args.image_size, args.image_size, 3), dtype=np.float32)
+
+    datagenerator = tf.keras.preprocessing.image.ImageDataGenerator(
+        rotation_range=40,
+        horizontal_flip=True,
+        width_shift_range=0.2,
+        height_shift_range=0.2,
+        shear_range=0.2,
+        zoom_range=0.2
+    )
+    generator_rate = time_batches(
+        lambda batch: np.stack([datagenerator.random_transform(image, seed=None) for image in batch]),
+        images, args.batches
+    )
+
+    augmentation = AffineAugmentation(seed=args.seed)
+    augment = tf.function(augmentation.__call__)
+    batch = tf.constant(images)
+    vectorized_rate = time_batches(lambda _: augment(batch).numpy(), images, args.batches)
+
+    print(f"{'augmentation':<24}{'images/sec':>12}")
+    print(f"{'ImageDataGenerator':<24}{generator_rate:>12.1f}")
+    print(f"{'AffineAugmentation':<24}{vectorized_rate:>12.1f}")
+    print(f"speed-up: {vectorized_rate / generator_rate:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
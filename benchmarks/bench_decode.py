@@ -0,0 +1,91 @@
+"""
+Compare the file round trip and the in-memory decode of base64 prediction uploads.
+
+Both paths turn the same base64-encoded synthetic CT slices into a rescaled
+batch of ``--batch-size`` model inputs:
+
+- file: ``decode_image`` writes each upload to a temporary file, which is
+  read back with ``input_pipeline.load_image``, rescaled and stacked (the
+  previous ``Prediction.load_image``);
+- memory: ``base64_decoder`` (behind ``Prediction.decode``) decodes the
+  base64 buffer in memory, and the uint8 pixels are copied into a reused
+  float32 buffer and rescaled in place (what ``MicroBatcher`` and
+  ``Prediction._predict_batch`` do).
+
+Run from the repository root (``--tmp-dir`` should be on the disk the server uses):
+
+    python -m benchmarks.bench_decode --images 256 --batch-size 16
+"""
+import os
+import io
+import base64
+import argparse
+import tempfile
+import time
+
+import numpy as np
+from PIL import Image
+
+from benchmarks.synthetic import ct_slice
+from src.inference.prediction import base64_decoder
+from src.preprocess import input_pipeline
+from src.utils.common import decode_image
+
+
+def file_round_trip(imgstring: str, image_size, tmp_dir: str) -> np.ndarray:
+    fd, file_name = tempfile.mkstemp(dir=tmp_dir)
+    os.close(fd)
+    try:
+        decode_image(imgstring, file_name)
+        image = input_pipeline.load_image(file_name, image_size)
+    finally:
+        os.remove(file_name)
+    return input_pipeline.rescale(image).numpy()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--images", type=int, default=256)
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--source-size", type=int, default=512, help="side of the uploaded PNG")
+    parser.add_argument("--image-size", type=int, nargs=3, default=[224, 224, 3])
+    parser.add_argument("--tmp-dir", default=None, help="directory for the file round trip's temporary files")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    uploads = []
+    for _ in range(args.batch_size):
+        buffer = io.BytesIO()
+        Image.fromarray(ct_slice(rng, args.source_size, 2)).convert("RGB").save(buffer, format="PNG")
+        uploads.append(base64.b64encode(buffer.getvalue()).decode())
+
+    decode = base64_decoder(args.image_size)
+    buffer = np.empty((args.batch_size, *args.image_size), dtype=np.float32)
+
+    def file_batch():
+        return np.stack([file_round_trip(upload, args.image_size, args.tmp_dir) for upload in uploads])
+
+    def memory_batch():
+        for row, upload in enumerate(uploads):
+            buffer[row] = decode(upload)
+        np.multiply(buffer, np.float32(1. / 255), out=buffer)
+        return buffer
+
+    np.testing.assert_allclose(file_batch(), memory_batch(), atol=1e-6)
+
+    batches = max(1, args.images // args.batch_size)
+    print(f"{'path':<10}{'images/sec':>12}{'ms/image':>10}")
+    rates = {}
+    for name, run in (("file", file_batch), ("memory", memory_batch)):
+        start = time.perf_counter()
+        for _ in range(batches):
+            run()
+        elapsed = time.perf_counter() - start
+        rates[name] = batches * args.batch_size / elapsed
+        print(f"{name:<10}{rates[name]:>12.1f}{1000 / rates[name]:>10.2f}")
+    print(f"speed-up: {rates['memory'] / rates['file']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Compare cold and warm data-ingestion startup.
+
+Builds a synthetic archive, serves it through a file:// URL (or a local HTTP
+server with --http) and times the data ingestion stage twice: once into an
+empty directory (cold) and once more on top of the first run (warm).
+
+    python -m benchmarks.bench_ingestion_startup --size-mb 200
+"""
+import os
+import time
+import zipfile
+import argparse
+import tempfile
+import threading
+import functools
+from pathlib import Path
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+from src.entity.config_entity import DataIngestionConfig
+from src.preprocess.data_ingestion import DataIngestion
+
+
+def make_archive(path: Path, size_mb: int, file_kb: int = 64):
+    """
+    Write a zip shaped like the Chest-CT-Scan-data archive, filled with random bytes.
+    """
+    count = max(1, size_mb * 1024 // file_kb)
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_STORED) as archive:
+        for index in range(count):
+            class_name = ("adenocarcinoma", "normal")[index % 2]
+            archive.writestr(f"Chest-CT-Scan-data/{class_name}/{index:06d}.png", os.urandom(file_kb * 1024))
+
+
+def run_ingestion(url: str, root_dir: Path) -> float:
+    """
+    Run download and extraction once and return the elapsed seconds.
+    """
+    config = DataIngestionConfig(
+        root_dir=root_dir,
+        source_URL=url,
+        local_data_file=root_dir / "data.zip",
+        unzip_dir=root_dir,
+        manifest_file=root_dir / "data.zip.manifest.json",
+        sha256=None,
+        chunk_size=1024 * 1024,
+        max_retries=1,
+        extract_manifest_file=root_dir / "extract_manifest.json",
+        extract_workers=8,
+        extract_to_cache=False
+    )
+    start = time.perf_counter()
+    data_ingestion = DataIngestion(config=config)
+    data_ingestion.download_file()
+    data_ingestion.extract_zip_file()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=int, default=100)
+    parser.add_argument("--http", action="store_true", help="serve the archive over a local HTTP server")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        (tmp / "source").mkdir()
+        archive = tmp / "source" / "data.zip"
+        make_archive(archive, args.size_mb)
+
+        if args.http:
+            handler = functools.partial(SimpleHTTPRequestHandler, directory=str(archive.parent))
+            server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            url = f"http://127.0.0.1:{server.server_address[1]}/data.zip"
+        else:
+            url = archive.as_uri()
+
+        root_dir = tmp / "data_ingestion"
+        cold = run_ingestion(url, root_dir)
+        warm = run_ingestion(url, root_dir)
+
+        print(f"archive: {args.size_mb} MB via {'http' if args.http else 'file'}")
+        print(f"cold startup: {cold:.2f}s")
+        print(f"warm startup: {warm:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
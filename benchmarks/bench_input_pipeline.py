@@ -0,0 +1,104 @@
+"""
+Compare images/sec of the ImageDataGenerator, tf.data and image-cache input pipelines.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_input_pipeline --data-dir artifacts/data_ingestion/Chest-CT-Scan-data
+
+The "cache" pipeline is only measured when --cache-dir holds a built image cache.
+"""
+import argparse
+import time
+from pathlib import Path
+
+from src.entity.config_entity import TrainingConfig, EvaluationConfig
+from src.training.training import Training
+from src.inference.inference import Evaluation
+
+
+def images_per_second(batches, num_batches: int, warmup: int = 2) -> float:
+    """
+    Time ``num_batches`` batches from an iterable after a short warm-up.
+
+    Args:
+    - batches: Iterable of (images, labels) batches.
+    - num_batches (int): Number of timed batches.
+    - warmup (int): Number of untimed batches pulled first.
+
+    Returns:
+    - float: Images per second over the timed batches.
+    """
+    iterator = iter(batches)
+    for _ in range(warmup):
+        next(iterator)
+
+    images = 0
+    start = time.perf_counter()
+    for _ in range(num_batches):
+        x, _ = next(iterator)
+        images += len(x)
+    return images / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data-dir", default="artifacts/data_ingestion/Chest-CT-Scan-data")
+    parser.add_argument("--cache-dir", default="artifacts/image_cache")
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--batches", type=int, default=20)
+    args = parser.parse_args()
+
+    image_size = [224, 224, 3]
+    pipelines = ["generator", "tf_data"]
+    if (Path(args.cache_dir) / "manifest.json").exists():
+        pipelines.append("cache")
+    print(f"{'stage':<12}{'augmentation':<14}{'pipeline':<12}{'images/sec':>12}")
+
+    for augmentation in (False, True):
+        for pipeline in pipelines:
+            training = Training(TrainingConfig(
+                root_dir=Path("artifacts/training"),
+                trained_model_path=Path("artifacts/training/model.h5"),
+                updated_base_model_path=Path("artifacts/prepare_base_model/base_model_updated.h5"),
+                training_data=Path(args.data_dir),
+                image_cache_dir=Path(args.cache_dir),
+                bottleneck_dir=Path("artifacts/training/bottleneck"),
+                checkpoint_dir=Path("artifacts/training/checkpoints"),
+                params_epochs=1,
+                params_batch_size=args.batch_size,
+                params_is_augmentation=augmentation,
+                params_image_size=image_size,
+                params_input_pipeline=pipeline,
+                params_training_mode="full",
+                params_checkpoint_every_steps=0,
+                params_checkpoint_max_size_mb=0,
+                params_use_best_checkpoint=False,
+                params_augmentation_seed=0
+            ))
+            training.train_valid_generator()
+            # The generators loop forever; tf.data datasets are repeated to match.
+            batches = training.train_generator if pipeline == "generator" else training.train_generator.repeat()
+            rate = images_per_second(batches, args.batches)
+            print(f"{'training':<12}{str(augmentation):<14}{pipeline:<12}{rate:>12.1f}")
+
+    for pipeline in pipelines:
+        evaluation = Evaluation(EvaluationConfig(
+            path_of_model=Path("artifacts/training/model.h5"),
+            training_data=Path(args.data_dir),
+            image_cache_dir=Path(args.cache_dir),
+            all_params={},
+            mlflow_uri="",
+            params_image_size=image_size,
+            params_batch_size=args.batch_size,
+            params_input_pipeline=pipeline,
+            params_class_names=["adenocarcinoma", "normal"],
+            registered_model_name=""
+        ))
+        evaluation._valid_generator()
+        batches = evaluation.valid_generator if pipeline == "generator" else evaluation.valid_generator.repeat()
+        rate = images_per_second(batches, args.batches)
+        print(f"{'evaluation':<12}{'False':<14}{pipeline:<12}{rate:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Track the startup cost of every main.py subcommand.
+
+Each measurement runs in a fresh interpreter: the time and peak RSS of
+importing the CLI plus the pipeline module of one stage (everything a stage
+subcommand loads before it starts working), and the full wall time of
+`main.py check-config`. The heavy modules each subcommand pulled in are
+listed, so a stray top-level TensorFlow or MLflow import shows up at once.
+Results are compared with a stored baseline like ``benchmarks.suite``.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_startup                    # compare with benchmarks/startup_baseline.json
+    python -m benchmarks.bench_startup --save-baseline    # record a new baseline
+"""
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+from pathlib import Path
+
+from benchmarks.reporting import metric, compare
+from src.config.configuration import ConfigurationManager
+from src.pipeline.stages import build_stages
+from src.utils.common import save_json
+
+
+HEAVY_MODULES = ("tensorflow", "keras", "mlflow", "numpy", "PIL")
+
+# Run in the child interpreter; {imports} is replaced with the statements to time.
+PROBE = """
+import sys, json, time, resource
+start = time.perf_counter()
+{imports}
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    "seconds": elapsed,
+    "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "heavy": [name for name in {heavy!r} if name in sys.modules]
+}}))
+"""
+
+
+def probe(imports: str) -> dict:
+    """
+    Time ``imports`` in a fresh interpreter.
+    """
+    code = PROBE.format(imports=imports, heavy=HEAVY_MODULES)
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def wall_time(args: list) -> float:
+    """
+    Wall time of running ``python main.py <args>`` to completion, in seconds.
+    """
+    code = (
+        "import sys, time, runpy; start = time.perf_counter(); sys.argv = ['main.py'] + {args!r}\n"
+        "try:\n    runpy.run_path('main.py', run_name='__main__')\n"
+        "except SystemExit:\n    pass\n"
+        "print(time.perf_counter() - start)"
+    ).format(args=args)
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeats", type=int, default=5, help="fresh interpreters per measurement")
+    parser.add_argument("--output", default="artifacts/benchmarks/startup.json")
+    parser.add_argument("--baseline", default="benchmarks/startup_baseline.json")
+    parser.add_argument("--save-baseline", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative slowdown")
+    args = parser.parse_args()
+
+    config = ConfigurationManager(create_dirs=False)
+    stages = build_stages(config.config, config.params)
+    commands = {"cli": "import main"}
+    for stage in stages:
+        commands[stage.key] = (
+            "import main\nfrom src.pipeline.stage_runner import load_pipeline\n"
+            f"load_pipeline({stage.pipeline!r})"
+        )
+
+    results, heavy = {}, {}
+    print(f"{'subcommand':<20}{'import s':>10}{'RSS MB':>10}  heavy modules")
+    for name, imports in commands.items():
+        runs = [probe(imports) for _ in range(args.repeats)]
+        seconds = statistics.median(run["seconds"] for run in runs)
+        rss_mb = statistics.median(run["rss_mb"] for run in runs)
+        heavy[name] = runs[-1]["heavy"]
+        results[f"startup.{name}.import"] = metric(seconds, "s", False)
+        results[f"startup.{name}.rss"] = metric(rss_mb, "MB", False)
+        print(f"{name:<20}{seconds:>10.2f}{rss_mb:>10.0f}  {', '.join(heavy[name]) or '-'}")
+
+    check_seconds = statistics.median(wall_time(["check-config"]) for _ in range(args.repeats))
+    results["startup.check-config.wall"] = metric(check_seconds, "s", False)
+    print(f"{'check-config':<20}{check_seconds:>10.2f}{'':>10}  (whole command)")
+
+    report = {"settings": {"repeats": args.repeats}, "heavy_modules": heavy, "metrics": results}
+    Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+    save_json(path=Path(args.output), data=report)
+
+    if args.save_baseline:
+        save_json(path=Path(args.baseline), data=report)
+        print(f"Saved baseline to {args.baseline}")
+        return
+
+    if not Path(args.baseline).exists():
+        print(f"No baseline at {args.baseline}; run with --save-baseline to record one")
+        return
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline["metrics"], args.tolerance)
+    if regressions:
+        print(f"{len(regressions)} metric(s) regressed by more than {args.tolerance:.0%}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Load-test the prediction server at several concurrency levels.
+
+Start the server with ``python app.py`` and run from the repository root:
+
+    python -m benchmarks.load_test --image path/to/scan.png --concurrency 1 4 16 32
+
+Reports p50/p99 latency and throughput for each concurrency level.
+"""
+import json
+import time
+import argparse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from src.utils.common import encode_image_into_base64
+
+
+def percentile(values: list, q: float) -> float:
+    """
+    Nearest-rank percentile of a list of values.
+    """
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(q / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def send(url: str, body: bytes) -> float:
+    """
+    Send one prediction request and return its latency in seconds.
+    """
+    request = urllib.request.Request(url, data=body, headers={"Content-Type": "application/json"})
+    start = time.perf_counter()
+    with urllib.request.urlopen(request) as response:
+        response.read()
+    return time.perf_counter() - start
+
+
+def run_level(url: str, body: bytes, concurrency: int, requests: int) -> dict:
+    """
+    Send ``requests`` requests with ``concurrency`` clients in flight.
+    """
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        latencies = list(executor.map(lambda _: send(url, body), range(requests)))
+    elapsed = time.perf_counter() - start
+    return {
+        "concurrency": concurrency,
+        "requests": requests,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "throughput_rps": requests / elapsed
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8080/predict")
+    parser.add_argument("--image", required=True)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 32])
+    parser.add_argument("--requests", type=int, default=200, help="requests per concurrency level")
+    args = parser.parse_args()
+
+    body = json.dumps({"image": encode_image_into_base64(args.image).decode()}).encode()
+    send(args.url, body)  # warm-up
+
+    print(f"{'concurrency':>12}{'p50 ms':>10}{'p99 ms':>10}{'req/sec':>10}")
+    for concurrency in args.concurrency:
+        result = run_level(args.url, body, concurrency, args.requests)
+        print(f"{result['concurrency']:>12}{result['p50_ms']:>10.1f}{result['p99_ms']:>10.1f}{result['throughput_rps']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+"""
+Metric records and baseline comparison shared by the benchmarks.
+"""
+
+
+def metric(value: float, unit: str, higher_is_better: bool) -> dict:
+    return {"value": value, "unit": unit, "higher_is_better": higher_is_better}
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """
+    Compare metrics with a baseline.
+
+    Returns:
+    - list: (name, baseline value, current value, relative change) of every
+      metric worse than the baseline by more than ``tolerance``.
+    """
+    regressions = []
+    print(f"{'metric':<32}{'baseline':>12}{'current':>12}{'change':>10}")
+    for name, current in results.items():
+        if name not in baseline:
+            print(f"{name:<32}{'-':>12}{current['value']:>12.2f}{'new':>10}")
+            continue
+        before = baseline[name]["value"]
+        change = (current["value"] - before) / before if before else 0.0
+        worse = -change if current["higher_is_better"] else change
+        flag = "  REGRESSION" if worse > tolerance else ""
+        print(f"{name:<32}{before:>12.2f}{current['value']:>12.2f}{change:>+10.1%}{flag}")
+        if flag:
+            regressions.append((name, before, current["value"], change))
+    return regressions
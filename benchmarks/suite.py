@@ -0,0 +1,214 @@
+"""
+Benchmark suite on a synthetic CT-like dataset.
+
+Measures input throughput of ``Training.train_valid_generator`` and
+``Evaluation._valid_generator`` for every input pipeline, the train-step time
+of the model built by ``BaseModel._prepare_full_model``, model load time and
+batch-1 / batch-N predict latency. Results are written as JSON and compared
+with a stored baseline; a metric worse than the baseline by more than
+--tolerance is reported as a regression and makes the run exit non-zero.
+
+Run from the repository root:
+
+    python -m benchmarks.suite                       # compare with benchmarks/baseline.json
+    python -m benchmarks.suite --save-baseline       # record a new baseline
+
+Backbone weights are random (weights=None), so nothing is downloaded.
+"""
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import tensorflow as tf
+
+from benchmarks.synthetic import make_ct_dataset
+from benchmarks.bench_input_pipeline import images_per_second
+from benchmarks.reporting import metric, compare
+from src.entity.config_entity import TrainingConfig, EvaluationConfig, ImageCacheConfig
+from src.models.base_model import BaseModel
+from src.preprocess.image_cache import ImageCache
+from src.preprocess.input_pipeline import INPUT_PIPELINES
+from src.training.training import Training
+from src.inference.inference import Evaluation
+from src.utils.common import save_json
+
+
+def percentiles(samples) -> dict:
+    """
+    p50/p99 of latency samples, in milliseconds.
+    """
+    samples_ms = np.asarray(samples) * 1000
+    return {
+        "p50": metric(float(np.percentile(samples_ms, 50)), "ms", False),
+        "p99": metric(float(np.percentile(samples_ms, 99)), "ms", False)
+    }
+
+
+def timed(fn, repeats: int, warmup: int = 2) -> list:
+    """
+    Call ``fn`` ``warmup`` times untimed, then return ``repeats`` wall times in seconds.
+    """
+    for _ in range(warmup):
+        fn()
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def bench_input(args, data_dir: Path, cache_dir: Path) -> dict:
+    """
+    Images/sec of the training and evaluation inputs for every input pipeline.
+    """
+    results = {}
+    for pipeline in INPUT_PIPELINES:
+        training = Training(TrainingConfig(
+            root_dir=Path(args.workdir),
+            trained_model_path=Path(args.workdir) / "model.h5",
+            updated_base_model_path=Path(args.workdir) / "base_model_updated.h5",
+            training_data=data_dir,
+            image_cache_dir=cache_dir,
+            bottleneck_dir=Path(args.workdir) / "bottleneck",
+            checkpoint_dir=Path(args.workdir) / "checkpoints",
+            params_epochs=1,
+            params_batch_size=args.batch_size,
+            params_is_augmentation=True,
+            params_image_size=args.image_size,
+            params_input_pipeline=pipeline,
+            params_training_mode="full",
+            params_checkpoint_every_steps=0,
+            params_checkpoint_max_size_mb=0,
+            params_use_best_checkpoint=False,
+            params_augmentation_seed=args.seed
+        ))
+        training.train_valid_generator()
+        # The generators loop forever; tf.data datasets are repeated to match.
+        batches = training.train_generator if pipeline == "generator" else training.train_generator.repeat()
+        rate = images_per_second(batches, args.batches)
+        results[f"train_input.{pipeline}"] = metric(rate, "images/sec", True)
+
+        evaluation = Evaluation(EvaluationConfig(
+            path_of_model=Path(args.workdir) / "model.h5",
+            training_data=data_dir,
+            image_cache_dir=cache_dir,
+            all_params={},
+            mlflow_uri="",
+            params_image_size=args.image_size,
+            params_batch_size=args.batch_size,
+            params_input_pipeline=pipeline,
+            params_class_names=["adenocarcinoma", "normal"],
+            registered_model_name=""
+        ))
+        evaluation._valid_generator()
+        batches = evaluation.valid_generator if pipeline == "generator" else evaluation.valid_generator.repeat()
+        rate = images_per_second(batches, args.batches)
+        results[f"eval_input.{pipeline}"] = metric(rate, "images/sec", True)
+    return results
+
+
+def bench_model(args) -> dict:
+    """
+    Train-step time, model load time and predict latency of the full model.
+    """
+    backbone = tf.keras.applications.vgg16.VGG16(
+        input_shape=args.image_size, weights=None, include_top=False
+    )
+    model = BaseModel._prepare_full_model(
+        model=backbone, classes=2, freeze_all=True, freeze_till=None, learning_rate=0.01
+    )
+
+    rng = np.random.default_rng(args.seed)
+    x = rng.random((args.batch_size, *args.image_size), dtype=np.float32)
+    y = tf.one_hot(rng.integers(0, 2, args.batch_size), 2)
+
+    results = {}
+    step_times = timed(lambda: model.train_on_batch(x, y), args.repeats)
+    results["train_step"] = metric(float(np.median(step_times)) * 1000, "ms", False)
+
+    path = Path(args.workdir) / "model.h5"
+    model.save(path)
+    load_times = timed(lambda: tf.keras.models.load_model(path), max(1, args.repeats // 10), warmup=1)
+    results["model_load"] = metric(float(np.median(load_times)), "s", False)
+
+    for batch_size in (1, args.batch_size):
+        batch = x[:batch_size]
+        latencies = timed(lambda: model.predict_on_batch(batch), args.repeats)
+        for name, value in percentiles(latencies).items():
+            results[f"predict.batch_{batch_size}.{name}"] = value
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--per-class", type=int, default=64, help="synthetic images per class")
+    parser.add_argument("--image-size", type=int, nargs=3, default=[224, 224, 3])
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--batches", type=int, default=10, help="timed batches per input benchmark")
+    parser.add_argument("--repeats", type=int, default=20, help="timed calls per model benchmark")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="artifacts/benchmarks/results.json")
+    parser.add_argument("--baseline", default="benchmarks/baseline.json")
+    parser.add_argument("--save-baseline", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="allowed relative slowdown")
+    parser.add_argument("--workdir", default=None, help="scratch directory; a temporary one by default")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        args.workdir = args.workdir or tmp
+        data_dir = make_ct_dataset(Path(args.workdir) / "Chest-CT-Scan-data", args.per_class, seed=args.seed)
+        cache_dir = Path(args.workdir) / "image_cache"
+        ImageCache(ImageCacheConfig(
+            root_dir=cache_dir,
+            training_data=data_dir,
+            params_image_size=args.image_size,
+            params_shard_size=1024
+        )).build()
+
+        results = bench_input(args, data_dir, cache_dir)
+        results.update(bench_model(args))
+
+    report = {
+        "environment": {
+            "python": platform.python_version(),
+            "tensorflow": tf.__version__,
+            "platform": platform.platform(),
+            "gpus": len(tf.config.list_physical_devices("GPU"))
+        },
+        "settings": {
+            "per_class": args.per_class,
+            "image_size": args.image_size,
+            "batch_size": args.batch_size,
+            "batches": args.batches,
+            "repeats": args.repeats
+        },
+        "metrics": results
+    }
+    Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+    save_json(path=Path(args.output), data=report)
+
+    if args.save_baseline:
+        save_json(path=Path(args.baseline), data=report)
+        print(f"Saved baseline to {args.baseline}")
+        return
+
+    if not Path(args.baseline).exists():
+        print(f"No baseline at {args.baseline}; run with --save-baseline to record one")
+        return
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline["metrics"], args.tolerance)
+    if regressions:
+        print(f"{len(regressions)} metric(s) regressed by more than {args.tolerance:.0%}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,50 +1,106 @@
-from pipeline.inference_pipeline import EvaluationPipeline
-from src.constants import constants
-from pipeline.data_ingestion_pipeline import DataIngestionTrainingPipeline
-from pipeline.base_model_configuration_pipeline import BaseModelConfigurationPipeline
-from pipeline.training_pipeline import ModelTrainingPipeline
-from src.logging import logger
+import argparse
+import inspect
+import sys
+from src.config.configuration import ConfigurationManager
+from src.pipeline.stage_runner import StageRunner
+from src.pipeline.scheduler import StageScheduler
+from src.pipeline.stages import build_stages, check_stages
+
+# Only the lightweight orchestration modules are imported here: each stage
+# imports TensorFlow, MLflow and the other heavy dependencies itself when it
+# runs, so `check-config` and the data stages start in a fraction of a second.
+
+
+def build_parser(stages) -> argparse.ArgumentParser:
+    """
+    Build the command line: the whole pipeline by default, or one subcommand per stage.
+    """
+    stage_keys = [stage.key for stage in stages]
+
+    parser = argparse.ArgumentParser(description="Run the chest cancer classification pipeline.")
+    parser.add_argument(
+        "--force", nargs="*", metavar="STAGE", choices=stage_keys,
+        help="re-run the given stages even if their inputs are unchanged; all stages if none are given"
+    )
+    parser.add_argument(
+        "--trace", nargs="*", metavar="STAGE", choices=stage_keys,
+        help="capture a TensorFlow profiler trace of the given stages; training and evaluation if none are given"
+    )
+    parser.add_argument(
+        "--in-process", action="store_true",
+        help="run the stages one after another in this process, handing models between them in memory"
+    )
+
+    commands = parser.add_subparsers(dest="command", metavar="COMMAND")
+    commands.add_parser("check-config", help="check config.yaml, params.yaml and the stage graph without running anything")
+    for stage in stages:
+        command = commands.add_parser(stage.key, help=f"run only the {stage.name}, in this process")
+        command.add_argument("--force", dest="force_stage", action="store_true",
+                             help="run even if the inputs are unchanged")
+        command.add_argument("--trace", dest="trace_stage", action="store_true",
+                             help="capture a TensorFlow profiler trace")
+    return parser
+
+
+def check_config(config: ConfigurationManager, stages) -> int:
+    """
+    Build every configuration and check the stage declarations; return the exit code.
+
+    ``config`` must not create directories, so the check leaves no artifacts behind.
+    """
+    problems = check_stages(stages, config.config, config.params)
+    for name, getter in inspect.getmembers(config, inspect.ismethod):
+        if name.startswith("get_") and name.endswith("_config"):
+            try:
+                getter()
+            except Exception as e:
+                problems.append(f"{name}: {e!r}")
+
+    runner = StageRunner(config.get_stage_runner_config())
+    for stage in stages:
+        state = "up to date" if runner.is_up_to_date(stage, runner.fingerprint(stage)) else "will run"
+        depends = ", ".join(stage.depends_on) or "-"
+        print(f"{stage.key:<20}{state:<12}depends on {depends}")
+
+    for problem in problems:
+        print(f"error: {problem}")
+    print("configuration OK" if not problems else f"{len(problems)} problem(s) found")
+    return 1 if problems else 0
+
+
+def main():
+    # The stages build their own configurations, creating their directories as they run.
+    config = ConfigurationManager(create_dirs=False)
+    stages = build_stages(config.config, config.params)
+    args = build_parser(stages).parse_args()
+
+    if args.command == "check-config":
+        sys.exit(check_config(config, stages))
+
+    if args.command is not None:
+        stage = next(stage for stage in stages if stage.key == args.command)
+        runner = StageRunner(
+            config.get_stage_runner_config(),
+            force=[stage.key] if args.force_stage else [],
+            trace=[stage.key] if args.trace_stage else None
+        )
+        runner.run(stage)
+        return
+
+    stage_keys = [stage.key for stage in stages]
+    if args.force is None:
+        force = []
+    else:
+        force = args.force or stage_keys
+
+    if args.trace is None:
+        trace = None
+    else:
+        trace = args.trace or ["training", "evaluation"]
+
+    runner = StageRunner(config.get_stage_runner_config(), force=force, trace=trace)
+    StageScheduler(runner, stages, in_process=args.in_process).run()
 
 
 if __name__ == '__main__':
-    try:
-        logger.info(f">>>>>> Stage {constants.DATA_INGESTION_STEP} started <<<<<<")
-        obj = DataIngestionTrainingPipeline()
-        obj.main()
-        logger.info(f">>>>>> Stage {constants.DATA_INGESTION_STEP} completed <<<<<<\n\nx==========x")
-    except Exception as e:
-        logger.exception(e)
-        raise e
-
-
-    try: 
-        logger.info(f"*******************")
-        logger.info(f">>>>>> stage {constants.PREPARE_BASE_MODEL_STEP} started <<<<<<")
-        prepare_base_model = BaseModelConfigurationPipeline()
-        prepare_base_model.main()
-        logger.info(f">>>>>> stage {constants.PREPARE_BASE_MODEL_STEP} completed <<<<<<\n\nx==========x")
-    except Exception as e:
-            logger.exception(e)
-            raise e
-    
-
-    try: 
-        logger.info(f"*******************")
-        logger.info(f">>>>>> stage {constants.TRAINING_STEP} started <<<<<<")
-        model_trainer = ModelTrainingPipeline()
-        model_trainer.main()
-        logger.info(f">>>>>> stage {constants.TRAINING_STEP} completed <<<<<<\n\nx==========x")
-    except Exception as e:
-            logger.exception(e)
-            raise e
-    
-
-    try:
-        logger.info(f"*******************")
-        logger.info(f">>>>>> stage {constants.INFERENCE_STEP} started <<<<<<")
-        obj = EvaluationPipeline()
-        obj.main()
-        logger.info(f">>>>>> stage {constants.INFERENCE_STEP} completed <<<<<<\n\nx==========x")
-    except Exception as e:
-        logger.exception(e)
-        raise e
+    main()
@@ -1,25 +1,64 @@
 import os
 from pathlib import Path
+from typing import List, Optional
 from constants.path_conf import CONFIG_FILE_PATH, PARAMS_FILE_PATH
-from src.utils.common import read_yaml, create_directories
-from src.entity.config_entity import DataIngestionConfig, BaseModelConfig, TrainingConfig, EvaluationConfig
+from src.utils.common import read_yaml, create_directories, load_json
+from src.entity.config_entity import DataIngestionConfig, ImageCacheConfig, BaseModelConfig, TrainingConfig, EvaluationConfig, PredictionConfig, BatchPredictionConfig, TFLiteExportConfig, DistillationConfig, ModelComparisonConfig, MLflowLoggerConfig, ModelRegistryConfig, StageRunnerConfig
 
 class ConfigurationManager:
     """
     Class to manage configuration settings.
     """
 
-    def __init__(self, config_filepath=CONFIG_FILE_PATH, params_filepath=PARAMS_FILE_PATH):
+    def __init__(self, config_filepath=CONFIG_FILE_PATH, params_filepath=PARAMS_FILE_PATH, create_dirs=True):
         """
         Initialize ConfigurationManager.
 
         Args:
         - config_filepath (str): Filepath of the configuration file.
         - params_filepath (str): Filepath of the parameters file.
+        - create_dirs (bool): Whether building a configuration creates its
+          artifact directories; False to only read and check the settings.
         """
         self.config = read_yaml(config_filepath)
         self.params = read_yaml(params_filepath)
-        create_directories([self.config.artifacts_root])
+        self.create_dirs = create_dirs
+        self._create_directories([self.config.artifacts_root])
+
+    def _create_directories(self, paths: list):
+        if self.create_dirs:
+            create_directories(paths)
+
+    def _dataset_class_names(self) -> Optional[List[str]]:
+        """
+        Read the class names of the local dataset: the image cache's, else the class directories'.
+
+        Returns:
+        - List[str] or None: Sorted class names, or None where there is no data, e.g. on a serving node.
+        """
+        # image_cache.MANIFEST_FILE; not imported, as that module loads TensorFlow.
+        manifest_path = Path(self.config.image_cache.root_dir) / "manifest.json"
+        if manifest_path.exists():
+            return list(load_json(manifest_path).class_names)
+        training_data = Path(self.config.data_ingestion.unzip_dir) / "Chest-CT-Scan-data"
+        if training_data.is_dir():
+            return sorted(path.name for path in training_data.iterdir() if path.is_dir())
+        return None
+
+    def _class_names(self) -> List[str]:
+        """
+        Return ``CLASS_NAMES``, checked against ``CLASSES`` and the local dataset.
+
+        Raises:
+        - ValueError: If the names disagree with either.
+        """
+        class_names = list(self.params.CLASS_NAMES)
+        if len(class_names) != self.params.CLASSES:
+            raise ValueError(f"CLASS_NAMES lists {len(class_names)} classes but CLASSES is {self.params.CLASSES}")
+        dataset_class_names = self._dataset_class_names()
+        if dataset_class_names is not None and dataset_class_names != class_names:
+            raise ValueError(f"CLASS_NAMES {class_names} does not match the dataset's classes {dataset_class_names}")
+        return class_names
 
     def get_data_ingestion_config(self) -> DataIngestionConfig:
         """
@@ -29,16 +68,41 @@ class ConfigurationManager:
         - DataIngestionConfig: Configuration for data ingestion.
         """
         config = self.config.data_ingestion
-        create_directories([config.root_dir])
+        self._create_directories([config.root_dir])
 
         data_ingestion_config = DataIngestionConfig(
             root_dir=config.root_dir,
             source_URL=config.source_URL,
             local_data_file=config.local_data_file,
-            unzip_dir=config.unzip_dir
+            unzip_dir=config.unzip_dir,
+            manifest_file=Path(config.manifest_file),
+            sha256=config.sha256,
+            chunk_size=config.download_chunk_size,
+            max_retries=config.download_max_retries,
+            extract_manifest_file=Path(config.extract_manifest_file),
+            extract_workers=config.extract_workers,
+            extract_to_cache=config.extract_to_cache
         )
         return data_ingestion_config
     
+    def get_image_cache_config(self) -> ImageCacheConfig:
+        """
+        Retrieve ImageCacheConfig from the configuration.
+
+        Returns:
+        - ImageCacheConfig: Configuration for the preprocessed-image cache.
+        """
+        config = self.config.image_cache
+        self._create_directories([config.root_dir])
+
+        image_cache_config = ImageCacheConfig(
+            root_dir=Path(config.root_dir),
+            training_data=Path(os.path.join(self.config.data_ingestion.unzip_dir, "Chest-CT-Scan-data")),
+            params_image_size=self.params.IMAGE_SIZE,
+            params_shard_size=self.params.CACHE_SHARD_SIZE
+        )
+        return image_cache_config
+
     def get_prepare_base_model_config(self) -> BaseModelConfig:
         """
         Retrieve BaseModelConfig from the configuration.
@@ -47,17 +111,24 @@ class ConfigurationManager:
         - BaseModelConfig: Configuration for preparing the base model.
         """
         config = self.config.prepare_base_model
-        create_directories([config.root_dir])
+        self._create_directories([config.root_dir])
 
         prepare_base_model_config = BaseModelConfig(
             root_dir=Path(config.root_dir),
             base_model_path=Path(config.base_model_path),
             updated_base_model_path=Path(config.updated_base_model_path),
+            architecture_report_file=Path(config.architecture_report_file),
+            weights_store_dir=Path(self.config.weights_store.root_dir),
+            weights_offline=self.config.weights_store.offline,
             params_image_size=self.params.IMAGE_SIZE,
             params_learning_rate=self.params.LEARNING_RATE,
             params_include_top=self.params.INCLUDE_TOP,
             params_weights=self.params.WEIGHTS,
-            params_classes=self.params.CLASSES
+            params_classes=self.params.CLASSES,
+            params_backbone=self.params.BACKBONE,
+            params_head=self.params.HEAD,
+            params_head_dropout=self.params.HEAD_DROPOUT,
+            params_latency_samples=self.params.ARCH_LATENCY_SAMPLES
         )
 
         return prepare_base_model_config
@@ -73,7 +144,7 @@ class ConfigurationManager:
         prepare_base_model = self.config.prepare_base_model
         params = self.params
         training_data = os.path.join(self.config.data_ingestion.unzip_dir, "Chest-CT-Scan-data")
-        create_directories([
+        self._create_directories([
             Path(training.root_dir)
         ])
 
@@ -82,10 +153,19 @@ class ConfigurationManager:
             trained_model_path=Path(training.trained_model_path),
             updated_base_model_path=Path(prepare_base_model.updated_base_model_path),
             training_data=Path(training_data),
+            image_cache_dir=Path(self.config.image_cache.root_dir),
+            bottleneck_dir=Path(training.bottleneck_dir),
+            checkpoint_dir=Path(training.checkpoint_dir),
             params_epochs=params.EPOCHS,
             params_batch_size=params.BATCH_SIZE,
             params_is_augmentation=params.AUGMENTATION,
-            params_image_size=params.IMAGE_SIZE
+            params_image_size=params.IMAGE_SIZE,
+            params_input_pipeline=params.INPUT_PIPELINE,
+            params_training_mode=params.TRAINING_MODE,
+            params_checkpoint_every_steps=params.CHECKPOINT_EVERY_STEPS,
+            params_checkpoint_max_size_mb=params.CHECKPOINT_MAX_SIZE_MB,
+            params_use_best_checkpoint=params.USE_BEST_CHECKPOINT,
+            params_augmentation_seed=params.AUGMENTATION_SEED
         )
 
         return training_config
@@ -100,9 +180,198 @@ class ConfigurationManager:
         eval_config = EvaluationConfig(
             path_of_model="artifacts/training/model.h5",
             training_data="artifacts/data_ingestion/Chest-CT-Scan-data",
-            mlflow_uri="https://dagshub.com/giufalcao/chest-Disease-Classification-MLflow-DVC.mlflow",
+            image_cache_dir=Path(self.config.image_cache.root_dir),
+            mlflow_uri=self.config.mlflow_logger.tracking_uri,
             all_params=self.params,
             params_image_size=self.params.IMAGE_SIZE,
-            params_batch_size=self.params.BATCH_SIZE
+            params_batch_size=self.params.BATCH_SIZE,
+            params_input_pipeline=self.params.INPUT_PIPELINE,
+            params_class_names=self._class_names(),
+            # One registered model per backbone; "vgg16" keeps the original "VGG16Model".
+            registered_model_name=f"{self.params.BACKBONE.upper()}Model"
         )
         return eval_config
+
+    def get_prediction_config(self) -> PredictionConfig:
+        """
+        Retrieve PredictionConfig from the configuration.
+
+        Returns:
+        - PredictionConfig: Configuration for online prediction.
+        """
+        prediction_config = PredictionConfig(
+            path_of_model=Path(
+                self.config.distillation.student_model_path if self.params.SERVE_STUDENT
+                else self.config.training.trained_model_path
+            ),
+            tflite_model_path=Path(self.config.tflite_export.tflite_model_path),
+            params_image_size=self.params.IMAGE_SIZE,
+            params_inference_backend=self.params.INFERENCE_BACKEND,
+            params_class_names=self._class_names(),
+            params_max_batch_size=self.params.SERVING_MAX_BATCH_SIZE,
+            params_max_wait_ms=self.params.SERVING_MAX_WAIT_MS,
+            cache_dir=Path(self.config.prediction_cache.root_dir),
+            params_cache_size=self.params.PREDICTION_CACHE_SIZE,
+            params_cache_disk=self.params.PREDICTION_CACHE_DISK
+        )
+        return prediction_config
+
+    def get_batch_prediction_config(self) -> BatchPredictionConfig:
+        """
+        Retrieve BatchPredictionConfig from the configuration.
+
+        Returns:
+        - BatchPredictionConfig: Configuration for batch prediction.
+        """
+        config = self.config.batch_prediction
+        self._create_directories([config.root_dir])
+
+        batch_prediction_config = BatchPredictionConfig(
+            output_file=Path(config.output_file),
+            progress_file=Path(config.progress_file),
+            path_of_model=Path(
+                self.config.distillation.student_model_path if self.params.SERVE_STUDENT
+                else self.config.training.trained_model_path
+            ),
+            tflite_model_path=Path(self.config.tflite_export.tflite_model_path),
+            params_image_size=self.params.IMAGE_SIZE,
+            params_inference_backend=self.params.INFERENCE_BACKEND,
+            params_class_names=self._class_names(),
+            params_batch_size=self.params.BATCH_PREDICTION_BATCH_SIZE,
+            params_checkpoint_every=self.params.BATCH_PREDICTION_CHECKPOINT_EVERY
+        )
+        return batch_prediction_config
+
+    def get_tflite_export_config(self) -> TFLiteExportConfig:
+        """
+        Retrieve TFLiteExportConfig from the configuration.
+
+        Returns:
+        - TFLiteExportConfig: Configuration for the TFLite export.
+        """
+        config = self.config.tflite_export
+        self._create_directories([config.root_dir])
+
+        tflite_export_config = TFLiteExportConfig(
+            root_dir=Path(config.root_dir),
+            trained_model_path=Path(self.config.training.trained_model_path),
+            tflite_model_path=Path(config.tflite_model_path),
+            training_data=Path(os.path.join(self.config.data_ingestion.unzip_dir, "Chest-CT-Scan-data")),
+            image_cache_dir=Path(self.config.image_cache.root_dir),
+            params_image_size=self.params.IMAGE_SIZE,
+            params_batch_size=self.params.BATCH_SIZE,
+            params_input_pipeline=self.params.INPUT_PIPELINE,
+            params_quantizations=self.params.TFLITE_QUANTIZATIONS,
+            params_calibration_samples=self.params.TFLITE_CALIBRATION_SAMPLES,
+            params_latency_samples=self.params.TFLITE_LATENCY_SAMPLES,
+            params_accuracy_budget=self.params.TFLITE_ACCURACY_BUDGET
+        )
+        return tflite_export_config
+
+    def get_distillation_config(self) -> DistillationConfig:
+        """
+        Retrieve DistillationConfig from the configuration.
+
+        Returns:
+        - DistillationConfig: Configuration for distillation.
+        """
+        config = self.config.distillation
+        params = self.params
+        self._create_directories([Path(config.root_dir)])
+
+        distillation_config = DistillationConfig(
+            root_dir=Path(config.root_dir),
+            student_model_path=Path(config.student_model_path),
+            report_file=Path(config.report_file),
+            trained_model_path=Path(self.config.training.trained_model_path),
+            training_data=Path(os.path.join(self.config.data_ingestion.unzip_dir, "Chest-CT-Scan-data")),
+            image_cache_dir=Path(self.config.image_cache.root_dir),
+            params_image_size=params.IMAGE_SIZE,
+            params_batch_size=params.BATCH_SIZE,
+            params_is_augmentation=params.AUGMENTATION,
+            params_input_pipeline=params.INPUT_PIPELINE,
+            params_student=params.DISTILL_STUDENT,
+            params_student_width=params.DISTILL_STUDENT_WIDTH,
+            params_temperature=params.DISTILL_TEMPERATURE,
+            params_alpha=params.DISTILL_ALPHA,
+            params_epochs=params.DISTILL_EPOCHS,
+            params_learning_rate=params.DISTILL_LEARNING_RATE,
+            params_latency_samples=params.DISTILL_LATENCY_SAMPLES
+        )
+        return distillation_config
+
+    def get_model_comparison_config(self) -> ModelComparisonConfig:
+        """
+        Retrieve ModelComparisonConfig from the configuration.
+
+        Returns:
+        - ModelComparisonConfig: Configuration for comparing candidate models.
+        """
+        config = self.config.model_comparison
+        self._create_directories([Path(config.root_dir)])
+
+        model_comparison_config = ModelComparisonConfig(
+            root_dir=Path(config.root_dir),
+            report_file=Path(config.report_file),
+            model_paths=[Path(path) for path in config.model_paths],
+            training_data=Path(os.path.join(self.config.data_ingestion.unzip_dir, "Chest-CT-Scan-data")),
+            image_cache_dir=Path(self.config.image_cache.root_dir),
+            params_image_size=self.params.IMAGE_SIZE,
+            params_batch_size=self.params.BATCH_SIZE,
+            params_input_pipeline=self.params.INPUT_PIPELINE,
+            params_class_names=self._class_names(),
+            params_memory_budget_mb=self.params.COMPARISON_MEMORY_MB
+        )
+        return model_comparison_config
+
+    def get_mlflow_logger_config(self) -> MLflowLoggerConfig:
+        """
+        Retrieve MLflowLoggerConfig from the configuration.
+
+        Returns:
+        - MLflowLoggerConfig: Configuration for the spooling MLflow logger.
+        """
+        config = self.config.mlflow_logger
+
+        mlflow_logger_config = MLflowLoggerConfig(
+            tracking_uri=config.tracking_uri,
+            spool_dir=Path(config.spool_dir),
+            experiment_id=str(config.experiment_id),
+            batch_size=config.batch_size,
+            max_retries=config.max_retries,
+            max_backoff_seconds=config.max_backoff_seconds,
+            poll_seconds=config.poll_seconds,
+            drain_timeout=config.drain_timeout
+        )
+        return mlflow_logger_config
+
+    def get_model_registry_config(self) -> ModelRegistryConfig:
+        """
+        Retrieve ModelRegistryConfig from the configuration.
+
+        Returns:
+        - ModelRegistryConfig: Configuration for the model registry.
+        """
+        model_registry_config = ModelRegistryConfig(
+            params_memory_budget_mb=self.params.MODEL_REGISTRY_MEMORY_MB,
+            params_warmup=self.params.MODEL_REGISTRY_WARMUP
+        )
+        return model_registry_config
+
+    def get_stage_runner_config(self) -> StageRunnerConfig:
+        """
+        Retrieve StageRunnerConfig from the configuration.
+
+        Returns:
+        - StageRunnerConfig: Configuration for the stage runner.
+        """
+        stage_runner_config = StageRunnerConfig(
+            state_file=Path(self.config.stage_runner.state_file),
+            max_workers=self.config.stage_runner.max_workers,
+            report_file=Path(self.config.stage_runner.report_file),
+            trace_dir=Path(self.config.stage_runner.trace_dir),
+            trace_stages=list(self.config.stage_runner.trace_stages),
+            config=self.config,
+            params=self.params
+        )
+        return stage_runner_config
@@ -1,4 +1,7 @@
 DATA_INGESTION_STEP = "Data Ingestion Step"
+IMAGE_CACHE_STEP = "Image Cache Step"
 PREPARE_BASE_MODEL_STEP = "Prepare Base Model Step"
 TRAINING_STEP = "Training Step"
-INFERENCE_STEP = "Inference Step"
\ No newline at end of file
+INFERENCE_STEP = "Inference Step"
+TFLITE_EXPORT_STEP = "TFLite Export Step"
+DISTILLATION_STEP = "Distillation Step"
@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
 
 @dataclass(frozen=True)
@@ -13,11 +13,41 @@ class DataIngestionConfig:
     - source_URL (str): URL of the data source.
     - local_data_file (Path): Path to the local data file.
     - unzip_dir (Path): Directory for unzipping the data.
+    - manifest_file (Path): Manifest recording the verified SHA-256 of the download.
+    - sha256 (Optional[str]): Expected SHA-256 of the download; None trusts the first verified download.
+    - chunk_size (int): Bytes streamed per chunk.
+    - max_retries (int): Download attempts before giving up.
+    - extract_manifest_file (Path): Manifest of the extracted zip members.
+    - extract_workers (int): Number of extraction threads.
+    - extract_to_cache (bool): Whether to decode images straight into the image cache instead of extracting them.
     """
     root_dir: Path
     source_URL: str
     local_data_file: Path
     unzip_dir: Path
+    manifest_file: Path
+    sha256: Optional[str]
+    chunk_size: int
+    max_retries: int
+    extract_manifest_file: Path
+    extract_workers: int
+    extract_to_cache: bool
+
+@dataclass(frozen=True)
+class ImageCacheConfig:
+    """
+    Configuration for the preprocessed-image cache.
+
+    Attributes:
+    - root_dir (Path): Directory holding the cached shards.
+    - training_data (Path): Path to the extracted dataset.
+    - params_image_size (List[int]): Size the images are resized to.
+    - params_shard_size (int): Number of images per shard.
+    """
+    root_dir: Path
+    training_data: Path
+    params_image_size: List[int]
+    params_shard_size: int
 
 @dataclass(frozen=True)
 class BaseModelConfig:
@@ -28,20 +58,34 @@ class BaseModelConfig:
     - root_dir (Path): Root directory for model preparation.
     - base_model_path (Path): Path to the base model.
     - updated_base_model_path (Path): Path to save the updated base model.
+    - architecture_report_file (Path): Path to save the FLOPs, parameter and latency report.
+    - weights_store_dir (Path): Local store of pretrained backbone weights.
+    - weights_offline (bool): Whether missing pretrained weights raise instead of being downloaded.
     - params_image_size (List[int]): Size of the input images.
     - params_learning_rate (float): Learning rate for training.
     - params_include_top (bool): Whether to include the top layer in the model.
     - params_weights (str): Type of weights to initialize the model.
     - params_classes (int): Number of classes in the dataset.
+    - params_backbone (str): Backbone architecture, a key of ``architectures.BACKBONES``.
+    - params_head (str): Classification head, a key of ``architectures.HEADS``.
+    - params_head_dropout (float): Dropout rate of the "gap_dropout" head.
+    - params_latency_samples (int): Number of batch-1 predictions timed for the report.
     """
     root_dir: Path
     base_model_path: Path
     updated_base_model_path: Path
+    architecture_report_file: Path
+    weights_store_dir: Path
+    weights_offline: bool
     params_image_size: List[int]
     params_learning_rate: float
     params_include_top: bool
     params_weights: str
     params_classes: int
+    params_backbone: str
+    params_head: str
+    params_head_dropout: float
+    params_latency_samples: int
 
 @dataclass(frozen=True)
 class TrainingConfig:
@@ -53,19 +97,37 @@ class TrainingConfig:
     - trained_model_path (Path): Path to save the trained model.
     - updated_base_model_path (Path): Path to the updated base model.
     - training_data (Path): Path to the training data.
+    - image_cache_dir (Path): Directory of the preprocessed-image cache.
+    - bottleneck_dir (Path): Directory of the cached backbone features.
+    - checkpoint_dir (Path): Directory of the training checkpoints.
     - params_epochs (int): Number of epochs for training.
     - params_batch_size (int): Batch size for training.
     - params_is_augmentation (bool): Whether data augmentation is enabled.
     - params_image_size (List[int]): Size of the input images.
+    - params_input_pipeline (str): Input pipeline, "generator", "tf_data" or "cache".
+    - params_training_mode (str): "full" or "bottleneck" (head only, on cached features).
+    - params_checkpoint_every_steps (int): Batches between mid-epoch checkpoints; 0 for end-of-epoch only.
+    - params_checkpoint_max_size_mb (float): Size budget for all checkpoints together.
+    - params_use_best_checkpoint (bool): Whether to save the weights with the lowest validation loss.
+    - params_augmentation_seed (Optional[int]): Seed for shuffling and augmentation; None for a random one.
     """
     root_dir: Path
     trained_model_path: Path
     updated_base_model_path: Path
     training_data: Path
+    image_cache_dir: Path
+    bottleneck_dir: Path
+    checkpoint_dir: Path
     params_epochs: int
     params_batch_size: int
     params_is_augmentation: bool
     params_image_size: List[int]
+    params_input_pipeline: str
+    params_training_mode: str
+    params_checkpoint_every_steps: int
+    params_checkpoint_max_size_mb: float
+    params_use_best_checkpoint: bool
+    params_augmentation_seed: Optional[int]
 
 @dataclass(frozen=True)
 class EvaluationConfig:
@@ -75,14 +137,262 @@ class EvaluationConfig:
     Attributes:
     - path_of_model (Path): Path to the model for evaluation.
     - training_data (Path): Path to the evaluation data.
+    - image_cache_dir (Path): Directory of the preprocessed-image cache.
     - all_params (dict): All parameters used for evaluation.
     - mlflow_uri (str): URI for MLflow tracking.
     - params_image_size (list): Size of the input images.
     - params_batch_size (int): Batch size for evaluation.
+    - params_input_pipeline (str): Input pipeline, "generator", "tf_data" or "cache".
+    - params_class_names (List[str]): Class names, indexed by model output.
+    - registered_model_name (str): MLflow registered model the evaluated model is logged as.
     """
     path_of_model: Path
     training_data: Path
+    image_cache_dir: Path
     all_params: dict
     mlflow_uri: str
     params_image_size: list
     params_batch_size: int
+    params_input_pipeline: str
+    params_class_names: List[str]
+    registered_model_name: str
+
+@dataclass(frozen=True)
+class PredictionConfig:
+    """
+    Configuration for online prediction.
+
+    Attributes:
+    - path_of_model (Path): Path to the trained model.
+    - tflite_model_path (Path): Path to the selected TFLite model.
+    - params_image_size (List[int]): Size of the input images.
+    - params_inference_backend (str): Inference backend, "keras" or "tflite".
+    - params_class_names (List[str]): Class names, indexed by model output.
+    - params_max_batch_size (int): Largest batch combined from concurrent requests.
+    - params_max_wait_ms (float): Longest time a request waits for a batch to fill.
+    - cache_dir (Path): Root directory of the prediction cache's disk tier.
+    - params_cache_size (int): Predictions kept in memory; 0 disables the cache.
+    - params_cache_disk (bool): Whether to also cache predictions on disk.
+    """
+    path_of_model: Path
+    tflite_model_path: Path
+    params_image_size: List[int]
+    params_inference_backend: str
+    params_class_names: List[str]
+    params_max_batch_size: int
+    params_max_wait_ms: float
+    cache_dir: Path
+    params_cache_size: int
+    params_cache_disk: bool
+
+@dataclass(frozen=True)
+class BatchPredictionConfig:
+    """
+    Configuration for batch prediction over image directories and file lists.
+
+    Attributes:
+    - output_file (Path): Default output, a .csv file or a .parquet directory.
+    - progress_file (Path): JSON record of the last checkpointed position.
+    - path_of_model (Path): Path to the Keras model.
+    - tflite_model_path (Path): Path to the selected TFLite model.
+    - params_image_size (List[int]): Size of the input images.
+    - params_inference_backend (str): Inference backend, "keras" or "tflite".
+    - params_class_names (List[str]): Class names, indexed by model output.
+    - params_batch_size (int): Images per predict call.
+    - params_checkpoint_every (int): Batches between output flushes and progress checkpoints.
+    """
+    output_file: Path
+    progress_file: Path
+    path_of_model: Path
+    tflite_model_path: Path
+    params_image_size: List[int]
+    params_inference_backend: str
+    params_class_names: List[str]
+    params_batch_size: int
+    params_checkpoint_every: int
+
+@dataclass(frozen=True)
+class TFLiteExportConfig:
+    """
+    Configuration for the TFLite export.
+
+    Attributes:
+    - root_dir (Path): Root directory for the exported models and report.
+    - trained_model_path (Path): Path to the trained Keras model.
+    - tflite_model_path (Path): Path the selected TFLite variant is copied to.
+    - training_data (Path): Path to the dataset used for calibration and accuracy.
+    - image_cache_dir (Path): Directory of the preprocessed-image cache.
+    - params_image_size (List[int]): Size of the input images.
+    - params_batch_size (int): Batch size for accuracy measurement.
+    - params_input_pipeline (str): Input pipeline, "generator", "tf_data" or "cache".
+    - params_quantizations (List[str]): Variants to export: "dynamic_range", "float16", "int8".
+    - params_calibration_samples (int): Number of images used to calibrate int8 ranges.
+    - params_latency_samples (int): Number of batch-1 predictions timed per variant.
+    - params_accuracy_budget (float): Largest accuracy drop allowed for the selected variant.
+    """
+    root_dir: Path
+    trained_model_path: Path
+    tflite_model_path: Path
+    training_data: Path
+    image_cache_dir: Path
+    params_image_size: List[int]
+    params_batch_size: int
+    params_input_pipeline: str
+    params_quantizations: List[str]
+    params_calibration_samples: int
+    params_latency_samples: int
+    params_accuracy_budget: float
+
+@dataclass(frozen=True)
+class DistillationConfig:
+    """
+    Configuration for distilling the trained model into a small student.
+
+    Attributes:
+    - root_dir (Path): Root directory for distillation.
+    - student_model_path (Path): Path to save the student model.
+    - report_file (Path): JSON report comparing teacher and student.
+    - trained_model_path (Path): Path to the trained teacher model.
+    - training_data (Path): Path to the extracted dataset.
+    - image_cache_dir (Path): Directory of the preprocessed-image cache.
+    - params_image_size (List[int]): Size of the input images.
+    - params_batch_size (int): Batch size.
+    - params_is_augmentation (bool): Whether data augmentation is enabled.
+    - params_input_pipeline (str): Input pipeline, "generator", "tf_data" or "cache".
+    - params_student (str): Student architecture, "mobilenet_v2" or "small_cnn".
+    - params_student_width (float): Width multiplier of the student.
+    - params_temperature (float): Softmax temperature of the soft targets.
+    - params_alpha (float): Weight of the hard-label loss.
+    - params_epochs (int): Number of distillation epochs.
+    - params_learning_rate (float): Learning rate of the student.
+    - params_latency_samples (int): Number of batch-1 predictions timed per model.
+    """
+    root_dir: Path
+    student_model_path: Path
+    report_file: Path
+    trained_model_path: Path
+    training_data: Path
+    image_cache_dir: Path
+    params_image_size: List[int]
+    params_batch_size: int
+    params_is_augmentation: bool
+    params_input_pipeline: str
+    params_student: str
+    params_student_width: float
+    params_temperature: float
+    params_alpha: float
+    params_epochs: int
+    params_learning_rate: float
+    params_latency_samples: int
+
+@dataclass(frozen=True)
+class ModelComparisonConfig:
+    """
+    Configuration for comparing candidate models on one validation set.
+
+    Attributes:
+    - root_dir (Path): Root directory for the comparison.
+    - report_file (Path): JSON comparison table.
+    - model_paths (List[Path]): Candidate .h5 models compared by default.
+    - training_data (Path): Path to the extracted dataset.
+    - image_cache_dir (Path): Directory of the preprocessed-image cache.
+    - params_image_size (List[int]): Size of the input images.
+    - params_batch_size (int): Batch size.
+    - params_input_pipeline (str): Input pipeline, "generator", "tf_data" or "cache".
+    - params_class_names (List[str]): Class names, indexed by model output.
+    - params_memory_budget_mb (float): Size of the candidates loaded at the same time.
+    """
+    root_dir: Path
+    report_file: Path
+    model_paths: List[Path]
+    training_data: Path
+    image_cache_dir: Path
+    params_image_size: List[int]
+    params_batch_size: int
+    params_input_pipeline: str
+    params_class_names: List[str]
+    params_memory_budget_mb: float
+
+@dataclass(frozen=True)
+class MLflowLoggerConfig:
+    """
+    Configuration for the spooling MLflow logger.
+
+    Attributes:
+    - tracking_uri (str): MLflow tracking (and model registry) URI.
+    - spool_dir (Path): Local directory records wait in until they are flushed.
+    - experiment_id (str): Experiment new runs are created in.
+    - batch_size (int): Largest number of records combined into one request.
+    - max_retries (int): Consecutive failed flushes before backing off at the longest delay.
+    - max_backoff_seconds (float): Longest delay between flush attempts.
+    - poll_seconds (float): Interval at which the flush thread checks the spool.
+    - drain_timeout (float): Seconds to wait for the spool to flush when closing the logger.
+    """
+    tracking_uri: str
+    spool_dir: Path
+    experiment_id: str
+    batch_size: int
+    max_retries: int
+    max_backoff_seconds: float
+    poll_seconds: float
+    drain_timeout: float
+
+@dataclass(frozen=True)
+class ModelRegistryConfig:
+    """
+    Configuration for the process-wide model registry.
+
+    Attributes:
+    - params_memory_budget_mb (float): Memory the cached models may hold before eviction.
+    - params_warmup (bool): Whether to run one prediction right after loading a model.
+    """
+    params_memory_budget_mb: float
+    params_warmup: bool
+
+@dataclass(frozen=True)
+class StageConfig:
+    """
+    Declaration of a pipeline stage for the stage runner.
+
+    Attributes:
+    - key (str): Short stage name used on the command line.
+    - name (str): Display name of the stage.
+    - pipeline (str): Pipeline class as "module:Class".
+    - depends_on (List[str]): Keys of the stages that must finish first.
+    - params (Optional[List[str]]): params.yaml keys the stage reads; None for all of them.
+    - config_sections (List[str]): config.yaml sections the stage reads.
+    - inputs (List[Path]): Artifacts the stage reads.
+    - outputs (List[Path]): Artifacts the stage writes.
+    - code (List[Path]): Source files and directories the stage runs.
+    """
+    key: str
+    name: str
+    pipeline: str
+    depends_on: List[str]
+    params: Optional[List[str]]
+    config_sections: List[str]
+    inputs: List[Path]
+    outputs: List[Path]
+    code: List[Path]
+
+@dataclass(frozen=True)
+class StageRunnerConfig:
+    """
+    Configuration for the stage runner.
+
+    Attributes:
+    - state_file (Path): File recording the fingerprint of each stage's last successful run.
+    - max_workers (int): Largest number of stages run at the same time.
+    - report_file (Path): JSON run report with per-stage timings and resource use.
+    - trace_dir (Path): Directory for TensorFlow profiler traces, one subdirectory per stage.
+    - trace_stages (List[str]): Keys of the stages to capture a profiler trace for.
+    - config (dict): Contents of config.yaml.
+    - params (dict): Contents of params.yaml.
+    """
+    state_file: Path
+    max_workers: int
+    report_file: Path
+    trace_dir: Path
+    trace_stages: List[str]
+    config: dict
+    params: dict
@@ -0,0 +1,102 @@
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import tensorflow as tf
+
+from src.models.registry import get_model_registry
+
+
+INFERENCE_BACKENDS = ("keras", "tflite")
+
+
+class KerasBackend:
+    """
+    Inference backend running a Keras ``.h5`` model from the model registry.
+
+    Attributes:
+    - model (tf.keras.Model): Loaded Keras model.
+    """
+
+    def __init__(self, path: Path):
+        """
+        Initialize KerasBackend.
+
+        Args:
+        - path (Path): Path to the Keras model file.
+        """
+        self.model = get_model_registry().get(path)
+
+    def predict(self, batch: np.ndarray) -> np.ndarray:
+        """
+        Predict class probabilities for a batch of rescaled images.
+        """
+        return self.model.predict_on_batch(batch)
+
+
+class TFLiteBackend:
+    """
+    Inference backend running a ``.tflite`` model with the TFLite interpreter.
+
+    Float inputs are quantized and integer outputs dequantized when the
+    model was converted with integer input/output tensors. The interpreter
+    is not thread-safe, so a backend must only be used from one thread.
+
+    Attributes:
+    - interpreter (tf.lite.Interpreter): TFLite interpreter.
+    """
+
+    def __init__(self, path: Path, num_threads: Optional[int] = None):
+        """
+        Initialize TFLiteBackend.
+
+        Args:
+        - path (Path): Path to the TFLite model file.
+        - num_threads (int or None): Interpreter threads; None uses the TFLite default.
+        """
+        self.interpreter = tf.lite.Interpreter(model_path=str(path), num_threads=num_threads)
+        self.interpreter.allocate_tensors()
+        self._input = self.interpreter.get_input_details()[0]
+        self._output = self.interpreter.get_output_details()[0]
+
+    def predict(self, batch: np.ndarray) -> np.ndarray:
+        """
+        Predict class probabilities for a batch of rescaled images.
+        """
+        if tuple(self._input["shape"]) != batch.shape:
+            self.interpreter.resize_tensor_input(self._input["index"], batch.shape)
+            self.interpreter.allocate_tensors()
+            self._input = self.interpreter.get_input_details()[0]
+            self._output = self.interpreter.get_output_details()[0]
+
+        if self._input["dtype"] != np.float32:
+            scale, zero_point = self._input["quantization"]
+            batch = np.round(batch / scale + zero_point).astype(self._input["dtype"])
+
+        self.interpreter.set_tensor(self._input["index"], batch)
+        self.interpreter.invoke()
+        output = self.interpreter.get_tensor(self._output["index"])
+
+        if self._output["dtype"] != np.float32:
+            scale, zero_point = self._output["quantization"]
+            output = (output.astype(np.float32) - zero_point) * scale
+        return output
+
+
+def load_backend(backend: str, keras_model_path: Path, tflite_model_path: Path):
+    """
+    Create the inference backend selected by name.
+
+    Args:
+    - backend (str): "keras" or "tflite".
+    - keras_model_path (Path): Path to the Keras model file.
+    - tflite_model_path (Path): Path to the TFLite model file.
+
+    Returns:
+    - KerasBackend or TFLiteBackend: Backend exposing ``predict(batch)``.
+    """
+    if backend == "keras":
+        return KerasBackend(keras_model_path)
+    if backend == "tflite":
+        return TFLiteBackend(tflite_model_path)
+    raise ValueError(f"Unknown inference backend: {backend}; expected one of {INFERENCE_BACKENDS}")
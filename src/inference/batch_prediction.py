@@ -0,0 +1,289 @@
+import os
+import csv
+import json
+import time
+import hashlib
+from itertools import islice
+from pathlib import Path
+from typing import Iterator, List
+
+import numpy as np
+import tensorflow as tf
+
+from src.logging import logger
+from src.entity.config_entity import BatchPredictionConfig
+from src.inference.backends import load_backend
+from src.preprocess import input_pipeline
+
+
+def iter_image_paths(source: Path) -> Iterator[str]:
+    """
+    Stream the image paths of a directory tree or of a file list, in a stable order.
+
+    A directory is walked with directories and files sorted by name, so the
+    order only depends on the tree's contents and a resumed job can skip the
+    images it already scored; a file list holds one path per line. Paths are
+    produced one at a time, never listed in memory.
+
+    Args:
+    - source (Path): Directory to walk, or a text file listing image paths.
+
+    Returns:
+    - Iterator[str]: Image paths.
+    """
+    source = Path(source)
+    if source.is_file():
+        with open(source) as f:
+            for line in f:
+                if line.strip():
+                    yield line.strip()
+        return
+
+    extensions = tuple("." + ext for ext in input_pipeline.WHITE_LIST_FORMATS)
+    for root, dirnames, fnames in os.walk(source):
+        dirnames.sort()
+        for fname in sorted(fnames):
+            if fname.lower().endswith(extensions):
+                yield os.path.join(root, fname)
+
+
+class CsvResults:
+    """
+    Appends prediction rows to one CSV file; its byte size is the resume point.
+    """
+
+    def __init__(self, path: Path, columns: List[str]):
+        self.path = Path(path)
+        self.columns = columns
+        self._file = None
+
+    def open(self, state):
+        """
+        Open the file for appending, cutting off rows written after the checkpointed ``state``.
+        """
+        os.makedirs(self.path.parent, exist_ok=True)
+        if state is None:
+            self._file = open(self.path, "w", newline="")
+            csv.writer(self._file).writerow(self.columns)
+        else:
+            self._file = open(self.path, "r+", newline="")
+            self._file.truncate(state)
+            self._file.seek(state)
+        self._writer = csv.writer(self._file)
+
+    def write(self, rows: List[list]):
+        self._writer.writerows(rows)
+
+    def flush(self) -> int:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        return self._file.tell()
+
+    def close(self):
+        self._file.close()
+
+
+class ParquetResults:
+    """
+    Writes prediction rows to numbered Parquet part files in a directory.
+
+    Each flush writes the rows since the previous one as a new part, so a
+    part is complete once it exists; the number of parts is the resume point.
+    """
+
+    def __init__(self, path: Path, columns: List[str]):
+        self.path = Path(path)
+        self.columns = columns
+        self._rows = []
+
+    def open(self, state):
+        """
+        Prepare the directory, deleting the parts written after the checkpointed ``state``.
+        """
+        try:
+            import pandas as pd  # noqa: F401
+            pd.io.parquet.get_engine("auto")
+        except ImportError as e:
+            raise ImportError(f"Parquet output needs pandas with pyarrow or fastparquet installed: {e}")
+
+        os.makedirs(self.path, exist_ok=True)
+        self.parts = state or 0
+        for part in self.path.glob("part-*.parquet"):
+            if int(part.stem.split("-")[1]) >= self.parts:
+                part.unlink()
+
+    def write(self, rows: List[list]):
+        self._rows.extend(rows)
+
+    def flush(self) -> int:
+        import pandas as pd
+
+        if self._rows:
+            part = self.path / f"part-{self.parts:06d}.parquet"
+            tmp = part.with_name(part.name + ".tmp")
+            pd.DataFrame(self._rows, columns=self.columns).to_parquet(tmp, index=False)
+            os.replace(tmp, part)
+            self.parts += 1
+            self._rows = []
+        return self.parts
+
+    def close(self):
+        pass
+
+
+class BatchPrediction:
+    """
+    Class to score a directory or list of images of any size with the trained model.
+
+    Paths are streamed from ``iter_image_paths`` into a tf.data pipeline that
+    reads and decodes images on parallel worker threads and batches them
+    with a bounded prefetch, so memory use does not grow with the number of
+    images. Each batch is predicted with the configured backend and its rows
+    (path, class probabilities, predicted label) are appended to a CSV file
+    or to Parquet parts. Every ``params_checkpoint_every`` batches the output
+    is flushed and the number of consumed paths is recorded; an interrupted
+    job run again with the same input, model and output resumes from there.
+    Images that cannot be decoded are skipped and counted.
+
+    Attributes:
+    - config (BatchPredictionConfig): Configuration for batch prediction.
+    """
+
+    def __init__(self, config: BatchPredictionConfig):
+        """
+        Initialize BatchPrediction.
+
+        Args:
+        - config (BatchPredictionConfig): Configuration for batch prediction.
+        """
+        self.config = config
+
+    def _key(self, source: Path, output: Path) -> str:
+        """
+        Identify a job by its input, output and model, so progress is only reused by the same job.
+        """
+        model_path = Path(
+            self.config.tflite_model_path if self.config.params_inference_backend == "tflite"
+            else self.config.path_of_model
+        )
+        stat = model_path.stat()
+        settings = {
+            "source": str(Path(source).resolve()),
+            "output": str(Path(output).resolve()),
+            "model": [str(model_path.resolve()), stat.st_size, stat.st_mtime_ns],
+            "image_size": list(self.config.params_image_size)
+        }
+        return hashlib.sha256(json.dumps(settings, sort_keys=True).encode()).hexdigest()
+
+    def _load_progress(self, key: str) -> dict:
+        path = Path(self.config.progress_file)
+        if path.exists():
+            with open(path) as f:
+                progress = json.load(f)
+            if progress.get("key") == key:
+                return progress
+            logger.info(f"Progress in {path} belongs to another job; starting over")
+        return {"key": key, "consumed": 0, "rows": 0, "output": None, "complete": False}
+
+    def _save_progress(self, progress: dict):
+        path = Path(self.config.progress_file)
+        os.makedirs(path.parent, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump(progress, f, indent=4)
+        os.replace(tmp, path)
+
+    def _batches(self, source: Path, skip: int) -> tf.data.Dataset:
+        """
+        Build the decoding pipeline over the paths after the first ``skip``.
+
+        Returns:
+        - tf.data.Dataset: Batches of (stream indices, paths, rescaled images).
+        """
+        def indexed():
+            for index, path in enumerate(islice(iter_image_paths(source), skip, None), start=skip):
+                self.produced = index + 1
+                yield index, path
+
+        self.produced = skip
+        image_size = self.config.params_image_size
+        dataset = tf.data.Dataset.from_generator(
+            indexed,
+            output_signature=(tf.TensorSpec([], tf.int64), tf.TensorSpec([], tf.string))
+        )
+        dataset = dataset.map(
+            lambda index, path: (index, path, input_pipeline.load_image(path, image_size)),
+            num_parallel_calls=input_pipeline.AUTOTUNE
+        )
+        # Unreadable images are dropped; their paths are still counted as consumed.
+        dataset = dataset.apply(tf.data.experimental.ignore_errors())
+        return dataset.batch(self.config.params_batch_size).map(
+            lambda index, path, images: (index, path, input_pipeline.rescale(images)),
+            num_parallel_calls=input_pipeline.AUTOTUNE
+        ).prefetch(input_pipeline.AUTOTUNE)
+
+    def _rows(self, paths: np.ndarray, probabilities: np.ndarray) -> List[list]:
+        labels = np.argmax(probabilities, axis=1)
+        return [
+            [path.decode(), *map(float, probs), self.config.params_class_names[label]]
+            for path, probs, label in zip(paths, probabilities, labels)
+        ]
+
+    def predict(self, source: Path, output: Path = None, restart: bool = False) -> dict:
+        """
+        Score every image of ``source``, resuming an interrupted run of the same job.
+
+        Args:
+        - source (Path): Directory to walk, or a text file listing image paths.
+        - output (Path or None): .csv file or .parquet directory; ``config.output_file`` if None.
+        - restart (bool): Whether to discard earlier progress and start over.
+
+        Returns:
+        - dict: The final progress record (consumed paths, written rows, skipped images).
+        """
+        output = Path(output or self.config.output_file)
+        columns = ["path", *(f"prob_{name}" for name in self.config.params_class_names), "label"]
+        results = ParquetResults(output, columns) if output.suffix == ".parquet" else CsvResults(output, columns)
+
+        progress = self._load_progress(self._key(source, output))
+        if restart:
+            progress.update(consumed=0, rows=0, output=None, complete=False)
+        if progress["complete"]:
+            logger.info(f"Batch prediction of {source} already complete: {progress['rows']} rows in {output}")
+            return progress
+        if progress["consumed"]:
+            logger.info(f"Resuming batch prediction of {source} after {progress['consumed']} images")
+
+        backend = load_backend(
+            backend=self.config.params_inference_backend,
+            keras_model_path=self.config.path_of_model,
+            tflite_model_path=self.config.tflite_model_path
+        )
+        results.open(progress["output"])
+        start, rows_at_start = time.perf_counter(), progress["rows"]
+        try:
+            for step, (indices, paths, images) in enumerate(self._batches(source, progress["consumed"]), start=1):
+                probabilities = np.asarray(backend.predict(images.numpy()))
+                results.write(self._rows(paths.numpy(), probabilities))
+                progress["rows"] += len(probabilities)
+                progress["consumed"] = int(indices[-1]) + 1
+                if step % self.config.params_checkpoint_every == 0:
+                    progress["output"] = results.flush()
+                    self._save_progress(progress)
+                    rate = (progress["rows"] - rows_at_start) / (time.perf_counter() - start)
+                    logger.info(f"Scored {progress['rows']} images ({rate:.1f} images/sec)")
+
+            # Every path has been read; trailing unreadable images produced no batch.
+            progress["consumed"] = self.produced
+            progress["output"] = results.flush()
+            progress["complete"] = True
+            progress["skipped"] = progress["consumed"] - progress["rows"]
+            self._save_progress(progress)
+        finally:
+            results.close()
+
+        logger.info(
+            f"Batch prediction complete: {progress['rows']} rows in {output}, "
+            f"{progress['skipped']} unreadable images skipped"
+        )
+        return progress
@@ -0,0 +1,148 @@
+import time
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Callable
+
+import numpy as np
+
+from src.logging import logger
+
+
+_STOP = object()
+
+
+class MicroBatcher:
+    """
+    Class to combine concurrent single-item requests into batched calls.
+
+    Requests are queued and a single worker thread drains the queue into a
+    batch of at most ``max_batch_size`` items, waiting no longer than
+    ``max_wait_ms`` after the first item for more to arrive, and then calls
+    ``predict_fn`` once on the batch.
+
+    Batches are copied into one buffer of ``max_batch_size`` items allocated
+    on the first request and reused for every batch; ``predict_fn`` gets a
+    view of its first rows and may modify it in place, but must not keep it.
+
+    Attributes:
+    - predict_fn (Callable[[np.ndarray], np.ndarray]): Batched prediction function.
+    - max_batch_size (int): Largest batch passed to ``predict_fn``.
+    - max_wait_ms (float): Longest time the first request of a batch waits for company.
+    - dtype (np.dtype or None): dtype of the batch buffer; the items' dtype if None.
+    """
+
+    def __init__(self, predict_fn: Callable[[np.ndarray], np.ndarray], max_batch_size: int, max_wait_ms: float,
+                 dtype=None):
+        """
+        Initialize MicroBatcher and start its worker thread.
+
+        Args:
+        - predict_fn (Callable[[np.ndarray], np.ndarray]): Batched prediction function.
+        - max_batch_size (int): Largest batch passed to ``predict_fn``.
+        - max_wait_ms (float): Longest time the first request of a batch waits for company.
+        - dtype (np.dtype or None): dtype of the batch buffer; the items' dtype if None.
+        """
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.dtype = dtype
+        self.batches = 0
+        self.items = 0
+        self._buffer = None
+
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._worker.start()
+
+    def submit(self, item: np.ndarray) -> Future:
+        """
+        Queue one item for prediction.
+
+        Args:
+        - item (np.ndarray): A single input, without the batch dimension.
+
+        Returns:
+        - Future: Resolves to the prediction for the item.
+        """
+        future = Future()
+        self._queue.put((item, future))
+        return future
+
+    def predict(self, item: np.ndarray, timeout: float = None) -> np.ndarray:
+        """
+        Predict one item, blocking until its batch has run.
+        """
+        return self.submit(item).result(timeout=timeout)
+
+    def close(self):
+        """
+        Stop the worker after the queued requests are served.
+        """
+        self._queue.put(_STOP)
+        self._worker.join()
+
+    def stats(self) -> dict:
+        """
+        Return the number of batches and items served and the mean batch size.
+        """
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "mean_batch_size": self.items / self.batches if self.batches else 0.0
+        }
+
+    def _collect(self, first) -> tuple:
+        """
+        Gather a batch starting from ``first``; returns the batch and whether to stop.
+        """
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait_ms / 1000
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                request = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if request is _STOP:
+                return batch, True
+            batch.append(request)
+        return batch, False
+
+    def _fill(self, batch: list) -> np.ndarray:
+        """
+        Copy a batch's items into the reused buffer and return the filled rows.
+        """
+        first = batch[0][0]
+        if self._buffer is None or self._buffer.shape[1:] != first.shape:
+            self._buffer = np.empty((self.max_batch_size, *first.shape), dtype=self.dtype or first.dtype)
+        for row, (item, _) in enumerate(batch):
+            self._buffer[row] = item
+        return self._buffer[:len(batch)]
+
+    def _run(self):
+        """
+        Worker loop: collect a batch, predict it and resolve its futures.
+        """
+        stop = False
+        while not stop:
+            request = self._queue.get()
+            if request is _STOP:
+                break
+            batch, stop = self._collect(request)
+
+            futures = [future for _, future in batch]
+            try:
+                outputs = self.predict_fn(self._fill(batch))
+            except Exception as e:
+                logger.exception(f"Batched prediction failed: {e}")
+                for future in futures:
+                    future.set_exception(e)
+                continue
+
+            self.batches += 1
+            self.items += len(batch)
+            for future, output in zip(futures, outputs):
+                future.set_result(output)
@@ -0,0 +1,172 @@
+import os
+import gc
+import time
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import tensorflow as tf
+
+from src.logging import logger
+from src.entity.config_entity import ModelComparisonConfig
+from src.models.registry import get_model_registry
+from src.inference.metrics import StreamingMetrics, latency_summary
+from src.preprocess import input_pipeline, image_cache
+from src.utils.common import save_json
+
+
+COLUMNS = ("accuracy", "loss", "precision", "recall", "f1", "roc_auc", "expected_calibration_error")
+
+
+class ModelComparison:
+    """
+    Class to score several candidate models on the same validation set.
+
+    The validation set is decoded and batched once and every batch is fed to
+    all candidates loaded at that time. Candidates are loaded through the
+    model registry in groups whose on-disk size fits both the comparison's
+    and the registry's memory budget, so the registry never evicts a model
+    of the group being scored; when more than one group is needed,
+    the decoded batches of the first pass are cached to disk and replayed
+    for the other groups, so scoring N models costs one decoding pass plus N
+    forward passes.
+
+    Attributes:
+    - config (ModelComparisonConfig): Configuration for the comparison.
+    """
+
+    def __init__(self, config: ModelComparisonConfig):
+        """
+        Initialize ModelComparison.
+
+        Args:
+        - config (ModelComparisonConfig): Configuration for the comparison.
+        """
+        self.config = config
+
+    def _valid_dataset(self) -> tf.data.Dataset:
+        """
+        Build the validation dataset, with the same split as ``Evaluation``.
+
+        The "generator" input pipeline is served by the equivalent tf.data
+        pipeline, which can be cached and replayed.
+        """
+        dataset_kwargs = dict(
+            image_size=self.config.params_image_size,
+            batch_size=self.config.params_batch_size,
+            subset="validation",
+            validation_split=0.30,
+            shuffle=False
+        )
+        if self.config.params_input_pipeline == "cache":
+            dataset, _ = image_cache.cached_dataset(cache_dir=self.config.image_cache_dir, **dataset_kwargs)
+        else:
+            dataset, _ = input_pipeline.directory_dataset(directory=str(self.config.training_data), **dataset_kwargs)
+        return dataset
+
+    def _groups(self, model_paths: List[Path]) -> List[List[Path]]:
+        """
+        Split the candidates into groups that fit the memory budget together.
+
+        A model's memory is estimated by its file size, which holds its
+        weights and, if saved, its optimizer state. A model larger than the
+        whole budget gets a group of its own. The budget is capped by the
+        model registry's, which holds the loaded models.
+        """
+        budget_mb = min(self.config.params_memory_budget_mb, get_model_registry().config.params_memory_budget_mb)
+        budget = budget_mb * 2 ** 20
+        groups, group, used = [], [], 0
+        for path in model_paths:
+            size = os.path.getsize(path)
+            if group and used + size > budget:
+                groups.append(group)
+                group, used = [], 0
+            group.append(path)
+            used += size
+        if group:
+            groups.append(group)
+        return groups
+
+    def _score_group(self, paths: List[Path], dataset: tf.data.Dataset) -> Dict[Path, dict]:
+        """
+        Score a group of models in one pass over the dataset.
+        """
+        registry = get_model_registry()
+        models = {path: registry.get(path) for path in paths}
+        metrics = {path: StreamingMetrics(self.config.params_class_names) for path in paths}
+        latencies = {path: [] for path in paths}
+
+        for images, labels in dataset:
+            labels = labels.numpy()
+            for path, model in models.items():
+                start = time.perf_counter()
+                probabilities = model.predict_on_batch(images)
+                latencies[path].append(time.perf_counter() - start)
+                metrics[path].update(labels, np.asarray(probabilities))
+
+        scores = {}
+        for path in paths:
+            scores[path] = metrics[path].result()
+            scores[path]["latency"] = latency_summary(latencies[path], metrics[path].samples)
+
+        del models
+        gc.collect()
+        return scores
+
+    def compare(self, model_paths: Optional[List[Path]] = None) -> List[dict]:
+        """
+        Score every candidate and write the comparison table.
+
+        Args:
+        - model_paths (List[Path] or None): Candidate .h5 files; ``config.model_paths`` if None.
+
+        Returns:
+        - List[dict]: One row per candidate, best accuracy first.
+        """
+        model_paths = [Path(path) for path in (model_paths or self.config.model_paths)]
+        missing = [str(path) for path in model_paths if not path.exists()]
+        if missing:
+            raise FileNotFoundError(f"Candidate models not found: {missing}")
+
+        groups = self._groups(model_paths)
+        dataset = self._valid_dataset()
+        os.makedirs(self.config.root_dir, exist_ok=True)
+        cache_dir = tempfile.mkdtemp(dir=self.config.root_dir)
+        if len(groups) > 1:
+            dataset = dataset.cache(os.path.join(cache_dir, "valid"))
+        logger.info(f"Comparing {len(model_paths)} models in {len(groups)} group(s)")
+
+        scores = {}
+        try:
+            for group in groups:
+                scores.update(self._score_group(group, dataset))
+        finally:
+            shutil.rmtree(cache_dir, ignore_errors=True)
+
+        rows = [
+            {"model": str(path), **{column: scores[path][column] for column in COLUMNS},
+             "latency_p50_ms": scores[path]["latency"].get("p50_ms")}
+            for path in model_paths
+        ]
+        rows.sort(key=lambda row: (-row["accuracy"], row["loss"]))
+        save_json(path=Path(self.config.report_file), data={
+            "table": rows,
+            "scores": {str(path): scores[path] for path in model_paths}
+        })
+        self.log_table(rows)
+        return rows
+
+    @staticmethod
+    def log_table(rows: List[dict]):
+        """
+        Log the comparison table, one line per candidate.
+        """
+        header = f"{'model':<48}" + "".join(f"{column[:12]:>14}" for column in COLUMNS) + f"{'p50 ms':>10}"
+        logger.info(header)
+        for row in rows:
+            values = "".join(
+                f"{row[column]:>14.4f}" if row[column] is not None else f"{'-':>14}" for column in COLUMNS
+            )
+            logger.info(f"{row['model'][-48:]:<48}{values}{row['latency_p50_ms'] or 0:>10.1f}")
@@ -1,10 +1,16 @@
+import time
+import numpy as np
 import tensorflow as tf
 from pathlib import Path
-import mlflow
-import mlflow.keras
-from urllib.parse import urlparse
+from typing import Optional
 from src.entity.config_entity import EvaluationConfig
 from src.utils.common import save_json
+from src.preprocess import input_pipeline, image_cache
+from src.models.registry import get_model_registry
+from src.inference.metrics import StreamingMetrics, latency_summary
+from src.utils.profiling import annotate
+from src.utils.tracking import get_mlflow_logger
+from src.utils.artifacts import ArtifactContext
 
 
 class Evaluation:
@@ -13,21 +19,53 @@ class Evaluation:
 
     Attributes:
     - config (EvaluationConfig): Configuration for evaluation.
+    - context (ArtifactContext or None): Hands over the trained model when training ran in this process.
     """
 
-    def __init__(self, config: EvaluationConfig):
+    def __init__(self, config: EvaluationConfig, context: Optional[ArtifactContext] = None):
         """
         Initialize Evaluation.
 
         Args:
         - config (EvaluationConfig): Configuration for evaluation.
+        - context (ArtifactContext or None): Hands over the trained model when training ran in this process.
         """
         self.config = config
+        self.context = context
 
     def _valid_generator(self):
         """
         Create a validation data generator.
+
+        Uses the image cache when ``params_input_pipeline`` is "cache", the
+        tf.data input pipeline when it is "tf_data", and ImageDataGenerator
+        otherwise.
         """
+        if self.config.params_input_pipeline not in input_pipeline.INPUT_PIPELINES:
+            raise ValueError(f"Unknown input pipeline: {self.config.params_input_pipeline}")
+
+        dataset_kwargs = dict(
+            image_size=self.config.params_image_size,
+            batch_size=self.config.params_batch_size,
+            subset="validation",
+            validation_split=0.30,
+            shuffle=False
+        )
+
+        if self.config.params_input_pipeline == "cache":
+            self.valid_generator, self.valid_samples = image_cache.cached_dataset(
+                cache_dir=self.config.image_cache_dir,
+                **dataset_kwargs
+            )
+            return
+
+        if self.config.params_input_pipeline == "tf_data":
+            self.valid_generator, self.valid_samples = input_pipeline.directory_dataset(
+                directory=str(self.config.training_data),
+                **dataset_kwargs
+            )
+            return
+
         datagenerator_kwargs = dict(
             rescale=1./255,
             validation_split=0.30
@@ -49,11 +87,12 @@ class Evaluation:
             shuffle=False,
             **dataflow_kwargs
         )
+        self.valid_samples = self.valid_generator.samples
 
     @staticmethod
     def load_model(path: Path) -> tf.keras.Model:
         """
-        Load a Keras model from a given path.
+        Load a Keras model from a given path through the model registry.
 
         Args:
         - path (Path): Path to the model file.
@@ -61,39 +100,79 @@ class Evaluation:
         Returns:
         - tf.keras.Model: Loaded Keras model.
         """
-        return tf.keras.models.load_model(path)
+        return get_model_registry().get(path)
+
+    def _batches(self):
+        """
+        Iterate once over the validation batches of any input pipeline.
+        """
+        if isinstance(self.valid_generator, tf.data.Dataset):
+            return iter(self.valid_generator)
+        # ImageDataGenerator iterators loop forever; index them once instead.
+        return (self.valid_generator[i] for i in range(len(self.valid_generator)))
 
     def evaluation(self):
         """
-        Evaluate the loaded model using the validation generator.
+        Evaluate the loaded model in a single pass over the validation set.
+
+        Each batch is predicted once and folded into streaming metric
+        accumulators, so loss, accuracy, precision/recall/F1, ROC-AUC, the
+        confusion matrix and calibration all come from the same pass with
+        memory independent of the dataset size. The time spent waiting for
+        each batch and predicting it are recorded separately.
         """
-        self.model = self.load_model(self.config.path_of_model)
+        if self.context is not None:
+            self.model = self.context.load_model(self.config.path_of_model, loader=self.load_model)
+        else:
+            self.model = self.load_model(self.config.path_of_model)
         self._valid_generator()
-        self.score = self.model.evaluate(self.valid_generator)
+
+        metrics = StreamingMetrics(self.config.params_class_names)
+        input_wait, latencies = [], []
+        batches = self._batches()
+        while True:
+            start = time.perf_counter()
+            try:
+                images, labels = next(batches)
+            except StopIteration:
+                break
+            input_wait.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            probabilities = self.model.predict_on_batch(images)
+            latencies.append(time.perf_counter() - start)
+            metrics.update(np.asarray(labels), np.asarray(probabilities))
+
+        self.scores = metrics.result()
+        self.scores["latency"] = latency_summary(latencies, metrics.samples)
+        self.scores["input_wait"] = latency_summary(input_wait, metrics.samples)
+        annotate("evaluation_latency", {"predict": self.scores["latency"], "input_wait": self.scores["input_wait"]})
         self.save_score()
         self.log_into_mlflow()
 
     def save_score(self):
         """
-        Save evaluation scores to a JSON file.
+        Save every evaluation metric to scores.json.
         """
-        scores = {"loss": self.score[0], "accuracy": self.score[1]}
-        save_json(path=Path("scores.json"), data=scores)
+        save_json(path=Path("scores.json"), data=self.scores)
 
     def log_into_mlflow(self):
         """
-        Log evaluation metrics and model to MLflow.
-        """
-        mlflow.set_registry_uri(self.config.mlflow_uri)
-        tracking_url_type_store = urlparse(mlflow.get_tracking_uri()).scheme
+        Log evaluation params, metrics and the model to MLflow without waiting on the tracking server.
 
-        with mlflow.start_run():
-            mlflow.log_params(self.config.all_params)
-            mlflow.log_metrics(
-                {"loss": self.score[0], "accuracy": self.score[1]}
-            )
-            # Model registry does not work with file store
-            if tracking_url_type_store != "file":
-                mlflow.keras.log_model(self.model, "model", registered_model_name="VGG16Model")
-            else:
-                mlflow.keras.log_model(self.model, "model")
+        Everything goes through the spooling MLflow logger, which flushes in
+        the background; the stage waits at most ``drain_timeout`` seconds.
+        """
+        tracker = get_mlflow_logger()
+        run = tracker.start_run()
+        tracker.log_params(run, self.config.all_params)
+        tracker.log_metrics(run, {
+            name: value for name, value in self.scores.items()
+            if isinstance(value, (int, float)) and not isinstance(value, bool)
+        })
+        if self.context is not None:
+            # Do not save the model while its background save is still reading it.
+            self.context.wait(self.config.path_of_model)
+        tracker.log_model(run, self.model, registered_model_name=self.config.registered_model_name)
+        tracker.end_run(run)
+        tracker.close(drain_timeout=tracker.config.drain_timeout)
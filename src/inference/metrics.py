@@ -0,0 +1,159 @@
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+
+EPSILON = 1e-7
+
+
+class StreamingMetrics:
+    """
+    Class to accumulate classification metrics one batch at a time.
+
+    Memory does not grow with the number of samples: the state is a
+    confusion matrix, loss and Brier sums, per-class score histograms for
+    ROC-AUC and reliability bins for calibration. ROC-AUC is computed from
+    the histograms, i.e. at ``auc_bins`` evenly spaced thresholds, like
+    ``tf.keras.metrics.AUC``.
+
+    Attributes:
+    - class_names (List[str]): Class names, indexed by model output.
+    - auc_bins (int): Number of score bins for ROC-AUC.
+    - calibration_bins (int): Number of confidence bins for calibration.
+    """
+
+    def __init__(self, class_names: Sequence[str], auc_bins: int = 1000, calibration_bins: int = 10):
+        self.class_names = list(class_names)
+        self.auc_bins = auc_bins
+        self.calibration_bins = calibration_bins
+
+        num_classes = len(self.class_names)
+        self.samples = 0
+        self.loss_sum = 0.0
+        self.brier_sum = 0.0
+        self.confusion = np.zeros((num_classes, num_classes), dtype=np.int64)
+        # [class, 0 = negatives / 1 = positives, score bin]
+        self.score_histogram = np.zeros((num_classes, 2, auc_bins), dtype=np.int64)
+        self.calibration_count = np.zeros(calibration_bins, dtype=np.int64)
+        self.calibration_confidence = np.zeros(calibration_bins)
+        self.calibration_correct = np.zeros(calibration_bins)
+
+    def update(self, labels: np.ndarray, probabilities: np.ndarray):
+        """
+        Add a batch.
+
+        Args:
+        - labels (np.ndarray): One-hot labels of shape (batch, classes).
+        - probabilities (np.ndarray): Predicted probabilities of shape (batch, classes).
+        """
+        labels = np.asarray(labels, dtype=np.float64)
+        probabilities = np.asarray(probabilities, dtype=np.float64)
+        true = labels.argmax(axis=1)
+        predicted = probabilities.argmax(axis=1)
+        rows = np.arange(len(true))
+
+        self.samples += len(true)
+        self.loss_sum += float(-np.log(np.clip(probabilities[rows, true], EPSILON, 1.0)).sum())
+        self.brier_sum += float(((probabilities - labels) ** 2).sum(axis=1).sum())
+        np.add.at(self.confusion, (true, predicted), 1)
+
+        bins = np.minimum((probabilities * self.auc_bins).astype(np.int64), self.auc_bins - 1)
+        for c in range(len(self.class_names)):
+            positive = (true == c).astype(np.int64)
+            np.add.at(self.score_histogram[c], (positive, bins[:, c]), 1)
+
+        confidence = probabilities[rows, predicted]
+        bins = np.minimum((confidence * self.calibration_bins).astype(np.int64), self.calibration_bins - 1)
+        np.add.at(self.calibration_count, bins, 1)
+        np.add.at(self.calibration_confidence, bins, confidence)
+        np.add.at(self.calibration_correct, bins, (predicted == true).astype(np.float64))
+
+    def _roc_auc(self, c: int) -> Optional[float]:
+        negatives, positives = self.score_histogram[c]
+        if not positives.sum() or not negatives.sum():
+            return None
+        # A positive outranks every negative in a lower bin and ties half of those in its own bin.
+        negatives_below = np.cumsum(negatives) - negatives
+        pairs = (positives * (negatives_below + 0.5 * negatives)).sum()
+        return float(pairs / (positives.sum() * negatives.sum()))
+
+    def result(self) -> dict:
+        """
+        Compute every metric from the accumulated state.
+
+        Returns:
+        - dict: loss, accuracy, per-class and macro precision/recall/F1 and
+          ROC-AUC, the confusion matrix, expected calibration error, Brier
+          score and the reliability bins.
+        """
+        samples = max(self.samples, 1)
+        true_positives = np.diag(self.confusion).astype(np.float64)
+        predicted = self.confusion.sum(axis=0)
+        actual = self.confusion.sum(axis=1)
+        precision = np.divide(true_positives, predicted, out=np.zeros_like(true_positives), where=predicted > 0)
+        recall = np.divide(true_positives, actual, out=np.zeros_like(true_positives), where=actual > 0)
+        f1 = np.divide(2 * precision * recall, precision + recall,
+                       out=np.zeros_like(true_positives), where=(precision + recall) > 0)
+
+        per_class = {}
+        for c, name in enumerate(self.class_names):
+            per_class[name] = {
+                "precision": float(precision[c]),
+                "recall": float(recall[c]),
+                "f1": float(f1[c]),
+                "roc_auc": self._roc_auc(c),
+                "support": int(actual[c])
+            }
+        aucs = [scores["roc_auc"] for scores in per_class.values() if scores["roc_auc"] is not None]
+
+        count = self.calibration_count
+        filled = count > 0
+        accuracy_per_bin = np.divide(self.calibration_correct, count, out=np.zeros(len(count)), where=filled)
+        confidence_per_bin = np.divide(self.calibration_confidence, count, out=np.zeros(len(count)), where=filled)
+        ece = float((count / samples * np.abs(accuracy_per_bin - confidence_per_bin)).sum())
+
+        return {
+            "loss": self.loss_sum / samples,
+            "accuracy": float(true_positives.sum() / samples),
+            "precision": float(precision.mean()),
+            "recall": float(recall.mean()),
+            "f1": float(f1.mean()),
+            "roc_auc": float(np.mean(aucs)) if aucs else None,
+            "expected_calibration_error": ece,
+            "brier_score": self.brier_sum / samples,
+            "samples": self.samples,
+            "per_class": per_class,
+            "confusion_matrix": self.confusion.tolist(),
+            "calibration": [
+                {
+                    "confidence": float(confidence_per_bin[b]),
+                    "accuracy": float(accuracy_per_bin[b]),
+                    "count": int(count[b])
+                }
+                for b in range(self.calibration_bins)
+            ]
+        }
+
+
+def latency_summary(seconds: List[float], images: int) -> dict:
+    """
+    Summarize per-batch latencies.
+
+    Args:
+    - seconds (List[float]): Wall time of each batch.
+    - images (int): Number of images over all batches.
+
+    Returns:
+    - dict: Batch count, mean/p50/p99/max milliseconds and images per second.
+    """
+    if not seconds:
+        return {"batches": 0}
+    values = np.asarray(seconds) * 1000
+    return {
+        "batches": len(values),
+        "mean_ms": float(values.mean()),
+        "p50_ms": float(np.percentile(values, 50)),
+        "p99_ms": float(np.percentile(values, 99)),
+        "max_ms": float(values.max()),
+        "images_per_second": images / float(np.sum(seconds)) if np.sum(seconds) else None
+    }
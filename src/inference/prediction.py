@@ -0,0 +1,190 @@
+import base64
+import threading
+from pathlib import Path
+from typing import Callable, List, Union
+import numpy as np
+import tensorflow as tf
+from src.logging import logger
+from src.entity.config_entity import PredictionConfig
+from src.inference.batching import MicroBatcher
+from src.inference.backends import load_backend
+from src.inference.prediction_cache import PredictionCache, model_version, content_key
+from src.preprocess import input_pipeline
+
+
+def base64_decoder(image_size: List[int]) -> Callable[[Union[str, bytes]], np.ndarray]:
+    """
+    Build a function decoding base64 encoded images in memory with ``decode_and_resize``.
+
+    The decode graph is traced once and can be shared by request threads.
+
+    Args:
+    - image_size (List[int]): Target size, e.g. [224, 224, 3].
+
+    Returns:
+    - Callable: Maps a base64 string to a uint8 array of shape ``image_size``.
+    """
+    decode = tf.function(
+        lambda contents: input_pipeline.decode_and_resize(contents, image_size),
+        input_signature=[tf.TensorSpec([], tf.string)]
+    )
+    return lambda imgstring: decode(tf.constant(base64.b64decode(imgstring))).numpy()
+
+
+class Prediction:
+    """
+    Class to serve predictions from the trained model.
+
+    The model is loaded once with the configured Keras or TFLite backend;
+    concurrent requests are combined into batches by a ``MicroBatcher``
+    before each backend ``predict`` call. Uploads are decoded from the
+    request's base64 string in memory, never touching the disk, and kept
+    as uint8 until the batcher copies them into its reused float32 batch
+    buffer, where they are rescaled in place.
+
+    Predictions are cached by a hash of the upload and of its decoded
+    pixels, so a repeated upload is answered without decoding it and a
+    re-encoded copy of a slice without running the model. The served model
+    file is checked on every request; when it is rewritten the model is
+    reloaded and the cache switches to the new version.
+
+    Attributes:
+    - config (PredictionConfig): Configuration for prediction.
+    """
+
+    def __init__(self, config: PredictionConfig):
+        """
+        Initialize Prediction and load the model.
+
+        Args:
+        - config (PredictionConfig): Configuration for prediction.
+        """
+        self.config = config
+        self._model_path = Path(
+            self.config.tflite_model_path if self.config.params_inference_backend == "tflite"
+            else self.config.path_of_model
+        )
+        self._version = model_version(self._model_path)
+        self._reload_lock = threading.Lock()
+        self._failed_version = None
+        self._model_missing = False
+        self.backend = self._load_backend()
+        self.cache = PredictionCache(
+            max_entries=self.config.params_cache_size,
+            disk_dir=self.config.cache_dir if self.config.params_cache_disk else None,
+            version=self._version
+        ) if self.config.params_cache_size > 0 else None
+        self.batcher = MicroBatcher(
+            predict_fn=self._predict_batch,
+            max_batch_size=self.config.params_max_batch_size,
+            max_wait_ms=self.config.params_max_wait_ms,
+            dtype=np.float32
+        )
+        self._decode = base64_decoder(self.config.params_image_size)
+
+    def _load_backend(self):
+        return load_backend(
+            backend=self.config.params_inference_backend,
+            keras_model_path=self.config.path_of_model,
+            tflite_model_path=self.config.tflite_model_path
+        )
+
+    def _check_model(self):
+        """
+        Reload the model and switch the cache's version if the model file was rewritten.
+
+        A file that cannot be loaded, e.g. one still being written, leaves the
+        current model in place and is not retried until it changes again. So
+        does a file that cannot be read at all, e.g. one briefly missing while
+        a deployment replaces it.
+        """
+        try:
+            version = model_version(self._model_path)
+        except OSError as e:
+            if not self._model_missing:
+                self._model_missing = True
+                logger.warning(f"Cannot read {self._model_path}, serving the previous model: {e!r}")
+            return
+        self._model_missing = False
+        if version == self._version or version == self._failed_version:
+            return
+        with self._reload_lock:
+            if version == self._version:
+                return
+            try:
+                self.backend = self._load_backend()
+            except Exception as e:
+                self._failed_version = version
+                logger.warning(f"Could not reload {self._model_path}, serving the previous model: {e!r}")
+                return
+            self._version = version
+            if self.cache is not None:
+                self.cache.set_version(version)
+
+    def _predict_batch(self, batch: np.ndarray) -> np.ndarray:
+        """
+        Rescale a batch of pixel values in place, as ``input_pipeline.rescale`` does, and predict it.
+        """
+        np.multiply(batch, np.float32(1. / 255), out=batch)
+        return self.backend.predict(batch)
+
+    def decode(self, imgstring) -> np.ndarray:
+        """
+        Decode a base64 encoded image in memory into resized uint8 pixels.
+
+        Args:
+        - imgstring (str or bytes): Base64 encoded image.
+
+        Returns:
+        - np.ndarray: uint8 image of shape ``params_image_size``.
+        """
+        return self._decode(imgstring)
+
+    def load_image(self, imgstring) -> np.ndarray:
+        """
+        Decode a base64 encoded image into a rescaled model input.
+
+        Args:
+        - imgstring (str or bytes): Base64 encoded image.
+
+        Returns:
+        - np.ndarray: float32 image of shape ``params_image_size``.
+        """
+        return input_pipeline.rescale(self.decode(imgstring)).numpy()
+
+    def predict(self, imgstring: str) -> dict:
+        """
+        Predict the class of a base64 encoded image.
+
+        Args:
+        - imgstring (str): Base64 encoded image.
+
+        Returns:
+        - dict: Predicted class name and per-class probabilities.
+        """
+        self._check_model()
+        probabilities = self._cached_predict(imgstring)
+        return {
+            "class": self.config.params_class_names[int(np.argmax(probabilities))],
+            "probabilities": dict(zip(self.config.params_class_names, map(float, probabilities)))
+        }
+
+    def _cached_predict(self, imgstring) -> np.ndarray:
+        """
+        Return the probabilities for an upload from the cache, predicting them on a miss.
+        """
+        if self.cache is None:
+            return self.batcher.predict(self.decode(imgstring))
+
+        version = self.cache.version
+        upload_key = content_key(imgstring)
+        probabilities = self.cache.get(upload_key, count_miss=False)
+        if probabilities is None:
+            image = self.decode(imgstring)
+            pixels_key = content_key(image)
+            probabilities = self.cache.get(pixels_key)
+            if probabilities is None:
+                probabilities = self.batcher.predict(image)
+                self.cache.put(pixels_key, probabilities, version)
+            self.cache.put(upload_key, probabilities, version)
+        return probabilities
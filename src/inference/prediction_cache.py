@@ -0,0 +1,190 @@
+import os
+import shutil
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
+
+from src.logging import logger
+
+
+def model_version(path: Path) -> str:
+    """
+    Identify the model file at ``path`` by its resolved path, size and modification time.
+
+    Args:
+    - path (Path): Path to the served model file.
+
+    Returns:
+    - str: Short hex digest, changing whenever the file is rewritten.
+    """
+    stat = os.stat(path)
+    key = f"{Path(path).resolve()}:{stat.st_size}:{stat.st_mtime_ns}"
+    return hashlib.blake2b(key.encode(), digest_size=8).hexdigest()
+
+
+def content_key(data: Union[str, bytes, np.ndarray]) -> str:
+    """
+    Hash an upload or its decoded pixels into a cache key.
+
+    Args:
+    - data (str, bytes or np.ndarray): Base64 upload or contiguous decoded image.
+
+    Returns:
+    - str: Hex digest of the contents.
+    """
+    if isinstance(data, str):
+        data = data.encode()
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+class PredictionCache:
+    """
+    Cache of class probabilities keyed by image content, for one model version.
+
+    The memory tier is an LRU of at most ``max_entries`` keys; the optional
+    disk tier stores one ``.npy`` file per key under a directory named after
+    the model version, so it survives restarts and is shared by workers.
+    Changing the version empties the memory tier and deletes the disk
+    entries of every other version.
+
+    Attributes:
+    - max_entries (int): Largest number of keys kept in memory.
+    - disk_dir (Path or None): Root of the disk tier, or None for memory only.
+    - version (str): Model version the cached probabilities belong to.
+    """
+
+    def __init__(self, max_entries: int, disk_dir: Optional[Path] = None, version: str = ""):
+        """
+        Initialize PredictionCache.
+
+        Args:
+        - max_entries (int): Largest number of keys kept in memory.
+        - disk_dir (Path or None): Root of the disk tier, or None for memory only.
+        - version (str): Model version the cached probabilities belong to.
+        """
+        self.max_entries = max_entries
+        self.disk_dir = Path(disk_dir) if disk_dir is not None else None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.version = None
+        self.set_version(version)
+
+    def _disk_path(self, key: str) -> Path:
+        return self.disk_dir / self.version / f"{key}.npy"
+
+    def set_version(self, version: str):
+        """
+        Switch to another model version, dropping the entries of the previous ones.
+        """
+        with self._lock:
+            if version == self.version:
+                return
+            if self.version is not None:
+                self.invalidations += 1
+                logger.info(f"Model changed to version {version}; dropping {len(self._entries)} cached predictions")
+            self.version = version
+            self._entries.clear()
+
+        if self.disk_dir is not None:
+            os.makedirs(self.disk_dir / version, exist_ok=True)
+            for stale in self.disk_dir.iterdir():
+                if stale.is_dir() and stale.name != version:
+                    shutil.rmtree(stale, ignore_errors=True)
+
+    def get(self, key: str, count_miss: bool = True) -> Optional[np.ndarray]:
+        """
+        Look up the probabilities cached for ``key``, promoting disk hits to memory.
+
+        Args:
+        - key (str): Content key.
+        - count_miss (bool): Whether a miss counts towards the hit rate; False
+          for a lookup that is followed by another one for the same request.
+
+        Returns:
+        - np.ndarray or None: Cached probabilities, or None on a miss.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.memory_hits += 1
+                return self._entries[key]
+
+        if self.disk_dir is not None:
+            try:
+                probabilities = np.load(self._disk_path(key))
+            except (OSError, ValueError):
+                probabilities = None
+            if probabilities is not None:
+                with self._lock:
+                    self.disk_hits += 1
+                    self._insert(key, probabilities)
+                return probabilities
+
+        if count_miss:
+            with self._lock:
+                self.misses += 1
+        return None
+
+    def put(self, key: str, probabilities: np.ndarray, version: Optional[str] = None):
+        """
+        Cache the probabilities predicted for ``key`` in every tier.
+
+        Args:
+        - key (str): Content key.
+        - probabilities (np.ndarray): Class probabilities.
+        - version (str or None): Model version that predicted them; a result of
+          a version replaced in the meantime is not cached.
+        """
+        probabilities = np.array(probabilities, dtype=np.float32)
+        with self._lock:
+            if version is not None and version != self.version:
+                return
+            self._insert(key, probabilities)
+
+        if self.disk_dir is not None:
+            path = self._disk_path(key)
+            tmp = path.with_name(f"{path.stem}.{threading.get_ident()}.tmp")
+            try:
+                with open(tmp, "wb") as f:
+                    np.save(f, probabilities)
+                os.replace(tmp, path)
+            except OSError as e:
+                logger.warning(f"Could not write cached prediction {path}: {e}")
+
+    def _insert(self, key: str, probabilities: np.ndarray):
+        """
+        Add an entry to the memory tier and evict the least recently used ones; needs the lock.
+        """
+        self._entries[key] = probabilities
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        """
+        Return hit/miss/eviction counters, the hit rate and the memory tier size.
+        """
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "version": self.version,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "disk": self.disk_dir is not None
+            }
@@ -0,0 +1,159 @@
+import time
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import tensorflow as tf
+
+
+def _identity(inputs: tf.Tensor) -> tf.Tensor:
+    return inputs
+
+
+# Each backbone: the Keras application and the layers mapping the pipeline's
+# [0, 1] RGB inputs to the range and channel order its ImageNet weights were
+# trained on, as its ``preprocess_input`` does. VGG16 keeps the [0, 1] inputs
+# it has always been trained on in this project.
+BACKBONES: Dict[str, tuple] = {
+    "vgg16": (tf.keras.applications.VGG16, _identity),
+    "mobilenet_v2": (
+        tf.keras.applications.MobileNetV2,
+        lambda inputs: tf.keras.layers.Rescaling(2.0, offset=-1.0)(inputs)
+    ),
+    # EfficientNet rescales and normalizes [0, 255] inputs itself.
+    "efficientnet_b0": (
+        tf.keras.applications.EfficientNetB0,
+        lambda inputs: tf.keras.layers.Rescaling(255.0)(inputs)
+    ),
+    # Caffe-style: channels reversed to BGR, then the BGR ImageNet mean subtracted.
+    "resnet50": (
+        tf.keras.applications.ResNet50,
+        lambda inputs: tf.keras.layers.Normalization(mean=[103.939, 116.779, 123.68], variance=[1.0, 1.0, 1.0])(
+            tf.keras.layers.Rescaling(255.0)(inputs)[..., ::-1]
+        )
+    ),
+}
+
+
+def flatten_head(features: tf.Tensor, classes: int, dropout: float) -> tf.Tensor:
+    x = tf.keras.layers.Flatten()(features)
+    return tf.keras.layers.Dense(units=classes, activation="softmax")(x)
+
+
+def gap_head(features: tf.Tensor, classes: int, dropout: float) -> tf.Tensor:
+    x = tf.keras.layers.GlobalAveragePooling2D()(features)
+    return tf.keras.layers.Dense(units=classes, activation="softmax")(x)
+
+
+def gap_dropout_head(features: tf.Tensor, classes: int, dropout: float) -> tf.Tensor:
+    x = tf.keras.layers.GlobalAveragePooling2D()(features)
+    x = tf.keras.layers.Dropout(dropout)(x)
+    return tf.keras.layers.Dense(units=classes, activation="softmax")(x)
+
+
+HEADS: Dict[str, Callable[[tf.Tensor, int, float], tf.Tensor]] = {
+    "flatten": flatten_head,
+    "gap": gap_head,
+    "gap_dropout": gap_dropout_head,
+}
+
+
+def build_backbone(name: str, input_shape: List[int], weights: Optional[str], include_top: bool) -> tf.keras.Model:
+    """
+    Build a registered backbone taking [0, 1] RGB inputs.
+
+    The input adapter layers are part of the returned model, which stays a
+    single flat functional model like a bare Keras application.
+
+    Args:
+    - name (str): Key in ``BACKBONES``.
+    - input_shape (List[int]): Input shape, e.g. [224, 224, 3].
+    - weights (str or None): "imagenet", a weights file or None.
+    - include_top (bool): Whether to include the ImageNet classifier.
+
+    Returns:
+    - tf.keras.Model: The backbone.
+    """
+    if name not in BACKBONES:
+        raise ValueError(f"Unknown backbone: {name}; expected one of {sorted(BACKBONES)}")
+    application, adapter = BACKBONES[name]
+    if adapter is _identity:
+        return application(input_shape=input_shape, weights=weights, include_top=include_top)
+    inputs = tf.keras.Input(shape=input_shape)
+    return application(input_tensor=adapter(inputs), weights=weights, include_top=include_top)
+
+
+def build_head(name: str, features: tf.Tensor, classes: int, dropout: float = 0.0) -> tf.Tensor:
+    """
+    Attach a registered classification head to backbone features.
+
+    Args:
+    - name (str): Key in ``HEADS``.
+    - features (tf.Tensor): Backbone output.
+    - classes (int): Number of classes.
+    - dropout (float): Dropout rate, for heads that use it.
+
+    Returns:
+    - tf.Tensor: Softmax probabilities.
+    """
+    if name not in HEADS:
+        raise ValueError(f"Unknown head: {name}; expected one of {sorted(HEADS)}")
+    return HEADS[name](features, classes, dropout)
+
+
+def model_flops(model: tf.keras.Model) -> int:
+    """
+    Count the floating-point operations of one batch-1 forward pass.
+    """
+    from tensorflow.python.framework.convert_to_constants import convert_variables_to_constants_v2
+
+    spec = tf.TensorSpec([1, *model.input_shape[1:]], model.inputs[0].dtype)
+    concrete = tf.function(lambda x: model(x, training=False)).get_concrete_function(spec)
+    frozen = convert_variables_to_constants_v2(concrete)
+    profile = tf.compat.v1.profiler.profile(
+        graph=frozen.graph,
+        run_meta=tf.compat.v1.RunMetadata(),
+        cmd="op",
+        options=tf.compat.v1.profiler.ProfileOptionBuilder(
+            tf.compat.v1.profiler.ProfileOptionBuilder.float_operation()
+        ).with_empty_output().build()
+    )
+    return int(profile.total_float_ops)
+
+
+def cpu_latency_ms(model: tf.keras.Model, samples: int) -> float:
+    """
+    Median batch-1 CPU latency of a model on random inputs, in milliseconds.
+    """
+    images = np.random.default_rng(0).random((1, *model.input_shape[1:]), dtype=np.float32)
+    with tf.device("/CPU:0"):
+        model.predict_on_batch(images)
+        latencies = []
+        for _ in range(samples):
+            start = time.perf_counter()
+            model.predict_on_batch(images)
+            latencies.append(time.perf_counter() - start)
+    return float(np.median(latencies) * 1000)
+
+
+def profile_model(model: tf.keras.Model, backbone: tf.keras.Model, latency_samples: int) -> dict:
+    """
+    Measure the cost of a backbone/head combination.
+
+    Args:
+    - model (tf.keras.Model): Full model.
+    - backbone (tf.keras.Model): Its backbone.
+    - latency_samples (int): Number of batch-1 predictions timed.
+
+    Returns:
+    - dict: FLOPs, parameter counts (total, backbone, head, trainable) and CPU latency.
+    """
+    parameters = int(model.count_params())
+    backbone_parameters = int(backbone.count_params())
+    return {
+        "flops": model_flops(model),
+        "parameters": parameters,
+        "backbone_parameters": backbone_parameters,
+        "head_parameters": parameters - backbone_parameters,
+        "trainable_parameters": int(sum(np.prod(w.shape) for w in model.trainable_weights)),
+        "cpu_latency_ms": cpu_latency_ms(model, latency_samples)
+    }
@@ -3,7 +3,13 @@ import urllib.request as request
 from zipfile import ZipFile
 import tensorflow as tf
 from pathlib import Path
+from typing import Optional
+from src.logging import logger
 from src.entity.config_entity import BaseModelConfig
+from src.models.architectures import build_backbone, build_head, profile_model
+from src.models.weights_store import WeightsStore
+from src.utils.artifacts import ArtifactContext
+from src.utils.common import save_json
 
 
 class BaseModel:
@@ -12,32 +18,44 @@ class BaseModel:
 
     Attributes:
     - config (BaseModelConfig): Configuration for preparing the base model.
+    - context (ArtifactContext or None): Hands the models to later stages of the same process.
     """
 
-    def __init__(self, config: BaseModelConfig):
+    def __init__(self, config: BaseModelConfig, context: Optional[ArtifactContext] = None):
         """
         Initialize BaseModel.
 
         Args:
         - config (BaseModelConfig): Configuration for preparing the base model.
+        - context (ArtifactContext or None): Hands the models to later stages of the same process.
         """
         self.config = config
+        self.context = context
 
     def get_base_model(self):
         """
         Retrieve the base model.
 
-        Downloads the VGG16 model and saves it to the specified path.
+        Builds the configured backbone (``BACKBONE`` in params.yaml) and
+        saves it to the specified path. ImageNet weights come from the local
+        weights store, which downloads them only when they are missing and
+        offline mode is off.
         """
-        self.model = tf.keras.applications.vgg16.VGG16(
+        from_store = self.config.params_weights == "imagenet"
+        self.model = build_backbone(
+            name=self.config.params_backbone,
             input_shape=self.config.params_image_size,
-            weights=self.config.params_weights,
+            weights=None if from_store else self.config.params_weights,
             include_top=self.config.params_include_top
         )
-        self.save_model(path=self.config.base_model_path, model=self.model)
+        if from_store:
+            WeightsStore(self.config.weights_store_dir, offline=self.config.weights_offline).load(
+                self.model, self.config.params_backbone, self.config.params_include_top
+            )
+        self._hand_over(path=self.config.base_model_path, model=self.model)
 
     @staticmethod
-    def _prepare_full_model(model, classes, freeze_all, freeze_till, learning_rate):
+    def _prepare_full_model(model, classes, freeze_all, freeze_till, learning_rate, head="flatten", dropout=0.0):
         """
         Prepare the full model.
 
@@ -47,6 +65,8 @@ class BaseModel:
         - freeze_all (bool): Whether to freeze all layers of the base model.
         - freeze_till (int or None): Number of layers to freeze from the top.
         - learning_rate (float): Learning rate for model training.
+        - head (str): Classification head, a key of ``architectures.HEADS``.
+        - dropout (float): Dropout rate of the "gap_dropout" head.
 
         Returns:
         - tf.keras.Model: Compiled full model.
@@ -58,11 +78,7 @@ class BaseModel:
             for layer in model.layers[:-freeze_till]:
                 model.trainable = False
 
-        flatten_in = tf.keras.layers.Flatten()(model.output)
-        prediction = tf.keras.layers.Dense(
-            units=classes,
-            activation="softmax"
-        )(flatten_in)
+        prediction = build_head(head, model.output, classes, dropout)
 
         full_model = tf.keras.models.Model(
             inputs=model.input,
@@ -89,10 +105,44 @@ class BaseModel:
             classes=self.config.params_classes,
             freeze_all=True,
             freeze_till=None,
-            learning_rate=self.config.params_learning_rate
+            learning_rate=self.config.params_learning_rate,
+            head=self.config.params_head,
+            dropout=self.config.params_head_dropout
         )
 
-        self.save_model(path=self.config.updated_base_model_path, model=self.full_model)
+        self._hand_over(path=self.config.updated_base_model_path, model=self.full_model)
+        self.report_architecture()
+
+    def report_architecture(self) -> dict:
+        """
+        Measure FLOPs, parameter counts and CPU latency of the full model and save them.
+
+        Returns:
+        - dict: The architecture report.
+        """
+        report = {
+            "backbone": self.config.params_backbone,
+            "head": self.config.params_head,
+            **profile_model(self.full_model, self.model, self.config.params_latency_samples)
+        }
+        save_json(path=self.config.architecture_report_file, data=report)
+        logger.info(
+            f"{report['backbone']} + {report['head']} head: {report['flops'] / 1e9:.2f} GFLOPs, "
+            f"{report['parameters']} parameters ({report['head_parameters']} in the head), "
+            f"{report['cpu_latency_ms']:.1f} ms on CPU"
+        )
+        return report
+
+    def _hand_over(self, path: Path, model: tf.keras.Model):
+        """
+        Save a model, in the background and handing it over in memory when running with a context.
+
+        Training modifies the models in place, so the context saves snapshots.
+        """
+        if self.context is not None:
+            self.context.put(path, model, mutable=True)
+        else:
+            self.save_model(path=path, model=model)
 
     @staticmethod
     def save_model(path: Path, model: tf.keras.Model):
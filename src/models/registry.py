@@ -0,0 +1,160 @@
+import os
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import tensorflow as tf
+
+from src.logging import logger
+from src.entity.config_entity import ModelRegistryConfig
+
+
+def model_nbytes(model: tf.keras.Model) -> int:
+    """
+    Estimate the memory held by a model's variables, in bytes.
+    """
+    variables = list(model.weights)
+    if getattr(model, "optimizer", None) is not None:
+        variables += list(model.optimizer.variables())
+    return sum(int(np.prod(v.shape)) * v.dtype.size for v in variables)
+
+
+class ModelRegistry:
+    """
+    Process-wide cache of loaded Keras models.
+
+    Models are keyed by resolved path, file size and modification time, so
+    a rewritten file is reloaded. The least recently used models are evicted
+    while the cached variables exceed the memory budget. A model is loaded
+    outside the registry lock, so other models are served meanwhile;
+    concurrent callers asking for the same model wait for that one load.
+
+    Attributes:
+    - config (ModelRegistryConfig): Configuration for the model registry.
+    """
+
+    def __init__(self, config: ModelRegistryConfig):
+        """
+        Initialize ModelRegistry.
+
+        Args:
+        - config (ModelRegistryConfig): Configuration for the model registry.
+        """
+        self.config = config
+        self._models = OrderedDict()
+        self._loading: dict = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.load_time = 0.0
+
+    @staticmethod
+    def _key(path: Path) -> tuple:
+        stat = os.stat(path)
+        return str(Path(path).resolve()), stat.st_size, stat.st_mtime_ns
+
+    def get(self, path: Path) -> tf.keras.Model:
+        """
+        Return the model stored at ``path``, loading it on a miss.
+
+        Args:
+        - path (Path): Path to the model file.
+
+        Returns:
+        - tf.keras.Model: Loaded model, shared with other callers.
+        """
+        key = self._key(path)
+        with self._lock:
+            if key in self._models:
+                self._models.move_to_end(key)
+                self.hits += 1
+                return self._models[key][0]
+            loading = self._loading.get(key)
+            if loading is None:
+                self.misses += 1
+                loading = self._loading[key] = Future()
+                waiting = False
+            else:
+                self.hits += 1
+                waiting = True
+
+        if waiting:
+            return loading.result()
+
+        try:
+            start = time.perf_counter()
+            model = tf.keras.models.load_model(path)
+            if self.config.params_warmup:
+                model.predict_on_batch(np.zeros((1, *model.input_shape[1:]), dtype=np.float32))
+            elapsed = time.perf_counter() - start
+            logger.info(f"Loaded model {path} in {elapsed:.2f}s")
+        except BaseException as e:
+            with self._lock:
+                del self._loading[key]
+            loading.set_exception(e)
+            raise
+
+        with self._lock:
+            del self._loading[key]
+            self.load_time += elapsed
+            # A newer file at the same path replaces the stale entry.
+            for stale in [k for k in self._models if k[0] == key[0]]:
+                del self._models[stale]
+            self._models[key] = (model, model_nbytes(model))
+            self._evict()
+        loading.set_result(model)
+        return model
+
+    def _evict(self):
+        """
+        Drop least recently used models until the budget is met, keeping at least one.
+        """
+        budget = self.config.params_memory_budget_mb * 1024 ** 2
+        while len(self._models) > 1 and sum(nbytes for _, nbytes in self._models.values()) > budget:
+            key, _ = self._models.popitem(last=False)
+            self.evictions += 1
+            logger.info(f"Evicted model {key[0]} from the model registry")
+
+    def clear(self):
+        """
+        Drop every cached model.
+        """
+        with self._lock:
+            self._models.clear()
+
+    def stats(self) -> dict:
+        """
+        Return hit/miss/eviction counters, total load time and cached models.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "load_time_s": self.load_time,
+                "models": [
+                    {"path": key[0], "size_mb": nbytes / 1024 ** 2}
+                    for key, (_, nbytes) in self._models.items()
+                ]
+            }
+
+
+_registry: Optional[ModelRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_model_registry() -> ModelRegistry:
+    """
+    Return the process-wide model registry, creating it from params.yaml on first use.
+    """
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            from src.config.configuration import ConfigurationManager
+            _registry = ModelRegistry(ConfigurationManager().get_model_registry_config())
+        return _registry
@@ -0,0 +1,170 @@
+import time
+import shutil
+from pathlib import Path
+
+import numpy as np
+import tensorflow as tf
+
+from src.logging import logger
+from src.entity.config_entity import TFLiteExportConfig
+from src.inference.backends import KerasBackend, TFLiteBackend
+from src.preprocess import input_pipeline, image_cache
+from src.utils.common import save_json, get_size
+
+
+QUANTIZATIONS = ("dynamic_range", "float16", "int8")
+
+
+class TFLiteExport:
+    """
+    Class to convert the trained model to quantized TFLite variants.
+
+    Attributes:
+    - config (TFLiteExportConfig): Configuration for the TFLite export.
+    """
+
+    def __init__(self, config: TFLiteExportConfig):
+        """
+        Initialize TFLiteExport.
+
+        Args:
+        - config (TFLiteExportConfig): Configuration for the TFLite export.
+        """
+        self.config = config
+
+    def _representative_dataset(self):
+        """
+        Yield a random sample of training images for int8 calibration.
+
+        Only the training subset is sampled, so the validation images that
+        ``measure`` scores the variants on are never seen by the calibration.
+        """
+        filepaths, labels, _ = input_pipeline.list_image_files(str(self.config.training_data))
+        training = input_pipeline.subset_indices(labels, "training", validation_split=0.30)
+        rng = np.random.default_rng(0)
+        sample = rng.choice(training, size=min(self.config.params_calibration_samples, len(training)), replace=False)
+        for index in sample:
+            image = input_pipeline.load_image(filepaths[index], self.config.params_image_size)
+            yield [input_pipeline.rescale(image)[tf.newaxis]]
+
+    def convert(self, quantization: str) -> bytes:
+        """
+        Convert the trained model with post-training quantization.
+
+        Args:
+        - quantization (str): "dynamic_range", "float16" or "int8".
+
+        Returns:
+        - bytes: Serialized TFLite model.
+        """
+        converter = tf.lite.TFLiteConverter.from_keras_model(self.model)
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+
+        if quantization == "float16":
+            converter.target_spec.supported_types = [tf.float16]
+        elif quantization == "int8":
+            # Full-integer kernels with float input/output, so callers keep feeding rescaled images.
+            converter.representative_dataset = self._representative_dataset
+            converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+        elif quantization != "dynamic_range":
+            raise ValueError(f"Unknown quantization: {quantization}; expected one of {QUANTIZATIONS}")
+
+        return converter.convert()
+
+    def _validation_dataset(self) -> tf.data.Dataset:
+        """
+        Build the validation split used by Evaluation.
+        """
+        dataset_kwargs = dict(
+            image_size=self.config.params_image_size,
+            batch_size=self.config.params_batch_size,
+            subset="validation",
+            validation_split=0.30
+        )
+        if self.config.params_input_pipeline == "cache":
+            dataset, _ = image_cache.cached_dataset(cache_dir=self.config.image_cache_dir, **dataset_kwargs)
+        else:
+            dataset, _ = input_pipeline.directory_dataset(directory=str(self.config.training_data), **dataset_kwargs)
+        return dataset
+
+    def measure(self, backend) -> dict:
+        """
+        Measure validation accuracy and batch-1 latency of a backend.
+
+        Args:
+        - backend (KerasBackend or TFLiteBackend): Backend to measure.
+
+        Returns:
+        - dict: Accuracy and mean/p50 per-image latency in milliseconds.
+        """
+        correct, total, samples = 0, 0, []
+        for x, y in self._validation_dataset():
+            x = x.numpy()
+            probabilities = backend.predict(x)
+            correct += int(np.sum(np.argmax(probabilities, axis=-1) == np.argmax(y, axis=-1)))
+            total += len(x)
+            samples.extend(x[:max(0, self.config.params_latency_samples - len(samples))])
+
+        # Timed after the accuracy pass, so no sample pays for resizing the
+        # interpreter (or retracing Keras) between batch shapes; the warm-up
+        # call takes that cost once.
+        latencies = []
+        if samples:
+            backend.predict(samples[0][np.newaxis])
+        for image in samples:
+            start = time.perf_counter()
+            backend.predict(image[np.newaxis])
+            latencies.append((time.perf_counter() - start) * 1000)
+
+        return {
+            "accuracy": correct / total if total else 0.0,
+            "latency_ms_mean": float(np.mean(latencies)) if latencies else None,
+            "latency_ms_p50": float(np.median(latencies)) if latencies else None
+        }
+
+    def export(self):
+        """
+        Convert every configured variant, measure it and select the fastest
+        one within the accuracy budget.
+
+        The report is written to ``report.json`` and the selected variant is
+        copied to ``tflite_model_path``. When no variant is within the budget,
+        ``tflite_model_path`` is removed, so the TFLite backend fails to start
+        rather than serving a model selected by an earlier run.
+        """
+        keras_backend = KerasBackend(self.config.trained_model_path)
+        self.model = keras_backend.model
+
+        reference = self.measure(keras_backend)
+        reference["size"] = get_size(self.config.trained_model_path)
+        report = {"keras": reference, "variants": {}}
+
+        for quantization in self.config.params_quantizations:
+            path = Path(self.config.root_dir) / f"model_{quantization}.tflite"
+            path.write_bytes(self.convert(quantization))
+
+            result = self.measure(TFLiteBackend(path))
+            result["size"] = get_size(path)
+            result["accuracy_delta"] = result["accuracy"] - reference["accuracy"]
+            report["variants"][quantization] = result
+            logger.info(f"TFLite {quantization}: {result}")
+
+        within_budget = [
+            name for name, result in report["variants"].items()
+            if -result["accuracy_delta"] <= self.config.params_accuracy_budget
+        ]
+        if within_budget:
+            selected = min(within_budget, key=lambda name: report["variants"][name]["latency_ms_mean"])
+            shutil.copyfile(Path(self.config.root_dir) / f"model_{selected}.tflite", self.config.tflite_model_path)
+            report["selected"] = selected
+            logger.info(f"Selected TFLite variant {selected} -> {self.config.tflite_model_path}")
+        else:
+            # A model selected by an earlier run must not keep being served.
+            report["selected"] = None
+            Path(self.config.tflite_model_path).unlink(missing_ok=True)
+            logger.warning(
+                f"No TFLite variant within accuracy budget {self.config.params_accuracy_budget}; "
+                f"removed {self.config.tflite_model_path}"
+            )
+
+        save_json(path=Path(self.config.root_dir) / "report.json", data=report)
@@ -0,0 +1,219 @@
+import os
+import json
+import socket
+import argparse
+from pathlib import Path
+from typing import List
+
+import numpy as np
+import tensorflow as tf
+
+from src.logging import logger
+from src.models.architectures import BACKBONES, build_backbone
+from src.preprocess.downloader import sha256sum
+
+
+MANIFEST_FILE = "manifest.json"
+# Per-machine record of the files verified there; ignored on other machines.
+VERIFIED_FILE = "verified-{host}.json"
+
+
+def _stat_key(path: Path) -> list:
+    """
+    Identify a file on this machine; a copy or a rewrite changes it even if size and mtime are kept.
+    """
+    stat = path.stat()
+    return [stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns]
+
+
+class WeightsStore:
+    """
+    Local store of pretrained backbone weights with a checksum manifest.
+
+    Each entry is one flat float32 ``.npy`` file holding all the weights of a
+    backbone in ``model.weights`` order; the manifest records their shapes
+    and the file's SHA-256. Files are memory-mapped when loaded, so repeated
+    runs skip both the download and the HDF5 parsing and only touch the
+    pages ``set_weights`` copies. Each machine verifies a file's digest on
+    first use and records the file's device, inode, size and modification
+    time in its own ``verified-<host>.json``; the digest is checked again
+    whenever those change. A copied store, even one copied with its
+    timestamps preserved, is therefore verified on the machine it lands on.
+
+    In offline mode a missing entry raises instead of letting Keras try to
+    download the weights, which hangs on machines without internet access.
+
+    Attributes:
+    - root_dir (Path): Directory holding the weight files and the manifest.
+    - offline (bool): Whether downloading missing weights is forbidden.
+    """
+
+    def __init__(self, root_dir: Path, offline: bool = False):
+        """
+        Initialize WeightsStore.
+
+        Args:
+        - root_dir (Path): Directory holding the weight files and the manifest.
+        - offline (bool): Whether downloading missing weights is forbidden.
+        """
+        self.root_dir = Path(root_dir)
+        self.offline = offline
+        self.manifest_file = self.root_dir / MANIFEST_FILE
+
+    @staticmethod
+    def key(backbone: str, include_top: bool) -> str:
+        return f"{backbone}_{'top' if include_top else 'notop'}"
+
+    def _manifest(self) -> dict:
+        if not self.manifest_file.exists():
+            return {}
+        with open(self.manifest_file) as f:
+            return json.load(f)
+
+    def _save_manifest(self, manifest: dict):
+        os.makedirs(self.root_dir, exist_ok=True)
+        tmp = self.manifest_file.with_name(MANIFEST_FILE + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump(manifest, f, indent=4)
+        os.replace(tmp, self.manifest_file)
+
+    def _verified_file(self) -> Path:
+        return self.root_dir / VERIFIED_FILE.format(host=socket.gethostname())
+
+    def _verified(self) -> dict:
+        if not self._verified_file().exists():
+            return {}
+        with open(self._verified_file()) as f:
+            return json.load(f)
+
+    def _mark_verified(self, key: str, sha256: str, path: Path):
+        """
+        Record that ``path`` matched ``sha256`` on this machine, if the store is writable.
+        """
+        verified = self._verified()
+        verified[key] = {"sha256": sha256, "stat": _stat_key(path)}
+        tmp = self._verified_file().with_name(self._verified_file().name + ".tmp")
+        try:
+            with open(tmp, "w") as f:
+                json.dump(verified, f, indent=4)
+            os.replace(tmp, self._verified_file())
+        except OSError as e:
+            logger.info(f"Could not record the verification of {path} ({e}); it is verified again on next use")
+
+    def add(self, key: str, model: tf.keras.Model):
+        """
+        Store the weights of a model under ``key``.
+
+        Args:
+        - key (str): Entry name, from ``WeightsStore.key``.
+        - model (tf.keras.Model): Model holding the pretrained weights.
+        """
+        weights = model.get_weights()
+        os.makedirs(self.root_dir, exist_ok=True)
+        path = self.root_dir / f"{key}.npy"
+        tmp = path.with_name(path.name + ".tmp")
+        flat = np.concatenate([np.asarray(w, dtype=np.float32).ravel() for w in weights])
+        with open(tmp, "wb") as f:
+            np.save(f, flat)
+        os.replace(tmp, path)
+
+        manifest = self._manifest()
+        manifest[key] = {
+            "file": path.name,
+            "sha256": sha256sum(path),
+            "size": path.stat().st_size,
+            "shapes": [list(w.shape) for w in weights]
+        }
+        self._save_manifest(manifest)
+        self._mark_verified(key, manifest[key]["sha256"], path)
+        logger.info(f"Stored {len(weights)} weight arrays of {key} at {path}")
+
+    def _verified_path(self, key: str) -> Path:
+        """
+        Return the weight file of ``key``, checking its digest against the manifest.
+
+        Raises:
+        - ValueError: If the file does not match the recorded digest.
+        """
+        entry = self._manifest()[key]
+        path = self.root_dir / entry["file"]
+        if self._verified().get(key) != {"sha256": entry["sha256"], "stat": _stat_key(path)}:
+            digest = sha256sum(path)
+            if digest != entry["sha256"]:
+                raise ValueError(f"SHA-256 mismatch for {path}: expected {entry['sha256']}, got {digest}")
+            self._mark_verified(key, digest, path)
+        return path
+
+    def has(self, key: str) -> bool:
+        entry = self._manifest().get(key)
+        return entry is not None and (self.root_dir / entry["file"]).exists()
+
+    def populate(self, backbone: str, include_top: bool, input_shape: List[int]):
+        """
+        Download a backbone's ImageNet weights through Keras and add them to the store.
+
+        Raises:
+        - FileNotFoundError: In offline mode.
+        """
+        key = self.key(backbone, include_top)
+        if self.offline:
+            raise FileNotFoundError(
+                f"ImageNet weights {key} are not in the weights store at {self.root_dir} and offline mode "
+                f"forbids downloading them. Populate the store on a connected machine with "
+                f"`python -m src.models.weights_store {backbone}{' --include-top' if include_top else ''}` "
+                f"and copy {self.root_dir} over."
+            )
+        logger.info(f"Downloading ImageNet weights of {backbone}")
+        model = build_backbone(backbone, input_shape, weights="imagenet", include_top=include_top)
+        self.add(key, model)
+
+    def load(self, model: tf.keras.Model, backbone: str, include_top: bool):
+        """
+        Set a freshly built backbone's weights from the store, populating it first if needed.
+
+        Args:
+        - model (tf.keras.Model): Backbone built with ``weights=None``.
+        - backbone (str): Key in ``architectures.BACKBONES``.
+        - include_top (bool): Whether the backbone includes the ImageNet classifier.
+
+        Raises:
+        - FileNotFoundError: If the weights are missing in offline mode.
+        - ValueError: If the stored weights are corrupt or do not fit the model.
+        """
+        key = self.key(backbone, include_top)
+        if not self.has(key):
+            self.populate(backbone, include_top, list(model.input_shape[1:]))
+
+        path = self._verified_path(key)
+        shapes = self._manifest()[key]["shapes"]
+        model_shapes = [list(w.shape) for w in model.weights]
+        if shapes != model_shapes:
+            raise ValueError(f"Stored weights {key} do not fit the {model.name} model built for this run")
+
+        flat = np.load(path, mmap_mode="r")
+        weights, offset = [], 0
+        for shape in shapes:
+            size = int(np.prod(shape))
+            weights.append(flat[offset:offset + size].reshape(shape))
+            offset += size
+        model.set_weights(weights)
+        logger.info(f"Loaded {key} weights from {path}")
+
+
+if __name__ == "__main__":
+    # Fill the store on a connected machine before copying it to offline ones.
+    parser = argparse.ArgumentParser(description="Download ImageNet backbone weights into the local weights store.")
+    parser.add_argument("backbones", nargs="+", choices=sorted(BACKBONES))
+    parser.add_argument("--include-top", action="store_true", help="store the weights with the ImageNet classifier")
+    args = parser.parse_args()
+
+    from src.config.configuration import ConfigurationManager
+    config = ConfigurationManager().get_prepare_base_model_config()
+    store = WeightsStore(config.weights_store_dir, offline=False)
+    for name in args.backbones:
+        key = WeightsStore.key(name, args.include_top)
+        if store.has(key):
+            store._verified_path(key)
+            logger.info(f"{key} already stored and verified")
+        else:
+            store.populate(name, args.include_top, config.params_image_size)
@@ -0,0 +1,44 @@
+import argparse
+from src.config.configuration import ConfigurationManager
+from src.inference.batch_prediction import BatchPrediction
+from src.logging import logger
+
+
+class BatchPredictionPipeline:
+    """
+    Pipeline for scoring a directory or list of images in bulk.
+    """
+
+    def __init__(self, source, output=None, restart=False):
+        """
+        Initialize BatchPredictionPipeline.
+
+        Args:
+        - source (str): Directory of images, or a text file with one image path per line.
+        - output (str or None): .csv file or .parquet directory; batch_prediction.output_file if None.
+        - restart (bool): Whether to discard the progress of an interrupted run.
+        """
+        self.source = source
+        self.output = output
+        self.restart = restart
+
+    def main(self):
+        """
+        Main method to execute batch prediction.
+        """
+        config = ConfigurationManager()
+        batch_prediction = BatchPrediction(config=config.get_batch_prediction_config())
+        batch_prediction.predict(self.source, self.output, restart=self.restart)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Score every image of a directory or file list, resuming interrupted runs.")
+    parser.add_argument("source", help="directory of images, or a text file with one image path per line")
+    parser.add_argument("--output", default=None, help="a .csv file or .parquet directory; batch_prediction.output_file if omitted")
+    parser.add_argument("--restart", action="store_true", help="discard the progress of an interrupted run")
+    args = parser.parse_args()
+    try:
+        BatchPredictionPipeline(args.source, args.output, args.restart).main()
+    except Exception as e:
+        logger.exception(e)
+        raise e
@@ -21,7 +21,12 @@ class DataIngestionTrainingPipeline:
             data_ingestion_config = config.get_data_ingestion_config()
             data_ingestion = DataIngestion(config=data_ingestion_config)
             data_ingestion.download_file()
-            data_ingestion.extract_zip_file()
+            if data_ingestion_config.extract_to_cache:
+                from src.preprocess.image_cache import ImageCache
+                image_cache = ImageCache(config=config.get_image_cache_config())
+                data_ingestion.extract_to_image_cache(image_cache)
+            else:
+                data_ingestion.extract_zip_file()
             logger.info(f"Stage {constants.DATA_INGESTION_STEP} completed successfully")
         except Exception as e:
             logger.exception(f"Error occurred in stage {constants.DATA_INGESTION_STEP}: {e}")
@@ -0,0 +1,22 @@
+from src.config.configuration import ConfigurationManager
+from src.training.distillation import Distillation
+from src.logging import logger
+
+
+class DistillationPipeline:
+    """
+    Pipeline for distilling the trained model into a small student.
+    """
+
+    def __init__(self):
+        pass
+
+    def main(self):
+        """
+        Main method to execute the distillation pipeline.
+        """
+        config = ConfigurationManager()
+        distillation_config = config.get_distillation_config()
+        distillation = Distillation(config=distillation_config)
+        distillation.distill()
+        distillation.report()
@@ -0,0 +1,27 @@
+from src.config.configuration import ConfigurationManager
+from src.preprocess.image_cache import ImageCache
+from src.logging import logger
+from src.constants import constants
+
+
+class ImageCachePipeline:
+    """
+    Class for orchestrating the image cache stage of the training pipeline.
+    """
+
+    def __init__(self):
+        pass
+
+    def main(self):
+        """
+        Main method to execute the image cache stage.
+        """
+        try:
+            config = ConfigurationManager()
+            image_cache_config = config.get_image_cache_config()
+            image_cache = ImageCache(config=image_cache_config)
+            image_cache.build()
+            logger.info(f"Stage {constants.IMAGE_CACHE_STEP} completed successfully")
+        except Exception as e:
+            logger.exception(f"Error occurred in stage {constants.IMAGE_CACHE_STEP}: {e}")
+            raise e
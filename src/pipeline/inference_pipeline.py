@@ -4,13 +4,12 @@ from src.logging import logger
 
 
 class EvaluationPipeline:
-    def __init__(self):
-        pass
+    def __init__(self, context=None):
+        self.context = context
 
     def main(self):
         config = ConfigurationManager()
         eval_config = config.get_evaluation_config()
-        evaluation = Evaluation(eval_config)
+        evaluation = Evaluation(eval_config, context=self.context)
         evaluation.evaluation()
-        evaluation.save_score()
         # evaluation.log_into_mlflow()
\ No newline at end of file
@@ -0,0 +1,38 @@
+import argparse
+from src.config.configuration import ConfigurationManager
+from src.inference.comparison import ModelComparison
+from src.logging import logger
+
+
+class ModelComparisonPipeline:
+    """
+    Pipeline for comparing candidate models on one decoded validation set.
+    """
+
+    def __init__(self, model_paths=None):
+        """
+        Initialize ModelComparisonPipeline.
+
+        Args:
+        - model_paths (List[str] or None): Candidate .h5 models; the configured candidates if None.
+        """
+        self.model_paths = model_paths
+
+    def main(self):
+        """
+        Main method to execute the model comparison.
+        """
+        config = ConfigurationManager()
+        model_comparison = ModelComparison(config=config.get_model_comparison_config())
+        model_comparison.compare(self.model_paths)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Compare candidate models on the validation set.")
+    parser.add_argument("models", nargs="*", help="candidate .h5 models; model_comparison.model_paths if none are given")
+    args = parser.parse_args()
+    try:
+        ModelComparisonPipeline(args.models or None).main()
+    except Exception as e:
+        logger.exception(e)
+        raise e
@@ -0,0 +1,263 @@
+import time
+import datetime
+import threading
+import multiprocessing
+from multiprocessing.connection import wait
+from pathlib import Path
+from typing import Dict, List
+
+from src.logging import logger
+from src.entity.config_entity import StageConfig
+from src.utils.common import save_json
+from src.pipeline.stage_runner import StageRunner, run_stage, log_skipped
+
+
+def _stage_process(stage: StageConfig, trace_dir, conn):
+    """
+    Entry point of a stage's child process; reports the error, or None and the stage's profile.
+    """
+    try:
+        profile = run_stage(stage, trace_dir)
+        conn.send((None, profile))
+    except Exception as e:
+        conn.send((repr(e), None))
+    finally:
+        conn.close()
+
+
+class StageScheduler:
+    """
+    Class to run pipeline stages as a dependency graph.
+
+    A stage starts as soon as every stage it depends on has finished, with
+    up to ``max_workers`` stages running at once. Each stage runs in its own
+    spawned process, so TensorFlow state never leaks between stages. Skip
+    checks and the run record stay in this process, which also writes a
+    JSON run report with every stage's status, timing and resource use.
+
+    With ``in_process`` the stages instead run one after another in this
+    process and share an ``ArtifactContext``, so models are handed to the
+    next stage in memory while their files are written in the background.
+
+    Attributes:
+    - runner (StageRunner): Runner used for fingerprints and the run record.
+    - stages (List[StageConfig]): Stages to run.
+    - in_process (bool): Whether to run the stages sequentially in this process.
+    """
+
+    def __init__(self, runner: StageRunner, stages: List[StageConfig], in_process: bool = False):
+        """
+        Initialize StageScheduler.
+
+        Args:
+        - runner (StageRunner): Runner used for fingerprints and the run record.
+        - stages (List[StageConfig]): Stages to run.
+        - in_process (bool): Whether to run the stages sequentially in this process.
+        """
+        self.runner = runner
+        self.stages = {stage.key: stage for stage in stages}
+        self.in_process = in_process
+        self.timings = {}
+        self.profiles = {}
+        self.status = {}
+
+        for stage in stages:
+            unknown = set(stage.depends_on) - set(self.stages)
+            if unknown:
+                raise ValueError(f"Stage {stage.key} depends on unknown stages: {sorted(unknown)}")
+
+    def run(self):
+        """
+        Run every stage, respecting dependencies, and log the timing summary.
+        """
+        self.started_at = datetime.datetime.now().isoformat(timespec="seconds")
+        self.start = time.perf_counter()
+        failure = None
+
+        try:
+            if self.in_process:
+                self._run_in_process()
+            else:
+                self._run_processes()
+        except Exception as e:
+            failure = repr(e)
+            raise e
+        finally:
+            self.write_report(failure)
+
+        self.log_summary()
+
+    def _run_in_process(self):
+        """
+        Run the stages one after another in this process, sharing an artifact context.
+
+        A stage whose dependency ran in this run is not skipped, since its
+        inputs are being rewritten. A stage's fingerprint is recorded on the
+        context's save thread as soon as its own background saves have
+        finished, so it describes the files on disk and survives a later
+        stage being interrupted.
+        """
+        from src.utils.artifacts import ArtifactContext
+
+        context = ArtifactContext()
+        state_lock = threading.Lock()
+        done, records = set(), []
+
+        def record(stage: StageConfig):
+            for path in stage.outputs:
+                # Already finished, since saves run in order; raises if this stage's save failed.
+                context.wait(path)
+            with state_lock:
+                self.runner.record(stage, self.runner.fingerprint(stage))
+
+        try:
+            for stage in self.stages.values():
+                missing = set(stage.depends_on) - done
+                if missing:
+                    raise ValueError(f"Stage {stage.key} is declared before its dependencies: {sorted(missing)}")
+                done.add(stage.key)
+
+                if not any(self.status.get(dep) == "ran" for dep in stage.depends_on):
+                    with state_lock:
+                        up_to_date = self.runner.is_up_to_date(stage, self.runner.fingerprint(stage))
+                    if up_to_date:
+                        log_skipped(stage)
+                        self.status[stage.key] = "skipped"
+                        continue
+
+                started = time.perf_counter()
+                try:
+                    self.profiles[stage.key] = run_stage(stage, self.runner.trace_dir(stage), context)
+                except Exception as e:
+                    self.status[stage.key] = "failed"
+                    raise RuntimeError(f"Stage {stage.name} failed: {e!r}")
+                finally:
+                    self.timings[stage.key] = (started - self.start, time.perf_counter() - self.start)
+                self.status[stage.key] = "ran"
+                records.append(context.after_saves(lambda stage=stage: record(stage)))
+        finally:
+            context.close()
+            for recorded in records:
+                recorded.result()
+
+    def _run_processes(self):
+        """
+        Run the stages in spawned processes, starting each as soon as its dependencies are done.
+        """
+        context = multiprocessing.get_context("spawn")
+        pending = dict(self.stages)
+        done = set()
+        running: Dict[object, tuple] = {}
+
+        try:
+            while pending or running:
+                ready = [
+                    stage for stage in pending.values()
+                    if all(dep in done for dep in stage.depends_on)
+                ]
+                for stage in ready:
+                    if len(running) >= self.runner.config.max_workers:
+                        break
+                    del pending[stage.key]
+
+                    fingerprint = self.runner.fingerprint(stage)
+                    if self.runner.is_up_to_date(stage, fingerprint):
+                        log_skipped(stage)
+                        self.status[stage.key] = "skipped"
+                        done.add(stage.key)
+                        continue
+
+                    parent_conn, child_conn = context.Pipe(duplex=False)
+                    process = context.Process(
+                        target=_stage_process,
+                        args=(stage, self.runner.trace_dir(stage), child_conn),
+                        name=stage.key
+                    )
+                    process.start()
+                    child_conn.close()
+                    running[process.sentinel] = (stage, process, parent_conn, fingerprint, time.perf_counter())
+
+                if not running:
+                    if pending and not ready:
+                        raise ValueError(f"Stages with unsatisfiable dependencies: {sorted(pending)}")
+                    continue
+
+                for sentinel in wait(list(running)):
+                    stage, process, conn, fingerprint, started = running.pop(sentinel)
+                    process.join()
+                    try:
+                        error, profile = conn.recv()
+                    except EOFError:
+                        error, profile = f"process exited with code {process.exitcode}", None
+                    conn.close()
+                    self.timings[stage.key] = (started - self.start, time.perf_counter() - self.start)
+                    if error is not None:
+                        self.status[stage.key] = "failed"
+                        raise RuntimeError(f"Stage {stage.name} failed: {error}")
+
+                    self.status[stage.key] = "ran"
+                    self.profiles[stage.key] = profile
+                    self.runner.record(stage, fingerprint)
+                    done.add(stage.key)
+        finally:
+            for stage, process, conn, _, _ in running.values():
+                process.terminate()
+                process.join()
+                self.status[stage.key] = "terminated"
+
+    def critical_path(self) -> List[str]:
+        """
+        Return the chain of dependent stages with the longest total wall time.
+        """
+        longest = {}
+        for key, stage in self.stages.items():
+            duration = self._duration(key)
+            previous = max(
+                (longest[dep] for dep in stage.depends_on),
+                key=lambda path: path[0],
+                default=(0.0, [])
+            )
+            longest[key] = (previous[0] + duration, previous[1] + [key])
+        return max(longest.values(), key=lambda path: path[0], default=(0.0, []))[1]
+
+    def _duration(self, key: str) -> float:
+        start, end = self.timings.get(key, (0.0, 0.0))
+        return end - start
+
+    def write_report(self, failure=None):
+        """
+        Write the run report to ``report_file``.
+
+        Args:
+        - failure (str or None): The error that stopped the run, if any.
+        """
+        stages = {}
+        for key, status in self.status.items():
+            start, end = self.timings.get(key, (None, None))
+            stages[key] = {"status": status, "start": start, "end": end, **(self.profiles.get(key) or {})}
+
+        report_file = Path(self.runner.config.report_file)
+        report_file.parent.mkdir(parents=True, exist_ok=True)
+        save_json(path=report_file, data={
+            "started_at": self.started_at,
+            "wall_seconds": time.perf_counter() - self.start,
+            "failure": failure,
+            "critical_path": self.critical_path() if self.timings else [],
+            "stages": stages
+        })
+
+    def log_summary(self):
+        """
+        Log per-stage wall time, total wall time, overlap and the critical path.
+        """
+        elapsed = time.perf_counter() - self.start
+        for key, (start, end) in sorted(self.timings.items(), key=lambda item: item[1][0]):
+            logger.info(f"Stage {key}: {end - start:.1f}s wall (from +{start:.1f}s to +{end:.1f}s)")
+
+        busy = sum(self._duration(key) for key in self.timings)
+        logger.info(
+            f"Pipeline wall time {elapsed:.1f}s for {busy:.1f}s of stage time "
+            f"({max(0.0, busy - elapsed):.1f}s overlapped)"
+        )
+        if self.timings:
+            logger.info(f"Critical path: {' -> '.join(self.critical_path())}")
@@ -0,0 +1,217 @@
+import os
+import json
+import inspect
+import hashlib
+import importlib
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Optional
+
+from src.logging import logger
+from src.entity.config_entity import StageConfig, StageRunnerConfig
+from src.utils.common import save_json
+from src.utils.profiling import StageProfiler
+
+if TYPE_CHECKING:
+    # Imports TensorFlow, which the scheduler process does not need.
+    from src.utils.artifacts import ArtifactContext
+
+
+def load_pipeline(pipeline: str):
+    """
+    Import a pipeline class given as "module:Class".
+    """
+    module_name, class_name = pipeline.split(":")
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def path_digest(path: Path, contents: bool = False) -> Optional[str]:
+    """
+    Fingerprint a file or directory tree.
+
+    Artifacts are fingerprinted by relative path, size and modification
+    time, which is cheap even for large datasets; source code is hashed by
+    contents so that touching a file without changing it is not a change.
+
+    Args:
+    - path (Path): File or directory.
+    - contents (bool): Whether to hash file contents instead of size and mtime.
+
+    Returns:
+    - str or None: Hex digest, or None if the path does not exist.
+    """
+    path = Path(path)
+    if not path.exists():
+        return None
+
+    files = [path] if path.is_file() else sorted(
+        Path(root) / name
+        for root, _, names in os.walk(path)
+        for name in names
+        if not name.endswith(".pyc")
+    )
+
+    digest = hashlib.sha256()
+    for file in files:
+        digest.update(file.relative_to(path).as_posix().encode() if file != path else b"")
+        if contents:
+            digest.update(file.read_bytes())
+        else:
+            stat = file.stat()
+            digest.update(f"{stat.st_size}:{stat.st_mtime_ns}".encode())
+    return digest.hexdigest()
+
+
+class StageRunner:
+    """
+    Class to run pipeline stages, skipping those whose inputs are unchanged.
+
+    A stage's fingerprint covers the params.yaml keys and config.yaml
+    sections it reads, its input artifacts and its source code. A stage is
+    skipped when its fingerprint matches the last successful run and its
+    outputs are still as that run left them.
+
+    Attributes:
+    - config (StageRunnerConfig): Configuration for the stage runner.
+    - force (set): Keys of the stages to run regardless of their fingerprint.
+    - trace (set): Keys of the stages to capture a TensorFlow profiler trace for.
+    """
+
+    def __init__(self, config: StageRunnerConfig, force: Iterable[str] = (), trace: Optional[Iterable[str]] = None):
+        """
+        Initialize StageRunner.
+
+        Args:
+        - config (StageRunnerConfig): Configuration for the stage runner.
+        - force (Iterable[str]): Keys of the stages to run regardless of their fingerprint.
+        - trace (Iterable[str] or None): Keys of the stages to trace; ``config.trace_stages`` if None.
+        """
+        self.config = config
+        self.force = set(force)
+        self.trace = set(config.trace_stages if trace is None else trace)
+
+    def _load_state(self) -> dict:
+        if not Path(self.config.state_file).exists():
+            return {}
+        with open(self.config.state_file) as f:
+            return json.load(f)
+
+    def fingerprint(self, stage: StageConfig) -> str:
+        """
+        Compute the fingerprint of a stage's inputs.
+
+        Args:
+        - stage (StageConfig): Stage to fingerprint.
+
+        Returns:
+        - str: Hex digest of the stage's params, config, inputs and code.
+        """
+        params = self.config.params
+        keys = sorted(params) if stage.params is None else stage.params
+        payload = {
+            "params": {key: params.get(key) for key in keys},
+            "config": {section: self.config.config.get(section) for section in stage.config_sections},
+            "inputs": {str(path): path_digest(path) for path in stage.inputs},
+            "code": {str(path): path_digest(path, contents=True) for path in stage.code}
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+    def outputs_digest(self, stage: StageConfig) -> dict:
+        """
+        Fingerprint a stage's outputs.
+        """
+        return {str(path): path_digest(path) for path in stage.outputs}
+
+    def is_up_to_date(self, stage: StageConfig, fingerprint: str) -> bool:
+        """
+        Check whether a stage can be skipped.
+
+        Args:
+        - stage (StageConfig): Stage to check.
+        - fingerprint (str): Current fingerprint of the stage.
+
+        Returns:
+        - bool: True if the last successful run had the same fingerprint and
+          its outputs are unchanged.
+        """
+        if stage.key in self.force:
+            return False
+        previous = self._load_state().get(stage.key)
+        if previous is None or previous["fingerprint"] != fingerprint:
+            return False
+        outputs = self.outputs_digest(stage)
+        return None not in outputs.values() and outputs == previous["outputs"]
+
+    def trace_dir(self, stage: StageConfig) -> Optional[Path]:
+        """
+        Return the directory for a stage's profiler trace, or None if it is not traced.
+        """
+        return Path(self.config.trace_dir) / stage.key if stage.key in self.trace else None
+
+    def record(self, stage: StageConfig, fingerprint: str):
+        """
+        Record a successful run of a stage.
+        """
+        state = self._load_state()
+        state[stage.key] = {"fingerprint": fingerprint, "outputs": self.outputs_digest(stage)}
+        os.makedirs(Path(self.config.state_file).parent, exist_ok=True)
+        save_json(path=Path(self.config.state_file), data=state)
+
+    def run(self, stage: StageConfig) -> bool:
+        """
+        Run a stage unless it is up to date.
+
+        Args:
+        - stage (StageConfig): Stage to run.
+
+        Returns:
+        - bool: True if the stage ran, False if it was skipped.
+        """
+        fingerprint = self.fingerprint(stage)
+        if self.is_up_to_date(stage, fingerprint):
+            log_skipped(stage)
+            return False
+
+        run_stage(stage, self.trace_dir(stage))
+        self.record(stage, fingerprint)
+        return True
+
+
+def log_skipped(stage: StageConfig):
+    """
+    Log that a stage was skipped.
+    """
+    logger.info(f">>>>>> stage {stage.name} skipped: inputs unchanged since last run <<<<<<")
+
+
+def run_stage(stage: StageConfig, trace_dir: Optional[Path] = None, context: Optional["ArtifactContext"] = None) -> dict:
+    """
+    Run a stage's pipeline with the usual start/completion logging and profile it.
+
+    With an artifact context, pipelines accepting one get it; the others
+    read artifacts from disk, so they start once the pending saves are done.
+
+    Args:
+    - stage (StageConfig): Stage to run.
+    - trace_dir (Path or None): Directory for a TensorFlow profiler trace, if one is wanted.
+    - context (ArtifactContext or None): Models handed over by earlier stages of this process.
+
+    Returns:
+    - dict: The stage's profile, see ``StageProfiler``.
+    """
+    try:
+        logger.info(f"*******************")
+        logger.info(f">>>>>> stage {stage.name} started <<<<<<")
+        pipeline = load_pipeline(stage.pipeline)
+        with StageProfiler(stage.key, trace_dir) as profiler:
+            if context is None:
+                pipeline().main()
+            elif "context" in inspect.signature(pipeline).parameters:
+                pipeline(context=context).main()
+            else:
+                context.wait()
+                pipeline().main()
+        logger.info(f">>>>>> stage {stage.name} completed <<<<<<\n\nx==========x")
+        return profiler.profile
+    except Exception as e:
+        logger.exception(e)
+        raise e
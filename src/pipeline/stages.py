@@ -0,0 +1,245 @@
+import os
+import importlib.util
+from pathlib import Path
+from typing import List
+
+from src.constants import constants
+from src.entity.config_entity import StageConfig
+
+
+# Modules every stage reads its configuration or helpers through.
+SHARED_CODE = [
+    Path("src/config/configuration.py"),
+    Path("src/entity/config_entity.py"),
+    Path("src/utils/common.py")
+]
+
+
+def build_stages(config, params) -> List[StageConfig]:
+    """
+    Declare the pipeline stages and their dependencies, in a valid execution order.
+
+    The image cache stage, and the cache as an input of the later stages,
+    are only declared when ``INPUT_PIPELINE`` is "cache"; the other input
+    pipelines decode the extracted images themselves.
+
+    Args:
+    - config (ConfigBox): Contents of config.yaml.
+    - params (ConfigBox): Contents of params.yaml.
+
+    Returns:
+    - List[StageConfig]: Stages run by main.py.
+    """
+    training_data = Path(os.path.join(config.data_ingestion.unzip_dir, "Chest-CT-Scan-data"))
+    image_cache_dir = Path(config.image_cache.root_dir)
+    trained_model_path = Path(config.training.trained_model_path)
+    uses_cache = params.INPUT_PIPELINE == "cache"
+    cache_stage = ["image_cache"] if uses_cache else []
+    cache_inputs = [image_cache_dir] if uses_cache else []
+
+    stages = [
+        StageConfig(
+            key="data_ingestion",
+            name=constants.DATA_INGESTION_STEP,
+            pipeline="src.pipeline.data_ingestion_pipeline:DataIngestionTrainingPipeline",
+            depends_on=[],
+            # Extracting straight into the image cache makes ingestion depend on the cache settings.
+            params=["IMAGE_SIZE", "CACHE_SHARD_SIZE"] if config.data_ingestion.extract_to_cache else [],
+            config_sections=["data_ingestion", "image_cache"],
+            inputs=[],
+            outputs=[
+                Path(config.data_ingestion.local_data_file),
+                image_cache_dir if config.data_ingestion.extract_to_cache else training_data
+            ],
+            code=[
+                Path("src/preprocess/data_ingestion.py"),
+                Path("src/preprocess/downloader.py"),
+                Path("src/preprocess/extraction.py"),
+                Path("src/preprocess/image_cache.py"),
+                Path("src/preprocess/input_pipeline.py"),
+                Path("src/preprocess/augmentation.py"),
+                Path("src/pipeline/data_ingestion_pipeline.py"),
+                *SHARED_CODE
+            ]
+        ),
+        StageConfig(
+            key="image_cache",
+            name=constants.IMAGE_CACHE_STEP,
+            pipeline="src.pipeline.image_cache_pipeline:ImageCachePipeline",
+            depends_on=["data_ingestion"],
+            params=["IMAGE_SIZE", "CACHE_SHARD_SIZE"],
+            config_sections=["image_cache"],
+            inputs=[training_data],
+            outputs=[image_cache_dir],
+            code=[
+                Path("src/preprocess/image_cache.py"),
+                Path("src/preprocess/input_pipeline.py"),
+                Path("src/preprocess/augmentation.py"),
+                Path("src/pipeline/image_cache_pipeline.py"),
+                *SHARED_CODE
+            ]
+        ),
+        StageConfig(
+            key="prepare_base_model",
+            name=constants.PREPARE_BASE_MODEL_STEP,
+            pipeline="src.pipeline.base_model_configuration_pipeline:BaseModelConfigurationPipeline",
+            depends_on=[],
+            params=[
+                "IMAGE_SIZE", "LEARNING_RATE", "INCLUDE_TOP", "WEIGHTS", "CLASSES",
+                "BACKBONE", "HEAD", "HEAD_DROPOUT", "ARCH_LATENCY_SAMPLES"
+            ],
+            config_sections=["prepare_base_model"],
+            inputs=[],
+            outputs=[
+                Path(config.prepare_base_model.base_model_path),
+                Path(config.prepare_base_model.updated_base_model_path),
+                Path(config.prepare_base_model.architecture_report_file)
+            ],
+            code=[
+                Path("src/models/base_model.py"),
+                Path("src/models/architectures.py"),
+                Path("src/models/weights_store.py"),
+                Path("src/preprocess/downloader.py"),
+                Path("src/utils/artifacts.py"),
+                Path("src/pipeline/base_model_configuration_pipeline.py"),
+                *SHARED_CODE
+            ]
+        ),
+        StageConfig(
+            key="training",
+            name=constants.TRAINING_STEP,
+            pipeline="src.pipeline.training_pipeline:ModelTrainingPipeline",
+            depends_on=["data_ingestion", *cache_stage, "prepare_base_model"],
+            params=[
+                "EPOCHS", "BATCH_SIZE", "AUGMENTATION", "IMAGE_SIZE", "INPUT_PIPELINE", "TRAINING_MODE",
+                "CHECKPOINT_EVERY_STEPS", "CHECKPOINT_MAX_SIZE_MB", "USE_BEST_CHECKPOINT", "AUGMENTATION_SEED"
+            ],
+            config_sections=["training", *cache_stage],
+            inputs=[Path(config.prepare_base_model.updated_base_model_path), training_data, *cache_inputs],
+            outputs=[trained_model_path],
+            code=[
+                Path("src/training"),
+                Path("src/preprocess/input_pipeline.py"),
+                Path("src/preprocess/image_cache.py"),
+                Path("src/preprocess/augmentation.py"),
+                Path("src/utils/artifacts.py"),
+                Path("src/utils/profiling.py"),
+                Path("src/pipeline/training_pipeline.py"),
+                *SHARED_CODE
+            ]
+        ),
+        StageConfig(
+            key="evaluation",
+            name=constants.INFERENCE_STEP,
+            pipeline="src.pipeline.inference_pipeline:EvaluationPipeline",
+            depends_on=["training"],
+            # Evaluation logs every parameter to MLflow.
+            params=None,
+            config_sections=["mlflow_logger", *cache_stage],
+            inputs=[trained_model_path, training_data, *cache_inputs],
+            outputs=[Path("scores.json")],
+            code=[
+                Path("src/inference/inference.py"),
+                Path("src/inference/metrics.py"),
+                Path("src/models/registry.py"),
+                Path("src/utils/tracking.py"),
+                Path("src/utils/artifacts.py"),
+                Path("src/utils/profiling.py"),
+                Path("src/preprocess/input_pipeline.py"),
+                Path("src/preprocess/augmentation.py"),
+                Path("src/preprocess/image_cache.py"),
+                Path("src/pipeline/inference_pipeline.py"),
+                *SHARED_CODE
+            ]
+        ),
+        StageConfig(
+            key="tflite_export",
+            name=constants.TFLITE_EXPORT_STEP,
+            pipeline="src.pipeline.tflite_export_pipeline:TFLiteExportPipeline",
+            depends_on=["training"],
+            params=[
+                "IMAGE_SIZE", "BATCH_SIZE", "INPUT_PIPELINE", "TFLITE_QUANTIZATIONS",
+                "TFLITE_CALIBRATION_SAMPLES", "TFLITE_LATENCY_SAMPLES", "TFLITE_ACCURACY_BUDGET"
+            ],
+            config_sections=["tflite_export"],
+            inputs=[trained_model_path, training_data, *cache_inputs],
+            outputs=[Path(config.tflite_export.root_dir)],
+            code=[
+                Path("src/models/tflite_export.py"),
+                Path("src/inference/backends.py"),
+                Path("src/models/registry.py"),
+                Path("src/preprocess/input_pipeline.py"),
+                Path("src/preprocess/augmentation.py"),
+                Path("src/preprocess/image_cache.py"),
+                Path("src/pipeline/tflite_export_pipeline.py"),
+                *SHARED_CODE
+            ]
+        ),
+        StageConfig(
+            key="distillation",
+            name=constants.DISTILLATION_STEP,
+            pipeline="src.pipeline.distillation_pipeline:DistillationPipeline",
+            depends_on=["training"],
+            params=[
+                "IMAGE_SIZE", "BATCH_SIZE", "AUGMENTATION", "INPUT_PIPELINE", "DISTILL_STUDENT",
+                "DISTILL_STUDENT_WIDTH", "DISTILL_TEMPERATURE", "DISTILL_ALPHA", "DISTILL_EPOCHS",
+                "DISTILL_LEARNING_RATE", "DISTILL_LATENCY_SAMPLES"
+            ],
+            config_sections=["distillation"],
+            inputs=[trained_model_path, training_data, *cache_inputs],
+            outputs=[Path(config.distillation.root_dir)],
+            code=[
+                Path("src/training/distillation.py"),
+                Path("src/inference/metrics.py"),
+                Path("src/models/registry.py"),
+                Path("src/preprocess/input_pipeline.py"),
+                Path("src/preprocess/augmentation.py"),
+                Path("src/preprocess/image_cache.py"),
+                Path("src/pipeline/distillation_pipeline.py"),
+                *SHARED_CODE
+            ]
+        ),
+    ]
+    return [stage for stage in stages if uses_cache or stage.key != "image_cache"]
+
+
+def check_stages(stages: List[StageConfig], config, params) -> List[str]:
+    """
+    Check the stage declarations against config.yaml, params.yaml and the source tree.
+
+    Nothing is imported beyond locating each pipeline module, so the check
+    runs without TensorFlow.
+
+    Args:
+    - stages (List[StageConfig]): Stages from ``build_stages``.
+    - config (ConfigBox): Contents of config.yaml.
+    - params (ConfigBox): Contents of params.yaml.
+
+    Returns:
+    - List[str]: One message per problem; empty when the declarations are consistent.
+    """
+    problems = []
+    keys = {stage.key for stage in stages}
+    declared = set()
+    for stage in stages:
+        for dep in stage.depends_on:
+            if dep not in keys:
+                problems.append(f"{stage.key}: unknown dependency {dep}")
+            elif dep not in declared:
+                problems.append(f"{stage.key}: declared before its dependency {dep}")
+        for key in stage.params or []:
+            if key not in params:
+                problems.append(f"{stage.key}: params.yaml has no {key}")
+        for section in stage.config_sections:
+            if section not in config:
+                problems.append(f"{stage.key}: config.yaml has no {section} section")
+        for path in stage.code:
+            if not path.exists():
+                problems.append(f"{stage.key}: code path {path} does not exist")
+        module_name = stage.pipeline.split(":")[0]
+        if importlib.util.find_spec(module_name) is None:
+            problems.append(f"{stage.key}: pipeline module {module_name} not found")
+        declared.add(stage.key)
+    if config.data_ingestion.extract_to_cache and params.INPUT_PIPELINE != "cache":
+        problems.append("data_ingestion: extract_to_cache only feeds INPUT_PIPELINE: cache; nothing would read the images")
+    return problems
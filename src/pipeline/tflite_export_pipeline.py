@@ -0,0 +1,21 @@
+from src.config.configuration import ConfigurationManager
+from src.models.tflite_export import TFLiteExport
+from src.logging import logger
+
+
+class TFLiteExportPipeline:
+    """
+    Pipeline for exporting the trained model to TFLite.
+    """
+
+    def __init__(self):
+        pass
+
+    def main(self):
+        """
+        Main method to execute the TFLite export pipeline.
+        """
+        config = ConfigurationManager()
+        tflite_export_config = config.get_tflite_export_config()
+        tflite_export = TFLiteExport(config=tflite_export_config)
+        tflite_export.export()
@@ -8,8 +8,14 @@ class ModelTrainingPipeline:
     Pipeline for training the model.
     """
 
-    def __init__(self):
-        pass
+    def __init__(self, context=None):
+        """
+        Initialize ModelTrainingPipeline.
+
+        Args:
+        - context (ArtifactContext or None): Hands models between stages of the same process.
+        """
+        self.context = context
 
     def main(self):
         """
@@ -17,8 +23,15 @@ class ModelTrainingPipeline:
         """
         config = ConfigurationManager()
         training_config = config.get_training_config()
-        training = Training(config=training_config)
+        training = Training(config=training_config, context=self.context)
         training.get_base_model()
+
+        if training_config.params_training_mode == "bottleneck":
+            if not training_config.params_is_augmentation:
+                training.train_bottleneck()
+                return
+            logger.warning("Bottleneck training needs AUGMENTATION: False; training the full model instead")
+
         training.train_valid_generator()
         training.train()
 
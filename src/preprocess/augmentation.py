@@ -0,0 +1,124 @@
+import math
+from typing import Optional
+
+import tensorflow as tf
+
+
+class AffineAugmentation:
+    """
+    Class to apply random affine augmentation to a whole batch at once.
+
+    Samples the same parameters as ``ImageDataGenerator.get_random_transform``
+    (rotation and shear in degrees, shifts as a fraction of the image size,
+    independent zoom per axis, horizontal flip with probability 0.5), builds
+    one 3x3 output-to-input matrix per image exactly as
+    ``apply_affine_transform`` composes it (rotation, shift, shear, zoom,
+    about the image centre, then the flip), and warps the batch with a single
+    ``ImageProjectiveTransformV3`` op using bilinear interpolation and
+    nearest fill. Keras applies its matrix to (x=col, y=row) coordinates,
+    the op's own convention, so the matrix is passed through unchanged; like
+    Keras, the centring offset and the ``tx`` shift of the first coordinate
+    scale with the height and those of the second with the width.
+
+    Attributes:
+    - rotation_range (float): Maximum rotation, in degrees.
+    - width_shift_range (float): Maximum horizontal shift, as a fraction of the width.
+    - height_shift_range (float): Maximum vertical shift, as a fraction of the height.
+    - shear_range (float): Maximum shear angle, in degrees.
+    - zoom_range (float): Zoom factors are drawn from [1 - zoom_range, 1 + zoom_range].
+    - horizontal_flip (bool): Whether to flip half of the images horizontally.
+    """
+
+    def __init__(self, rotation_range: float = 40, width_shift_range: float = 0.2,
+                 height_shift_range: float = 0.2, shear_range: float = 0.2,
+                 zoom_range: float = 0.2, horizontal_flip: bool = True, seed: Optional[int] = None):
+        """
+        Initialize AffineAugmentation.
+
+        Args:
+        - rotation_range (float): Maximum rotation, in degrees.
+        - width_shift_range (float): Maximum horizontal shift, as a fraction of the width.
+        - height_shift_range (float): Maximum vertical shift, as a fraction of the height.
+        - shear_range (float): Maximum shear angle, in degrees.
+        - zoom_range (float): Zoom factors are drawn from [1 - zoom_range, 1 + zoom_range].
+        - horizontal_flip (bool): Whether to flip half of the images horizontally.
+        - seed (int or None): Seed for a reproducible sequence of transforms.
+        """
+        self.rotation_range = rotation_range
+        self.width_shift_range = width_shift_range
+        self.height_shift_range = height_shift_range
+        self.shear_range = shear_range
+        self.zoom_range = zoom_range
+        self.horizontal_flip = horizontal_flip
+        if seed is None:
+            self.generator = tf.random.Generator.from_non_deterministic_state()
+        else:
+            self.generator = tf.random.Generator.from_seed(seed)
+
+    def _uniform(self, batch_size: tf.Tensor, low: float, high: float) -> tf.Tensor:
+        return self.generator.uniform([batch_size], minval=low, maxval=high)
+
+    def matrices(self, batch_size: tf.Tensor, height: tf.Tensor, width: tf.Tensor) -> tf.Tensor:
+        """
+        Sample one output-to-input transform per image.
+
+        Matrices act on (x=col, y=row, 1) coordinates, like the one Keras
+        passes to ``ndimage.affine_transform`` after swapping its axes.
+
+        Args:
+        - batch_size (tf.Tensor): Number of images.
+        - height (tf.Tensor): Image height.
+        - width (tf.Tensor): Image width.
+
+        Returns:
+        - tf.Tensor: float32 tensor of shape (batch_size, 3, 3).
+        """
+        height = tf.cast(height, tf.float32)
+        width = tf.cast(width, tf.float32)
+        zeros = tf.zeros([batch_size])
+        ones = tf.ones([batch_size])
+
+        def matrix(rows):
+            return tf.stack([tf.stack(row, axis=-1) for row in rows], axis=-2)
+
+        theta = self._uniform(batch_size, -self.rotation_range, self.rotation_range) * (math.pi / 180)
+        tx = self._uniform(batch_size, -self.height_shift_range, self.height_shift_range) * height
+        ty = self._uniform(batch_size, -self.width_shift_range, self.width_shift_range) * width
+        shear = self._uniform(batch_size, -self.shear_range, self.shear_range) * (math.pi / 180)
+        zx = self._uniform(batch_size, 1 - self.zoom_range, 1 + self.zoom_range)
+        zy = self._uniform(batch_size, 1 - self.zoom_range, 1 + self.zoom_range)
+
+        rotation = matrix([[tf.cos(theta), -tf.sin(theta), zeros], [tf.sin(theta), tf.cos(theta), zeros], [zeros, zeros, ones]])
+        shift = matrix([[ones, zeros, tx], [zeros, ones, ty], [zeros, zeros, ones]])
+        shear_matrix = matrix([[ones, -tf.sin(shear), zeros], [zeros, tf.cos(shear), zeros], [zeros, zeros, ones]])
+        zoom = matrix([[zx, zeros, zeros], [zeros, zy, zeros], [zeros, zeros, ones]])
+
+        o_x, o_y = height / 2 - 0.5, width / 2 - 0.5
+        offset = matrix([[ones, zeros, ones * o_x], [zeros, ones, ones * o_y], [zeros, zeros, ones]])
+        reset = matrix([[ones, zeros, ones * -o_x], [zeros, ones, ones * -o_y], [zeros, zeros, ones]])
+        transform = offset @ rotation @ shift @ shear_matrix @ zoom @ reset
+
+        if self.horizontal_flip:
+            # Keras flips the transformed image, i.e. the output column x reads column W - 1 - x.
+            flip = self._uniform(batch_size, 0, 1) < 0.5
+            sign = tf.where(flip, -ones, ones)
+            flip_matrix = matrix([[sign, zeros, tf.where(flip, ones * (width - 1), zeros)], [zeros, ones, zeros], [zeros, zeros, ones]])
+            transform = transform @ flip_matrix
+
+        return transform
+
+    def __call__(self, images: tf.Tensor) -> tf.Tensor:
+        """
+        Augment a batch of float images of shape (batch, height, width, channels).
+        """
+        shape = tf.shape(images)
+        transform = tf.reshape(self.matrices(shape[0], shape[1], shape[2]), [-1, 9])[:, :8]
+
+        return tf.raw_ops.ImageProjectiveTransformV3(
+            images=images,
+            transforms=transform,
+            output_shape=shape[1:3],
+            fill_value=0.0,
+            interpolation="BILINEAR",
+            fill_mode="NEAREST"
+        )
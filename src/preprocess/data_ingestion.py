@@ -1,8 +1,8 @@
 import os
-import zipfile
-import gdown
 from src.logging import logger
 from src.entity.config_entity import DataIngestionConfig
+from src.preprocess.downloader import Downloader, source_for
+from src.preprocess.extraction import ZipExtractor
 
 
 class DataIngestion:
@@ -23,6 +23,10 @@ class DataIngestion:
     def download_file(self) -> None:
         """
         Download data from the specified URL.
+
+        The download is streamed in chunks, resumed after interruptions and
+        verified against the SHA-256 manifest; it is skipped when a verified
+        archive is already present.
         
         Raises:
             Exception: If downloading fails.
@@ -30,14 +34,19 @@ class DataIngestion:
         try:
             dataset_url = self.config.source_URL
             zip_download_dir = self.config.local_data_file
-            os.makedirs("artifacts/data_ingestion", exist_ok=True)
-            logger.info(f"Downloading data from {dataset_url} into file {zip_download_dir}")
-
-            file_id = dataset_url.split("/")[-2]
-            prefix = 'https://drive.google.com/uc?/export=download&id='
-            gdown.download(prefix + file_id, zip_download_dir)
+            os.makedirs(self.config.root_dir, exist_ok=True)
 
-            logger.info(f"Downloaded data from {dataset_url} into file {zip_download_dir}")
+            downloader = Downloader(
+                source=source_for(dataset_url),
+                destination=zip_download_dir,
+                manifest_file=self.config.manifest_file,
+                expected_sha256=self.config.sha256,
+                chunk_size=self.config.chunk_size,
+                max_retries=self.config.max_retries
+            )
+            logger.info(f"Downloading data from {dataset_url} into file {zip_download_dir}")
+            if downloader.download():
+                logger.info(f"Downloaded data from {dataset_url} into file {zip_download_dir}")
         except Exception as e:
             logger.error(f"Error occurred while downloading data: {e}")
             raise e
@@ -46,6 +55,9 @@ class DataIngestion:
     def extract_zip_file(self) -> None:
         """
         Extract the downloaded zip file.
+
+        Members are extracted by a pool of workers; members unchanged since
+        the last extraction are skipped.
         
         Raises:
             Exception: If extraction fails.
@@ -53,8 +65,33 @@ class DataIngestion:
         try:
             unzip_path = self.config.unzip_dir
             os.makedirs(unzip_path, exist_ok=True)
-            with zipfile.ZipFile(self.config.local_data_file, 'r') as zip_ref:
-                zip_ref.extractall(unzip_path)
+            self._extractor().extract()
         except Exception as e:
             logger.error(f"Error occurred while extracting zip file: {e}")
             raise e
+
+
+    def extract_to_image_cache(self, image_cache) -> None:
+        """
+        Decode the images in the zip file straight into the image cache.
+
+        Args:
+            image_cache (ImageCache): Image cache to build.
+
+        Raises:
+            Exception: If extraction fails.
+        """
+        try:
+            image_cache.build_from_archive(self._extractor())
+        except Exception as e:
+            logger.error(f"Error occurred while extracting zip file into the image cache: {e}")
+            raise e
+
+
+    def _extractor(self) -> ZipExtractor:
+        return ZipExtractor(
+            zip_path=self.config.local_data_file,
+            unzip_dir=self.config.unzip_dir,
+            manifest_file=self.config.extract_manifest_file,
+            workers=self.config.extract_workers
+        )
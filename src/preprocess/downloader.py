@@ -0,0 +1,246 @@
+import io
+import os
+import time
+import shutil
+import hashlib
+import http.client
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import BinaryIO, Optional, Tuple
+from urllib.parse import urlparse, unquote
+
+from src.logging import logger
+from src.utils.common import save_json, load_json
+
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def sha256sum(path: Path, chunk_size: int = HASH_CHUNK_SIZE) -> str:
+    """
+    Compute the SHA-256 digest of a file, reading it in chunks.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class IncompleteDownload(OSError):
+    """
+    Raised when a download ends before the size announced by the source; retried like other I/O errors.
+    """
+
+
+class HTTPSource:
+    """
+    Download source for http(s) URLs, resuming with Range requests.
+    """
+
+    def __init__(self, url: str, timeout: float = 60):
+        self.url = url
+        self.timeout = timeout
+
+    def open(self, offset: int) -> Tuple[BinaryIO, bool, Optional[int]]:
+        """
+        Open the remote file at ``offset``.
+
+        Returns:
+        - Tuple[BinaryIO, bool, Optional[int]]: The stream; whether it starts at
+          ``offset`` (False means the server ignored the range and sent the
+          whole file); and the size of the whole file, from Content-Range or
+          Content-Length, or None if the server did not announce it.
+        """
+        request = urllib.request.Request(self.url)
+        if offset:
+            request.add_header("Range", f"bytes={offset}-")
+        try:
+            response = urllib.request.urlopen(request, timeout=self.timeout)
+        except urllib.error.HTTPError as e:
+            # 416: the partial file already holds every byte, if the total matches.
+            if offset and e.code == 416:
+                return io.BytesIO(b""), True, _range_total(e.headers.get("Content-Range"))
+            raise e
+
+        if offset and response.status == 206:
+            return response, True, _range_total(response.headers.get("Content-Range"))
+        length = response.headers.get("Content-Length")
+        return response, offset == 0, int(length) if length is not None else None
+
+
+def _range_total(content_range: Optional[str]) -> Optional[int]:
+    """
+    Parse the complete length from a Content-Range header such as ``bytes 100-199/200``.
+    """
+    if not content_range or "/" not in content_range:
+        return None
+    total = content_range.rsplit("/", 1)[1].strip()
+    return int(total) if total.isdigit() else None
+
+
+class GoogleDriveSource(HTTPSource):
+    """
+    Download source for Google Drive share links.
+    """
+
+    def __init__(self, url: str, timeout: float = 60):
+        file_id = url.split("/")[-2]
+        super().__init__(
+            f"https://drive.usercontent.google.com/download?id={file_id}&export=download&confirm=t",
+            timeout=timeout
+        )
+
+
+class FileSource:
+    """
+    Download source for file:// URLs, e.g. a local mirror or a test fixture.
+    """
+
+    def __init__(self, url: str):
+        self.path = Path(unquote(urlparse(url).path))
+
+    def open(self, offset: int) -> Tuple[BinaryIO, bool, Optional[int]]:
+        f = open(self.path, "rb")
+        f.seek(offset)
+        return f, True, os.fstat(f.fileno()).st_size
+
+
+def source_for(url: str):
+    """
+    Pick the download source for a URL.
+
+    Args:
+    - url (str): Google Drive share link, http(s) URL or file:// URL.
+
+    Returns:
+    - Source exposing ``open(offset) -> (stream, resumed, total_size)``.
+    """
+    scheme = urlparse(url).scheme
+    if scheme == "file":
+        return FileSource(url)
+    if "drive.google.com" in url:
+        return GoogleDriveSource(url)
+    if scheme in ("http", "https"):
+        return HTTPSource(url)
+    raise ValueError(f"Unsupported download URL: {url}")
+
+
+class Downloader:
+    """
+    Class to download a file in fixed-size chunks with resume and SHA-256 verification.
+
+    Data is streamed into ``<destination>.part`` and moved into place only
+    once its digest is verified. An interrupted download resumes from the
+    size of the partial file; a body shorter than the size the source
+    announced is retried like a dropped connection. The verified digest is
+    recorded in a manifest, and a later run whose destination still matches
+    it skips the download. Without an expected digest, the first download is
+    only trusted if the source announced its size.
+
+    Attributes:
+    - source: Download source exposing ``open(offset)``.
+    - destination (Path): Path of the downloaded file.
+    - manifest_file (Path): JSON manifest recording the verified digest.
+    - expected_sha256 (str or None): Known digest; if None the first verified download is trusted.
+    - chunk_size (int): Bytes read and written per chunk.
+    - max_retries (int): Attempts before giving up on a failing download.
+    """
+
+    def __init__(self, source, destination: Path, manifest_file: Path, expected_sha256: Optional[str] = None,
+                 chunk_size: int = HASH_CHUNK_SIZE, max_retries: int = 5):
+        self.source = source
+        self.destination = Path(destination)
+        self.manifest_file = Path(manifest_file)
+        self.expected_sha256 = expected_sha256
+        self.chunk_size = chunk_size
+        self.max_retries = max_retries
+
+    def _manifest_sha256(self) -> Optional[str]:
+        if not self.manifest_file.exists():
+            return None
+        return load_json(self.manifest_file).get("sha256")
+
+    def is_verified(self) -> bool:
+        """
+        Check whether the destination exists and matches the expected digest.
+        """
+        expected = self.expected_sha256 or self._manifest_sha256()
+        return self.destination.exists() and expected is not None and sha256sum(self.destination) == expected
+
+    def _fetch(self, part: Path) -> bool:
+        """
+        Append the rest of the source to the partial file, restarting if the source cannot resume.
+
+        Returns:
+        - bool: Whether the partial file's size was confirmed against the size the source announced.
+
+        Raises:
+        - IncompleteDownload: If the partial file is shorter or longer than announced.
+        """
+        offset = part.stat().st_size if part.exists() else 0
+        stream, resumed, total = self.source.open(offset)
+        with stream:
+            if not resumed:
+                offset = 0
+            if offset:
+                logger.info(f"Resuming download of {self.destination} at byte {offset}")
+            with open(part, "ab" if offset else "wb") as f:
+                shutil.copyfileobj(stream, f, self.chunk_size)
+
+        if total is None:
+            return False
+        size = part.stat().st_size
+        if size > total:
+            # Left over from another file; the next attempt starts over.
+            part.unlink()
+            raise IncompleteDownload(f"{part} holds {size} bytes, more than the {total} announced")
+        if size < total:
+            raise IncompleteDownload(f"Download of {self.destination} stopped at byte {size} of {total}")
+        return True
+
+    def download(self) -> bool:
+        """
+        Download and verify the file unless a verified copy already exists.
+
+        Returns:
+        - bool: True if the file was downloaded, False if it was already present.
+
+        Raises:
+        - ValueError: If the downloaded file does not match the expected digest.
+        - OSError: If the download still fails or is incomplete after ``max_retries`` attempts.
+        """
+        if self.is_verified():
+            logger.info(f"Verified {self.destination} already present, skipping download")
+            return False
+
+        os.makedirs(self.destination.parent, exist_ok=True)
+        part = self.destination.with_name(self.destination.name + ".part")
+
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                size_confirmed = self._fetch(part)
+                break
+            except (OSError, http.client.HTTPException) as e:
+                if attempt == self.max_retries:
+                    raise e
+                logger.warning(f"Download attempt {attempt} failed ({e}); retrying")
+                time.sleep(min(2 ** attempt, 30))
+
+        digest = sha256sum(part)
+        expected = self.expected_sha256 or self._manifest_sha256()
+        if expected is not None and digest != expected:
+            part.unlink()
+            raise ValueError(f"SHA-256 mismatch for {self.destination}: expected {expected}, got {digest}")
+
+        if expected is None and not size_confirmed:
+            logger.warning(
+                f"The source of {self.destination} did not announce its size; "
+                f"its digest is not recorded, so it is downloaded again on the next run"
+            )
+            digest = None
+
+        os.replace(part, self.destination)
+        save_json(path=self.manifest_file, data={"sha256": digest, "size": self.destination.stat().st_size})
+        return True
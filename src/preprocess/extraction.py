@@ -0,0 +1,125 @@
+import os
+import zipfile
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Tuple
+
+from src.logging import logger
+from src.utils.common import save_json, load_json
+
+
+class ZipExtractor:
+    """
+    Class to extract a zip archive in parallel, skipping unchanged members.
+
+    Every extracted member is recorded in a manifest with its CRC and size.
+    On re-runs only members that are new, changed or missing on disk are
+    extracted, and files of members no longer in the archive are removed.
+
+    Attributes:
+    - zip_path (Path): Path of the archive.
+    - unzip_dir (Path): Directory to extract into.
+    - manifest_file (Path): JSON manifest of extracted members.
+    - workers (int): Number of extraction threads.
+    """
+
+    def __init__(self, zip_path: Path, unzip_dir: Path, manifest_file: Path, workers: int):
+        self.zip_path = Path(zip_path)
+        self.unzip_dir = Path(unzip_dir)
+        self.manifest_file = Path(manifest_file)
+        self.workers = workers
+
+    def _load_manifest(self) -> Dict[str, dict]:
+        if not self.manifest_file.exists():
+            return {}
+        return dict(load_json(self.manifest_file))
+
+    def _is_extracted(self, info: zipfile.ZipInfo, manifest: Dict[str, dict]) -> bool:
+        """
+        Check whether a member is on disk exactly as the manifest recorded it.
+        """
+        entry = manifest.get(info.filename)
+        target = self.unzip_dir / info.filename
+        return (
+            entry is not None
+            and entry["crc"] == info.CRC
+            and entry["size"] == info.file_size
+            and target.is_file()
+            and target.stat().st_size == info.file_size
+        )
+
+    def _extract_members(self, names: List[str]):
+        """
+        Extract a group of members with a ZipFile handle private to this thread.
+        """
+        with zipfile.ZipFile(self.zip_path, "r") as zip_ref:
+            for name in names:
+                zip_ref.extract(name, self.unzip_dir)
+
+    def extract(self) -> int:
+        """
+        Extract every new or changed member.
+
+        Returns:
+        - int: Number of members extracted.
+        """
+        with zipfile.ZipFile(self.zip_path, "r") as zip_ref:
+            infos = [info for info in zip_ref.infolist() if not info.is_dir()]
+
+        manifest = self._load_manifest()
+        pending = [info.filename for info in infos if not self._is_extracted(info, manifest)]
+
+        current = {info.filename for info in infos}
+        for name in set(manifest) - current:
+            stale = self.unzip_dir / name
+            if stale.is_file():
+                stale.unlink()
+
+        if pending:
+            groups = [pending[i::self.workers] for i in range(self.workers)]
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                # list() re-raises the first extraction error, if any.
+                list(executor.map(self._extract_members, [group for group in groups if group]))
+
+        save_json(
+            path=self.manifest_file,
+            data={info.filename: {"crc": info.CRC, "size": info.file_size} for info in infos}
+        )
+        logger.info(f"Extracted {len(pending)} of {len(infos)} members from {self.zip_path}")
+        return len(pending)
+
+    def image_members(self, data_root: str, extensions: Tuple[str, ...]) -> Tuple[List[str], List[int], List[str]]:
+        """
+        List the image members below ``data_root`` in ``list_image_files`` order.
+
+        Args:
+        - data_root (str): Name of the dataset directory inside the archive, e.g. "Chest-CT-Scan-data".
+        - extensions (Tuple[str, ...]): Image file extensions, without the dot.
+
+        Returns:
+        - Tuple[List[str], List[int], List[str]]: Member names, integer labels and class names.
+        """
+        suffixes = tuple("." + ext for ext in extensions)
+        members = []
+        with zipfile.ZipFile(self.zip_path, "r") as zip_ref:
+            for info in zip_ref.infolist():
+                parts = info.filename.split("/")
+                if info.is_dir() or data_root not in parts[:-2]:
+                    continue
+                relpath = "/".join(parts[parts.index(data_root) + 1:])
+                if relpath.lower().endswith(suffixes):
+                    members.append((relpath, info.filename))
+
+        class_names = sorted({relpath.split("/")[0] for relpath, _ in members})
+        members.sort(key=lambda m: (m[0].split("/")[0], os.path.dirname(m[0]), os.path.basename(m[0])))
+        labels = [class_names.index(relpath.split("/")[0]) for relpath, _ in members]
+        return [name for _, name in members], labels, class_names
+
+    def read_members(self, names: List[str], data_root: str) -> Iterator[Tuple[str, bytes]]:
+        """
+        Yield the path relative to ``data_root`` and the bytes of each member.
+        """
+        with zipfile.ZipFile(self.zip_path, "r") as zip_ref:
+            for name in names:
+                parts = name.split("/")
+                yield "/".join(parts[parts.index(data_root) + 1:]), zip_ref.read(name)
@@ -0,0 +1,322 @@
+import os
+import shutil
+import hashlib
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import tensorflow as tf
+
+from src.logging import logger
+from src.entity.config_entity import ImageCacheConfig
+from src.preprocess import input_pipeline
+from src.utils.common import save_json, load_json
+
+
+MANIFEST_FILE = "manifest.json"
+LABELS_FILE = "labels.npy"
+WRITE_BATCH_SIZE = 64
+
+
+def cache_key(files: Iterable[Tuple[str, bytes]], image_size: Sequence[int]) -> str:
+    """
+    Compute the cache key of a dataset.
+
+    The key hashes the relative path and bytes of every image, in order,
+    together with the target image size.
+
+    Args:
+    - files (Iterable[Tuple[str, bytes]]): Relative path and contents of each image.
+    - image_size (Sequence[int]): Target size, e.g. [224, 224, 3].
+
+    Returns:
+    - str: Hex digest identifying the cached images.
+    """
+    digest = hashlib.sha256(repr(list(image_size)).encode())
+    for relpath, contents in files:
+        digest.update(relpath.replace(os.sep, "/").encode())
+        digest.update(len(contents).to_bytes(8, "little"))
+        digest.update(contents)
+    return digest.hexdigest()
+
+
+def read_files(directory: str, filepaths: Sequence[str]):
+    """
+    Yield the relative path and contents of each file.
+    """
+    for path in filepaths:
+        with open(path, "rb") as f:
+            yield os.path.relpath(path, directory), f.read()
+
+
+class ImageCache:
+    """
+    Class to decode the dataset once into memory-mapped uint8 shards.
+
+    Attributes:
+    - config (ImageCacheConfig): Configuration for the image cache.
+    """
+
+    def __init__(self, config: ImageCacheConfig):
+        """
+        Initialize ImageCache.
+
+        Args:
+        - config (ImageCacheConfig): Configuration for the image cache.
+        """
+        self.config = config
+
+    def is_current(self, key: str) -> bool:
+        """
+        Check whether the cache on disk was built for the given key.
+
+        Args:
+        - key (str): Cache key of the dataset.
+
+        Returns:
+        - bool: True if the cache is complete and matches the key.
+        """
+        manifest_path = Path(self.config.root_dir) / MANIFEST_FILE
+        if not manifest_path.exists():
+            return False
+        return load_json(manifest_path).key == key
+
+    def is_complete(self) -> bool:
+        """
+        Check whether a finished cache exists, whatever its key.
+        """
+        return (Path(self.config.root_dir) / MANIFEST_FILE).exists()
+
+    def build(self):
+        """
+        Build the cache from the extracted dataset, unless it is up to date.
+        """
+        directory = str(self.config.training_data)
+        if not os.path.isdir(directory) and self.is_complete():
+            logger.info(f"{directory} was not extracted; using the image cache written during ingestion")
+            return
+
+        filepaths, labels, class_names = input_pipeline.list_image_files(directory)
+        key = cache_key(read_files(directory, filepaths), self.config.params_image_size)
+
+        if self.is_current(key):
+            logger.info(f"Image cache at {self.config.root_dir} is up to date, skipping")
+            return
+
+        images = tf.data.Dataset.from_tensor_slices(filepaths).map(
+            lambda path: input_pipeline.load_image(path, self.config.params_image_size),
+            num_parallel_calls=input_pipeline.AUTOTUNE
+        )
+        self.write(images, labels, class_names, key)
+
+    def build_from_archive(self, extractor):
+        """
+        Build the cache straight from the zip archive, without extracting image files.
+
+        The archive members are hashed into the same key ``build`` would
+        compute for the extracted tree, then decoded in parallel into shards.
+
+        Args:
+        - extractor (ZipExtractor): Extractor of the downloaded archive.
+        """
+        data_root = Path(self.config.training_data).name
+        names, labels, class_names = extractor.image_members(data_root, input_pipeline.WHITE_LIST_FORMATS)
+        key = cache_key(extractor.read_members(names, data_root), self.config.params_image_size)
+
+        if self.is_current(key):
+            logger.info(f"Image cache at {self.config.root_dir} is up to date, skipping")
+            return
+
+        contents = tf.data.Dataset.from_generator(
+            lambda: (data for _, data in extractor.read_members(names, data_root)),
+            output_signature=tf.TensorSpec(shape=(), dtype=tf.string)
+        )
+        images = contents.map(
+            lambda data: input_pipeline.decode_and_resize(data, self.config.params_image_size),
+            num_parallel_calls=input_pipeline.AUTOTUNE
+        )
+        self.write(images, labels, class_names, key)
+
+    def write(self, images: tf.data.Dataset, labels: Sequence[int], class_names: List[str], key: str):
+        """
+        Write decoded images into shards and replace the current cache.
+
+        Args:
+        - images (tf.data.Dataset): Unbatched uint8 images, in label order.
+        - labels (Sequence[int]): Integer label of each image.
+        - class_names (List[str]): Class names, indexed by label.
+        - key (str): Cache key of the dataset.
+        """
+        root_dir = Path(self.config.root_dir)
+        tmp_dir = root_dir / "tmp"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir, exist_ok=True)
+
+        image_size = list(self.config.params_image_size)
+        shard_size = self.config.params_shard_size
+        num_images = len(labels)
+
+        shard_files, shards = [], []
+        for start in range(0, num_images, shard_size):
+            shard_file = f"images-{len(shards):05d}.npy"
+            shard_files.append(shard_file)
+            shards.append(np.lib.format.open_memmap(
+                tmp_dir / shard_file,
+                mode="w+",
+                dtype=np.uint8,
+                shape=(min(shard_size, num_images - start), *image_size)
+            ))
+
+        position = 0
+        for batch in images.batch(WRITE_BATCH_SIZE).prefetch(input_pipeline.AUTOTUNE):
+            batch = batch.numpy()
+            offset = 0
+            while offset < len(batch):
+                shard, start = divmod(position, shard_size)
+                count = min(len(batch) - offset, len(shards[shard]) - start)
+                shards[shard][start:start + count] = batch[offset:offset + count]
+                offset += count
+                position += count
+
+        if position != num_images:
+            raise ValueError(f"Decoded {position} images but expected {num_images}")
+
+        for shard in shards:
+            shard.flush()
+        del shards
+
+        np.save(tmp_dir / LABELS_FILE, np.asarray(labels, dtype=np.int32))
+        manifest = {
+            "key": key,
+            "image_size": image_size,
+            "class_names": list(class_names),
+            "shard_size": shard_size,
+            "shards": shard_files,
+            "samples": num_images
+        }
+
+        # The manifest is written last so an interrupted write is never mistaken for a valid cache.
+        for name in os.listdir(root_dir):
+            path = root_dir / name
+            if path.is_file():
+                path.unlink()
+        for name in shard_files + [LABELS_FILE]:
+            os.replace(tmp_dir / name, root_dir / name)
+        save_json(path=root_dir / MANIFEST_FILE, data=manifest)
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        logger.info(f"Cached {num_images} images into {len(shard_files)} shards at {root_dir}")
+
+
+class CachedImages:
+    """
+    Read-only, memory-mapped view of an image cache.
+
+    Attributes:
+    - shards (List[np.memmap]): uint8 image shards.
+    - labels (np.ndarray): Integer label of each image.
+    - class_names (List[str]): Class names, indexed by label.
+    - image_size (List[int]): Size of the cached images.
+    """
+
+    def __init__(self, root_dir: Path):
+        """
+        Open the cache written by ``ImageCache``.
+
+        Args:
+        - root_dir (Path): Directory of the image cache.
+        """
+        root_dir = Path(root_dir)
+        manifest_path = root_dir / MANIFEST_FILE
+        if not manifest_path.exists():
+            raise FileNotFoundError(f"No image cache at {root_dir}; run the image cache stage first")
+
+        manifest = load_json(manifest_path)
+        self.key = manifest.key
+        self.image_size = list(manifest.image_size)
+        self.class_names = list(manifest.class_names)
+        self.shard_size = manifest.shard_size
+        self.shards = [np.load(root_dir / name, mmap_mode="r") for name in manifest.shards]
+        self.labels = np.load(root_dir / LABELS_FILE)
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def take(self, indices: np.ndarray) -> np.ndarray:
+        """
+        Gather images by global index.
+
+        A run of consecutive indices inside one shard is returned as a
+        zero-copy view of the memory map; anything else is gathered into a
+        new batch-sized array.
+
+        Args:
+        - indices (np.ndarray): Global image indices.
+
+        Returns:
+        - np.ndarray: uint8 images of shape (len(indices), *image_size).
+        """
+        first, last = int(indices[0]), int(indices[-1])
+        shard, start = divmod(first, self.shard_size)
+        if last - first + 1 == len(indices) and last // self.shard_size == shard \
+                and np.all(np.diff(indices) == 1):
+            return self.shards[shard][start:start + len(indices)]
+
+        batch = np.empty((len(indices), *self.image_size), dtype=np.uint8)
+        for position, index in enumerate(indices):
+            shard, offset = divmod(int(index), self.shard_size)
+            batch[position] = self.shards[shard][offset]
+        return batch
+
+
+def cached_dataset(cache_dir: Path, image_size: Sequence[int], batch_size: int,
+                   subset: Optional[str] = None, validation_split: float = 0.0,
+                   shuffle: bool = False, augmentation: bool = False,
+                   drop_remainder: bool = False, seed: Optional[int] = None,
+                   skip_batches: int = 0) -> Tuple[tf.data.Dataset, int]:
+    """
+    Image-cache counterpart of ``input_pipeline.directory_dataset``.
+
+    Batches are sliced out of the memory-mapped shards and rescaled to
+    float one batch at a time, so the whole dataset is never held as float32.
+
+    Args:
+    - cache_dir (Path): Directory of the image cache.
+    - image_size (Sequence[int]): Expected image size, e.g. [224, 224, 3].
+    - batch_size (int): Batch size.
+    - subset (str or None): "training", "validation" or None.
+    - validation_split (float): Fraction of each class held out for validation.
+    - shuffle (bool): Whether to reshuffle the images every epoch.
+    - augmentation (bool): Whether to apply random augmentation.
+    - drop_remainder (bool): Whether to drop the last partial batch.
+    - seed (int or None): Seed for shuffling and augmentation.
+    - skip_batches (int): Leading batches of each pass to leave out, without reading them.
+
+    Returns:
+    - Tuple[tf.data.Dataset, int]: The dataset and the number of samples in it.
+    """
+    cache = CachedImages(cache_dir)
+    if cache.image_size != list(image_size):
+        raise ValueError(
+            f"Image cache at {cache_dir} holds {cache.image_size} images, expected {list(image_size)}; "
+            "rebuild it with the image cache stage"
+        )
+
+    indices = np.asarray(input_pipeline.subset_indices(cache.labels, subset, validation_split), dtype=np.int64)
+    rng = np.random.default_rng(seed)
+
+    def batches():
+        order = rng.permutation(indices) if shuffle else indices
+        stop = len(order) - len(order) % batch_size if drop_remainder else len(order)
+        for start in range(skip_batches * batch_size, stop, batch_size):
+            batch = order[start:start + batch_size]
+            yield cache.take(batch), cache.labels[batch]
+
+    dataset = tf.data.Dataset.from_generator(
+        batches,
+        output_signature=(
+            tf.TensorSpec(shape=(None, *image_size), dtype=tf.uint8),
+            tf.TensorSpec(shape=(None,), dtype=tf.int32)
+        )
+    )
+    return input_pipeline.prepare_batches(dataset, len(cache.class_names), augmentation, seed=seed), len(indices)
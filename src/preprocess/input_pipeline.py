@@ -0,0 +1,233 @@
+import os
+from typing import List, Optional, Sequence, Tuple
+
+import tensorflow as tf
+
+from src.preprocess.augmentation import AffineAugmentation
+
+
+AUTOTUNE = tf.data.AUTOTUNE
+
+# Formats tf.io.decode_image can read; a subset of the Keras generator white list.
+WHITE_LIST_FORMATS = ("png", "jpg", "jpeg", "bmp")
+
+INPUT_PIPELINES = ("generator", "tf_data", "cache")
+
+
+def list_image_files(directory: str) -> Tuple[List[str], List[int], List[str]]:
+    """
+    List every image under a class-per-subdirectory tree.
+
+    Files are ordered the same way as ``flow_from_directory`` orders them
+    (classes sorted by name, then files sorted within each walked directory),
+    so subsets selected with ``subset_indices`` match the generator splits.
+
+    Args:
+    - directory (str): Root directory with one subdirectory per class.
+
+    Returns:
+    - Tuple[List[str], List[int], List[str]]: File paths, integer labels and class names.
+    """
+    class_names = sorted(
+        name for name in os.listdir(directory)
+        if os.path.isdir(os.path.join(directory, name))
+    )
+    extensions = tuple("." + ext for ext in WHITE_LIST_FORMATS)
+
+    filepaths, labels = [], []
+    for label, class_name in enumerate(class_names):
+        class_dir = os.path.join(directory, class_name)
+        for root, _, fnames in sorted(os.walk(class_dir), key=lambda x: x[0]):
+            for fname in sorted(fnames):
+                if fname.lower().endswith(extensions):
+                    filepaths.append(os.path.join(root, fname))
+                    labels.append(label)
+
+    return filepaths, labels, class_names
+
+
+def subset_indices(labels: Sequence[int], subset: Optional[str], validation_split: float) -> List[int]:
+    """
+    Select the indices of a training or validation subset.
+
+    Mirrors the Keras ``validation_split`` semantics: within each class the
+    first ``validation_split`` fraction of files is the validation subset and
+    the rest is the training subset.
+
+    Args:
+    - labels (Sequence[int]): Integer labels, grouped by class.
+    - subset (str or None): "training", "validation" or None for every index.
+    - validation_split (float): Fraction of each class held out for validation.
+
+    Returns:
+    - List[int]: Indices of the selected samples.
+    """
+    if subset not in (None, "training", "validation"):
+        raise ValueError(f"Invalid subset name: {subset}; expected 'training' or 'validation'")
+
+    per_class = {}
+    for index, label in enumerate(labels):
+        per_class.setdefault(int(label), []).append(index)
+
+    selected = []
+    for label in sorted(per_class):
+        indices = per_class[label]
+        cut = int(validation_split * len(indices))
+        if subset == "validation":
+            selected.extend(indices[:cut])
+        elif subset == "training":
+            selected.extend(indices[cut:])
+        else:
+            selected.extend(indices)
+    return selected
+
+
+def decode_and_resize(contents: tf.Tensor, image_size: Sequence[int]) -> tf.Tensor:
+    """
+    Decode encoded image bytes into a resized uint8 RGB tensor.
+
+    Args:
+    - contents (tf.Tensor): Encoded PNG/JPEG/BMP bytes.
+    - image_size (Sequence[int]): Target size, e.g. [224, 224, 3].
+
+    Returns:
+    - tf.Tensor: uint8 tensor of shape image_size.
+    """
+    image = tf.io.decode_image(contents, channels=3, expand_animations=False)
+    # Antialiased bilinear resize matches PIL's bilinear used by the Keras generators.
+    image = tf.image.resize(image, image_size[:2], method="bilinear", antialias=True)
+    image = tf.saturate_cast(tf.round(image), tf.uint8)
+    image.set_shape(image_size)
+    return image
+
+
+def load_image(path: tf.Tensor, image_size: Sequence[int]) -> tf.Tensor:
+    """
+    Read an image file and decode it with ``decode_and_resize``.
+
+    Args:
+    - path (tf.Tensor): Path of the image file.
+    - image_size (Sequence[int]): Target size, e.g. [224, 224, 3].
+
+    Returns:
+    - tf.Tensor: uint8 tensor of shape image_size.
+    """
+    return decode_and_resize(tf.io.read_file(path), image_size)
+
+
+def rescale(images: tf.Tensor) -> tf.Tensor:
+    """
+    Rescale uint8 images to float32 in [0, 1], as ``rescale=1./255`` does.
+    """
+    return tf.cast(images, tf.float32) * (1. / 255)
+
+
+def build_dataset(filepaths: Sequence[str], labels: Sequence[int], num_classes: int,
+                  image_size: Sequence[int], batch_size: int, shuffle: bool = False,
+                  augmentation: bool = False, drop_remainder: bool = False,
+                  seed: Optional[int] = None, skip_batches: int = 0) -> tf.data.Dataset:
+    """
+    Build a batched, prefetched dataset of (images, one-hot labels).
+
+    Files are decoded and resized in parallel with ``num_parallel_calls=AUTOTUNE``;
+    rescaling and augmentation run once per batch.
+
+    Args:
+    - filepaths (Sequence[str]): Image file paths.
+    - labels (Sequence[int]): Integer label of each file.
+    - num_classes (int): Number of classes for one-hot encoding.
+    - image_size (Sequence[int]): Target size, e.g. [224, 224, 3].
+    - batch_size (int): Batch size.
+    - shuffle (bool): Whether to reshuffle the files every epoch.
+    - augmentation (bool): Whether to apply random augmentation.
+    - drop_remainder (bool): Whether to drop the last partial batch.
+    - seed (int or None): Seed for shuffling and augmentation.
+    - skip_batches (int): Leading batches of each pass to leave out, e.g. to
+      resume an epoch; their files are skipped before decoding.
+
+    Returns:
+    - tf.data.Dataset: Dataset yielding float32 images in [0, 1] and one-hot labels.
+    """
+    dataset = tf.data.Dataset.from_tensor_slices((list(filepaths), list(labels)))
+    if shuffle:
+        dataset = dataset.shuffle(len(filepaths), seed=seed, reshuffle_each_iteration=True)
+    if skip_batches:
+        dataset = dataset.skip(skip_batches * batch_size)
+
+    dataset = dataset.map(
+        lambda path, label: (load_image(path, image_size), label),
+        num_parallel_calls=AUTOTUNE
+    )
+    dataset = dataset.batch(batch_size, drop_remainder=drop_remainder)
+    return prepare_batches(dataset, num_classes, augmentation, seed=seed)
+
+
+def prepare_batches(dataset: tf.data.Dataset, num_classes: int, augmentation: bool = False,
+                    seed: Optional[int] = None) -> tf.data.Dataset:
+    """
+    Turn batches of (uint8 images, integer labels) into model inputs.
+
+    Rescales to float and one-hot encodes per batch, optionally augments
+    each batch with a single vectorized affine warp, and prefetches.
+
+    Args:
+    - dataset (tf.data.Dataset): Batched dataset of uint8 images and integer labels.
+    - num_classes (int): Number of classes for one-hot encoding.
+    - augmentation (bool): Whether to apply random augmentation.
+    - seed (int or None): Seed for the augmentation transforms.
+
+    Returns:
+    - tf.data.Dataset: Dataset yielding float32 images in [0, 1] and one-hot labels.
+    """
+    dataset = dataset.map(
+        lambda images, labels: (rescale(images), tf.one_hot(labels, num_classes)),
+        num_parallel_calls=AUTOTUNE
+    )
+
+    if augmentation:
+        augment = AffineAugmentation(seed=seed)
+        # Sequential map: the transform generator is stateful, so batches draw in order.
+        dataset = dataset.map(lambda images, labels: (augment(images), labels))
+
+    return dataset.prefetch(AUTOTUNE)
+
+
+def directory_dataset(directory: str, image_size: Sequence[int], batch_size: int,
+                      subset: Optional[str] = None, validation_split: float = 0.0,
+                      shuffle: bool = False, augmentation: bool = False,
+                      drop_remainder: bool = False, seed: Optional[int] = None,
+                      skip_batches: int = 0) -> Tuple[tf.data.Dataset, int]:
+    """
+    tf.data replacement for ``ImageDataGenerator.flow_from_directory``.
+
+    Args:
+    - directory (str): Root directory with one subdirectory per class.
+    - image_size (Sequence[int]): Target size, e.g. [224, 224, 3].
+    - batch_size (int): Batch size.
+    - subset (str or None): "training", "validation" or None.
+    - validation_split (float): Fraction of each class held out for validation.
+    - shuffle (bool): Whether to reshuffle the files every epoch.
+    - augmentation (bool): Whether to apply random augmentation.
+    - drop_remainder (bool): Whether to drop the last partial batch.
+    - seed (int or None): Seed for shuffling and augmentation.
+    - skip_batches (int): Leading batches of each pass to leave out, see ``build_dataset``.
+
+    Returns:
+    - Tuple[tf.data.Dataset, int]: The dataset and the number of samples in it.
+    """
+    filepaths, labels, class_names = list_image_files(directory)
+    indices = subset_indices(labels, subset, validation_split)
+
+    dataset = build_dataset(
+        filepaths=[filepaths[i] for i in indices],
+        labels=[labels[i] for i in indices],
+        num_classes=len(class_names),
+        image_size=image_size,
+        batch_size=batch_size,
+        shuffle=shuffle,
+        augmentation=augmentation,
+        drop_remainder=drop_remainder,
+        seed=seed,
+        skip_batches=skip_batches
+    )
+    return dataset, len(indices)
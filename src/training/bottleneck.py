@@ -0,0 +1,158 @@
+import hashlib
+from pathlib import Path
+from typing import Tuple
+
+import numpy as np
+import tensorflow as tf
+
+from src.logging import logger
+from src.preprocess import input_pipeline
+from src.utils.common import save_json, load_json
+
+
+MANIFEST_FILE = "manifest.json"
+FEATURES_FILE = "features.npy"
+LABELS_FILE = "labels.npy"
+
+
+def split_backbone_head(model: tf.keras.Model) -> Tuple[tf.keras.Model, tf.keras.Model]:
+    """
+    Split a full model into its convolutional backbone and its head.
+
+    The backbone ends at the last layer producing a feature map (rank 4
+    output, e.g. VGG16's 7x7x512 ``block5_pool``); every later layer is
+    part of the head. The head reuses the full model's layer objects, so
+    training it updates the full model's weights in place.
+
+    Args:
+    - model (tf.keras.Model): Full model built by ``BaseModel._prepare_full_model``.
+
+    Returns:
+    - Tuple[tf.keras.Model, tf.keras.Model]: Backbone and head models.
+    """
+    split = max(
+        index for index, layer in enumerate(model.layers)
+        if len(layer.output_shape) == 4
+    )
+    backbone = tf.keras.models.Model(inputs=model.input, outputs=model.layers[split].output)
+
+    head_input = tf.keras.layers.Input(shape=backbone.output_shape[1:])
+    x = head_input
+    for layer in model.layers[split + 1:]:
+        x = layer(x)
+    head = tf.keras.models.Model(inputs=head_input, outputs=x)
+
+    return backbone, head
+
+
+def weights_digest(model: tf.keras.Model) -> str:
+    """
+    Hash the weights of a model.
+    """
+    digest = hashlib.sha256()
+    for weight in model.get_weights():
+        digest.update(np.ascontiguousarray(weight).tobytes())
+    return digest.hexdigest()
+
+
+class BottleneckFeatures:
+    """
+    Class to compute and store backbone features once per image.
+
+    Attributes:
+    - root_dir (Path): Directory holding the memory-mapped features.
+    """
+
+    def __init__(self, root_dir: Path):
+        """
+        Initialize BottleneckFeatures.
+
+        Args:
+        - root_dir (Path): Directory holding the memory-mapped features.
+        """
+        self.root_dir = Path(root_dir)
+
+    def is_current(self, key: str) -> bool:
+        """
+        Check whether the stored features were computed for the given key.
+        """
+        manifest_path = self.root_dir / MANIFEST_FILE
+        if not manifest_path.exists():
+            return False
+        return load_json(manifest_path).key == key
+
+    def extract(self, backbone: tf.keras.Model, images: tf.data.Dataset, num_samples: int, key: str):
+        """
+        Run the backbone over every image and write the features to disk.
+
+        Args:
+        - backbone (tf.keras.Model): Frozen backbone.
+        - images (tf.data.Dataset): Unshuffled, unaugmented (images, one-hot labels) batches.
+        - num_samples (int): Number of images in the dataset.
+        - key (str): Key identifying the backbone weights and the dataset.
+        """
+        self.root_dir.mkdir(parents=True, exist_ok=True)
+        manifest_path = self.root_dir / MANIFEST_FILE
+        if manifest_path.exists():
+            manifest_path.unlink()
+
+        features = np.lib.format.open_memmap(
+            self.root_dir / FEATURES_FILE,
+            mode="w+",
+            dtype=np.float32,
+            shape=(num_samples, *backbone.output_shape[1:])
+        )
+        labels = np.empty(num_samples, dtype=np.int32)
+
+        position = 0
+        for x, y in images:
+            batch_features = backbone.predict_on_batch(x)
+            features[position:position + len(batch_features)] = batch_features
+            labels[position:position + len(batch_features)] = np.argmax(y, axis=-1)
+            position += len(batch_features)
+
+        features.flush()
+        del features
+        np.save(self.root_dir / LABELS_FILE, labels)
+        save_json(path=manifest_path, data={"key": key, "samples": num_samples})
+        logger.info(f"Stored bottleneck features of {num_samples} images at {self.root_dir}")
+
+    def dataset(self, subset: str, validation_split: float, num_classes: int, batch_size: int,
+                shuffle: bool = False, drop_remainder: bool = False,
+                seed: int = None) -> Tuple[tf.data.Dataset, int]:
+        """
+        Build a dataset of (features, one-hot labels) from the stored features.
+
+        Args:
+        - subset (str): "training" or "validation".
+        - validation_split (float): Fraction of each class held out for validation.
+        - num_classes (int): Number of classes for one-hot encoding.
+        - batch_size (int): Batch size.
+        - shuffle (bool): Whether to reshuffle the samples every epoch.
+        - drop_remainder (bool): Whether to drop the last partial batch.
+        - seed (int or None): Seed for shuffling.
+
+        Returns:
+        - Tuple[tf.data.Dataset, int]: The dataset and the number of samples in it.
+        """
+        features = np.load(self.root_dir / FEATURES_FILE, mmap_mode="r")
+        labels = np.load(self.root_dir / LABELS_FILE)
+        indices = np.asarray(input_pipeline.subset_indices(labels, subset, validation_split), dtype=np.int64)
+        rng = np.random.default_rng(seed)
+
+        def batches():
+            order = rng.permutation(indices) if shuffle else indices
+            stop = len(order) - len(order) % batch_size if drop_remainder else len(order)
+            for start in range(0, stop, batch_size):
+                batch = order[start:start + batch_size]
+                yield features[batch], labels[batch]
+
+        dataset = tf.data.Dataset.from_generator(
+            batches,
+            output_signature=(
+                tf.TensorSpec(shape=(None, *features.shape[1:]), dtype=tf.float32),
+                tf.TensorSpec(shape=(None,), dtype=tf.int32)
+            )
+        )
+        dataset = dataset.map(lambda x, y: (x, tf.one_hot(y, num_classes)))
+        return dataset.prefetch(input_pipeline.AUTOTUNE), len(indices)
@@ -0,0 +1,116 @@
+import time
+from typing import Iterable, List
+
+import numpy as np
+import tensorflow as tf
+
+from src.utils.profiling import annotate, active_profiler
+
+
+def _summary(seconds: List[float]) -> dict:
+    if not seconds:
+        return {"count": 0}
+    values = np.asarray(seconds) * 1000
+    return {
+        "count": len(values),
+        "total_seconds": float(values.sum() / 1000),
+        "mean_ms": float(values.mean()),
+        "p50_ms": float(np.percentile(values, 50)),
+        "p99_ms": float(np.percentile(values, 99))
+    }
+
+
+class TimingCallback(tf.keras.callbacks.Callback):
+    """
+    Keras callback recording per-epoch and per-step wall time.
+
+    Keras fetches each batch inside the train/test function, so step times
+    include waiting for input. When the running stage is traced, batches
+    passed through ``inputs`` record how long each fetch blocked, and that
+    wait is reported separately. On ``on_train_end``/``on_test_end`` the
+    summary is attached to the running stage's profile.
+
+    Attributes:
+    - name (str): Key of the summary in the stage profile.
+    - epoch_seconds (List[float]): Wall time of each epoch.
+    - step_seconds (List[float]): Wall time of each training step, input wait included.
+    - test_step_seconds (List[float]): Wall time of each evaluation step, input wait included.
+    - input_wait_seconds (List[float]): Time each timed batch fetch blocked.
+    """
+
+    def __init__(self, name: str = "keras_timing"):
+        super().__init__()
+        self.name = name
+        self.epoch_seconds = []
+        self.step_seconds = []
+        self.test_step_seconds = []
+        self.input_wait_seconds = []
+
+    def inputs(self, batches):
+        """
+        Return the batches to feed Keras, timed if the running stage is traced.
+
+        Timed batches reach Keras through a Python generator, which adds a
+        host round trip per batch, so plain runs get ``batches`` unchanged.
+        tf.data datasets are repeated, so callers must pass step counts
+        whenever this returns something other than ``batches``.
+        """
+        profiler = active_profiler()
+        if profiler is None or profiler.trace_dir is None:
+            return batches
+        if isinstance(batches, tf.data.Dataset):
+            batches = batches.repeat()
+        return self.timed(batches)
+
+    def timed(self, batches: Iterable) -> Iterable:
+        """
+        Wrap batches so that the time spent waiting for each one is recorded.
+        """
+        iterator = iter(batches)
+        while True:
+            start = time.perf_counter()
+            try:
+                batch = next(iterator)
+            except StopIteration:
+                return
+            self.input_wait_seconds.append(time.perf_counter() - start)
+            yield batch
+
+    def on_epoch_begin(self, epoch, logs=None):
+        self._epoch_start = time.perf_counter()
+
+    def on_epoch_end(self, epoch, logs=None):
+        self.epoch_seconds.append(time.perf_counter() - self._epoch_start)
+
+    def on_train_batch_begin(self, batch, logs=None):
+        self._step_start = time.perf_counter()
+
+    def on_train_batch_end(self, batch, logs=None):
+        self.step_seconds.append(time.perf_counter() - self._step_start)
+
+    def on_test_batch_begin(self, batch, logs=None):
+        self._step_start = time.perf_counter()
+
+    def on_test_batch_end(self, batch, logs=None):
+        self.test_step_seconds.append(time.perf_counter() - self._step_start)
+
+    def summary(self) -> dict:
+        """
+        Summarize the recorded timings.
+        """
+        # Only the main loop's batches are timed: training steps in fit, test steps in evaluate.
+        step_total = sum(self.step_seconds or self.test_step_seconds)
+        wait_total = sum(self.input_wait_seconds)
+        return {
+            "epochs": _summary(self.epoch_seconds),
+            "train_steps": _summary(self.step_seconds),
+            "test_steps": _summary(self.test_step_seconds),
+            "input_wait": _summary(self.input_wait_seconds),
+            "input_wait_fraction": wait_total / step_total if self.input_wait_seconds and step_total else None
+        }
+
+    def on_train_end(self, logs=None):
+        annotate(self.name, self.summary())
+
+    def on_test_end(self, logs=None):
+        annotate(self.name, self.summary())
@@ -0,0 +1,195 @@
+import os
+import glob
+import json
+import random
+import hashlib
+import dataclasses
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import tensorflow as tf
+
+from src.logging import logger
+
+
+INDEX_FILE = "checkpoints.json"
+
+
+def run_key(config) -> str:
+    """
+    Fingerprint the settings a checkpoint is only valid for.
+
+    Covers the training config and the base model file, except the number of
+    epochs, so a finished run can be resumed with more epochs, and the
+    checkpointing policy, which does not change what is trained.
+    """
+    settings = dataclasses.asdict(config)
+    for name in ("params_epochs", "params_checkpoint_every_steps", "params_checkpoint_max_size_mb",
+                 "params_use_best_checkpoint"):
+        settings.pop(name, None)
+    base_model = Path(config.updated_base_model_path)
+    if base_model.exists():
+        stat = base_model.stat()
+        settings["base_model"] = f"{stat.st_size}:{stat.st_mtime_ns}"
+    return hashlib.sha256(json.dumps(settings, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _files(prefix: str) -> List[str]:
+    return glob.glob(prefix + ".index") + glob.glob(prefix + ".data-*")
+
+
+class TrainingCheckpoints:
+    """
+    Class to keep rotating checkpoints of a training run.
+
+    A checkpoint holds the model weights, the optimizer state, the position
+    in the run (the epoch and the number of batches of that epoch already
+    trained on) and the run's shuffling seed. ``checkpoints.json`` lists the complete checkpoints,
+    oldest first; a checkpoint is added only once fully written, so one cut
+    short by pre-emption is never resumed from. Old checkpoints are deleted
+    once the total size exceeds the budget, always keeping the latest one and
+    the one with the lowest validation loss.
+
+    Attributes:
+    - directory (Path): Directory holding the checkpoints.
+    - model (tf.keras.Model): Model being trained.
+    - max_size_bytes (int): Size budget for all checkpoints together.
+    - key (str): Fingerprint of the run, see ``run_key``.
+    - seed (tf.Variable): Seed the run's epochs are shuffled with; restored with a checkpoint.
+    """
+
+    def __init__(self, directory: Path, model: tf.keras.Model, max_size_mb: float, key: str,
+                 seed: Optional[int] = None):
+        self.directory = Path(directory)
+        self.model = model
+        self.max_size_bytes = int(max_size_mb * 2 ** 20)
+        self.key = key
+        self.epoch = tf.Variable(0, dtype=tf.int64, trainable=False)
+        self.step = tf.Variable(0, dtype=tf.int64, trainable=False)
+        self.seed = tf.Variable(random.randrange(2 ** 31) if seed is None else seed, dtype=tf.int64, trainable=False)
+        self.checkpoint = tf.train.Checkpoint(
+            model=model, optimizer=model.optimizer, epoch=self.epoch, step=self.step, seed=self.seed
+        )
+        os.makedirs(self.directory, exist_ok=True)
+        self.entries = self._load_index()
+
+    def _load_index(self) -> List[dict]:
+        index_file = self.directory / INDEX_FILE
+        if not index_file.exists():
+            return []
+        with open(index_file) as f:
+            index = json.load(f)
+        if index.get("key") != self.key:
+            logger.info(f"Training settings changed; discarding checkpoints in {self.directory}")
+            for entry in index.get("checkpoints", []):
+                for path in _files(entry["prefix"]):
+                    os.remove(path)
+            return []
+        return index["checkpoints"]
+
+    def _save_index(self):
+        tmp = self.directory / (INDEX_FILE + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump({"key": self.key, "checkpoints": self.entries}, f, indent=4)
+        os.replace(tmp, self.directory / INDEX_FILE)
+
+    def save(self, epoch: int, step: int, val_loss: Optional[float] = None):
+        """
+        Write a checkpoint at ``step`` batches into ``epoch`` and rotate old ones out.
+        """
+        self.epoch.assign(epoch)
+        self.step.assign(step)
+        prefix = self.checkpoint.write(str(self.directory / f"ckpt-{epoch:04d}-{step:06d}"))
+        size = sum(os.path.getsize(path) for path in _files(prefix))
+        self.entries = [entry for entry in self.entries if entry["prefix"] != prefix]
+        self.entries.append({"prefix": prefix, "epoch": epoch, "step": step, "val_loss": val_loss, "size": size})
+        self._rotate()
+        self._save_index()
+
+    def best(self) -> Optional[dict]:
+        """
+        Return the entry with the lowest validation loss, if any has one.
+        """
+        scored = [entry for entry in self.entries if entry["val_loss"] is not None]
+        return min(scored, key=lambda entry: entry["val_loss"], default=None)
+
+    def _rotate(self):
+        best = self.best()
+        keep = {self.entries[-1]["prefix"], best["prefix"] if best else None}
+        total = sum(entry["size"] for entry in self.entries)
+        for entry in list(self.entries):
+            if total <= self.max_size_bytes:
+                break
+            if entry["prefix"] in keep:
+                continue
+            for path in _files(entry["prefix"]):
+                os.remove(path)
+            self.entries.remove(entry)
+            total -= entry["size"]
+
+    def _restore(self, entry: dict) -> bool:
+        try:
+            self.checkpoint.restore(entry["prefix"]).expect_partial()
+            return True
+        except (tf.errors.OpError, ValueError, AssertionError) as e:
+            logger.warning(f"Could not restore checkpoint {entry['prefix']}: {e}")
+            return False
+
+    def restore_latest(self) -> Tuple[int, int]:
+        """
+        Restore the newest checkpoint that loads cleanly.
+
+        Returns:
+        - Tuple[int, int]: Epoch and batches into that epoch to resume from; (0, 0) if there is none.
+        """
+        for entry in reversed(self.entries):
+            if self._restore(entry):
+                logger.info(f"Resuming training from {entry['prefix']} (epoch {entry['epoch']}, step {entry['step']})")
+                return entry["epoch"], entry["step"]
+        return 0, 0
+
+    def restore_best(self) -> bool:
+        """
+        Restore the checkpoint with the lowest validation loss.
+
+        Returns:
+        - bool: True if a best checkpoint was restored.
+        """
+        best = self.best()
+        if best is None or not self._restore(best):
+            return False
+        logger.info(f"Using best checkpoint {best['prefix']} (val_loss {best['val_loss']:.4f})")
+        return True
+
+
+class CheckpointCallback(tf.keras.callbacks.Callback):
+    """
+    Keras callback saving a checkpoint every ``every_n_steps`` batches and at the end of every epoch.
+
+    Attributes:
+    - checkpoints (TrainingCheckpoints): Where checkpoints are written.
+    - every_n_steps (int): Batches between mid-epoch checkpoints; 0 for end-of-epoch checkpoints only.
+    - step_offset (int): Batches of the first epoch trained before this fit call, when resuming mid-epoch.
+    """
+
+    def __init__(self, checkpoints: TrainingCheckpoints, every_n_steps: int, step_offset: int = 0):
+        super().__init__()
+        self.checkpoints = checkpoints
+        self.every_n_steps = every_n_steps
+        self.step_offset = step_offset
+
+    def on_epoch_begin(self, epoch, logs=None):
+        self._epoch = epoch
+
+    def on_train_batch_end(self, batch, logs=None):
+        if batch + 1 == self.params.get("steps"):
+            # The epoch's last batch; on_epoch_end checkpoints it as the start of the next epoch.
+            return
+        step = self.step_offset + batch + 1
+        if self.every_n_steps and step % self.every_n_steps == 0:
+            self.checkpoints.save(self._epoch, step)
+
+    def on_epoch_end(self, epoch, logs=None):
+        self.step_offset = 0
+        val_loss = (logs or {}).get("val_loss")
+        self.checkpoints.save(epoch + 1, 0, val_loss=float(val_loss) if val_loss is not None else None)
@@ -0,0 +1,246 @@
+import time
+from typing import Callable, Dict, List
+
+import numpy as np
+import tensorflow as tf
+
+from src.logging import logger
+from src.entity.config_entity import DistillationConfig
+from src.inference.metrics import StreamingMetrics
+from src.models.registry import get_model_registry
+from src.preprocess import input_pipeline, image_cache
+from src.utils.common import save_json
+
+
+EPSILON = 1e-7
+
+
+def mobilenet_v2_student(input_shape: List[int], classes: int, width: float) -> tf.keras.Model:
+    """
+    MobileNetV2 trained from scratch, returning logits.
+    """
+    inputs = tf.keras.Input(shape=input_shape)
+    # MobileNetV2 expects inputs in [-1, 1]; the pipeline yields [0, 1].
+    x = tf.keras.layers.Rescaling(2.0, offset=-1.0)(inputs)
+    backbone = tf.keras.applications.MobileNetV2(
+        input_shape=input_shape, alpha=width, include_top=False, weights=None
+    )
+    x = tf.keras.layers.GlobalAveragePooling2D()(backbone(x))
+    outputs = tf.keras.layers.Dense(classes)(x)
+    return tf.keras.Model(inputs, outputs, name="student")
+
+
+def small_cnn_student(input_shape: List[int], classes: int, width: float) -> tf.keras.Model:
+    """
+    Five depthwise-separable conv blocks with stride 2, returning logits.
+    """
+    inputs = tf.keras.Input(shape=input_shape)
+    x = tf.keras.layers.Conv2D(int(32 * width), 3, strides=2, padding="same", use_bias=False)(inputs)
+    x = tf.keras.layers.BatchNormalization()(x)
+    x = tf.keras.layers.ReLU()(x)
+    for filters in (64, 128, 256, 256, 512):
+        x = tf.keras.layers.SeparableConv2D(int(filters * width), 3, strides=2, padding="same", use_bias=False)(x)
+        x = tf.keras.layers.BatchNormalization()(x)
+        x = tf.keras.layers.ReLU()(x)
+    x = tf.keras.layers.GlobalAveragePooling2D()(x)
+    outputs = tf.keras.layers.Dense(classes)(x)
+    return tf.keras.Model(inputs, outputs, name="student")
+
+
+STUDENTS: Dict[str, Callable[[List[int], int, float], tf.keras.Model]] = {
+    "mobilenet_v2": mobilenet_v2_student,
+    "small_cnn": small_cnn_student,
+}
+
+
+class Distiller(tf.keras.Model):
+    """
+    Model training a student on a frozen teacher's temperature-scaled soft targets.
+
+    The loss is ``alpha`` times the cross-entropy with the hard labels plus
+    ``1 - alpha`` times the KL divergence between the teacher's and the
+    student's softened distributions, scaled by ``temperature ** 2`` so its
+    gradients keep their magnitude as the temperature changes.
+
+    Attributes:
+    - student (tf.keras.Model): Student returning logits.
+    - teacher (tf.keras.Model): Teacher returning probabilities.
+    - temperature (float): Softmax temperature of the soft targets.
+    - alpha (float): Weight of the hard-label loss.
+    """
+
+    def __init__(self, student: tf.keras.Model, teacher: tf.keras.Model, temperature: float, alpha: float):
+        super().__init__()
+        self.student = student
+        self.teacher = teacher
+        self.temperature = temperature
+        self.alpha = alpha
+        self.loss_tracker = tf.keras.metrics.Mean(name="loss")
+        self.accuracy = tf.keras.metrics.CategoricalAccuracy(name="accuracy")
+
+    @property
+    def metrics(self):
+        return [self.loss_tracker, self.accuracy]
+
+    def call(self, inputs, training=False):
+        return self.student(inputs, training=training)
+
+    def train_step(self, data):
+        images, labels = data
+        # The teacher outputs probabilities; re-softening them is softmax(log p / T).
+        teacher_probabilities = self.teacher(images, training=False)
+        soft_targets = tf.nn.softmax(tf.math.log(teacher_probabilities + EPSILON) / self.temperature)
+
+        with tf.GradientTape() as tape:
+            logits = self.student(images, training=True)
+            hard_loss = tf.keras.losses.categorical_crossentropy(labels, logits, from_logits=True)
+            soft_loss = tf.keras.losses.kl_divergence(
+                soft_targets, tf.nn.softmax(logits / self.temperature)
+            ) * self.temperature ** 2
+            loss = tf.reduce_mean(self.alpha * hard_loss + (1 - self.alpha) * soft_loss)
+
+        gradients = tape.gradient(loss, self.student.trainable_variables)
+        self.optimizer.apply_gradients(zip(gradients, self.student.trainable_variables))
+
+        self.loss_tracker.update_state(loss)
+        self.accuracy.update_state(labels, logits)
+        return {metric.name: metric.result() for metric in self.metrics}
+
+    def test_step(self, data):
+        images, labels = data
+        logits = self.student(images, training=False)
+        loss = tf.keras.losses.categorical_crossentropy(labels, logits, from_logits=True)
+        self.loss_tracker.update_state(tf.reduce_mean(loss))
+        self.accuracy.update_state(labels, logits)
+        return {metric.name: metric.result() for metric in self.metrics}
+
+
+class Distillation:
+    """
+    Class to distill the trained model into a small, CPU-fast student.
+
+    Attributes:
+    - config (DistillationConfig): Configuration for distillation.
+    """
+
+    def __init__(self, config: DistillationConfig):
+        """
+        Initialize Distillation.
+
+        Args:
+        - config (DistillationConfig): Configuration for distillation.
+        """
+        self.config = config
+
+    def _datasets(self):
+        """
+        Build the training and validation datasets with the training split.
+
+        The "generator" input pipeline is served by the equivalent tf.data pipeline.
+        """
+        dataset_kwargs = dict(
+            image_size=self.config.params_image_size,
+            batch_size=self.config.params_batch_size,
+            validation_split=0.20
+        )
+        if self.config.params_input_pipeline == "cache":
+            make_dataset = image_cache.cached_dataset
+            dataset_kwargs["cache_dir"] = self.config.image_cache_dir
+        else:
+            make_dataset = input_pipeline.directory_dataset
+            dataset_kwargs["directory"] = str(self.config.training_data)
+
+        self.valid_dataset, self.valid_samples = make_dataset(subset="validation", shuffle=False, **dataset_kwargs)
+        self.train_dataset, self.train_samples = make_dataset(
+            subset="training",
+            shuffle=True,
+            augmentation=self.config.params_is_augmentation,
+            drop_remainder=True,
+            **dataset_kwargs
+        )
+
+    def build_student(self) -> tf.keras.Model:
+        """
+        Build the configured student architecture, returning logits.
+        """
+        if self.config.params_student not in STUDENTS:
+            raise ValueError(f"Unknown student: {self.config.params_student}; expected one of {sorted(STUDENTS)}")
+        return STUDENTS[self.config.params_student](
+            list(self.config.params_image_size), self.teacher.output_shape[-1], self.config.params_student_width
+        )
+
+    def distill(self):
+        """
+        Train the student on the teacher's soft targets and save it with a softmax output.
+        """
+        self.teacher = get_model_registry().get(self.config.trained_model_path)
+        self._datasets()
+        student = self.build_student()
+
+        distiller = Distiller(
+            student, self.teacher,
+            temperature=self.config.params_temperature,
+            alpha=self.config.params_alpha
+        )
+        distiller.compile(optimizer=tf.keras.optimizers.Adam(learning_rate=self.config.params_learning_rate))
+        distiller.fit(
+            self.train_dataset,
+            epochs=self.config.params_epochs,
+            steps_per_epoch=self.train_samples // self.config.params_batch_size,
+            validation_data=self.valid_dataset
+        )
+
+        # Serve probabilities, like the teacher, so the student is a drop-in replacement.
+        self.student = tf.keras.Model(student.input, tf.keras.layers.Softmax()(student.output))
+        self.student.compile(loss=tf.keras.losses.CategoricalCrossentropy(), metrics=["accuracy"])
+        self.student.save(self.config.student_model_path)
+
+    def _accuracies(self) -> Dict[str, dict]:
+        """
+        Score teacher and student in one pass over the validation set.
+        """
+        class_names = [str(c) for c in range(self.teacher.output_shape[-1])]
+        metrics = {"teacher": StreamingMetrics(class_names), "student": StreamingMetrics(class_names)}
+        for images, labels in self.valid_dataset:
+            metrics["teacher"].update(labels.numpy(), np.asarray(self.teacher.predict_on_batch(images)))
+            metrics["student"].update(labels.numpy(), np.asarray(self.student.predict_on_batch(images)))
+        return {name: metric.result() for name, metric in metrics.items()}
+
+    def _cpu_latency_ms(self, model: tf.keras.Model) -> float:
+        """
+        Median batch-1 CPU latency of a model, in milliseconds.
+        """
+        images, _ = next(iter(self.valid_dataset.unbatch().batch(1)))
+        with tf.device("/CPU:0"):
+            model.predict_on_batch(images)
+            latencies = []
+            for _ in range(self.config.params_latency_samples):
+                start = time.perf_counter()
+                model.predict_on_batch(images)
+                latencies.append(time.perf_counter() - start)
+        return float(np.median(latencies) * 1000)
+
+    def report(self) -> dict:
+        """
+        Compare teacher and student accuracy, size and CPU latency, and save the report.
+        """
+        scores = self._accuracies()
+        report = {}
+        for name, model in (("teacher", self.teacher), ("student", self.student)):
+            report[name] = {
+                "accuracy": scores[name]["accuracy"],
+                "loss": scores[name]["loss"],
+                "parameters": int(model.count_params()),
+                "cpu_latency_ms": self._cpu_latency_ms(model)
+            }
+        report["student"]["architecture"] = self.config.params_student
+        report["speedup"] = report["teacher"]["cpu_latency_ms"] / report["student"]["cpu_latency_ms"]
+        report["accuracy_drop"] = report["teacher"]["accuracy"] - report["student"]["accuracy"]
+
+        save_json(path=self.config.report_file, data=report)
+        logger.info(
+            f"Student {self.config.params_student}: accuracy {report['student']['accuracy']:.4f} "
+            f"(teacher {report['teacher']['accuracy']:.4f}), {report['student']['parameters']} parameters, "
+            f"{report['speedup']:.1f}x faster on CPU"
+        )
+        return report
@@ -3,7 +3,14 @@ import urllib.request as request
 from zipfile import ZipFile
 import tensorflow as tf
 from pathlib import Path
+from typing import Optional
 from src.entity.config_entity import TrainingConfig
+from src.logging import logger
+from src.preprocess import input_pipeline, image_cache
+from src.training.callbacks import TimingCallback
+from src.training.checkpointing import TrainingCheckpoints, CheckpointCallback, run_key
+from src.training.bottleneck import BottleneckFeatures, split_backbone_head, weights_digest
+from src.utils.artifacts import ArtifactContext
 
 class Training:
     """
@@ -11,29 +18,45 @@ class Training:
 
     Attributes:
     - config (TrainingConfig): Configuration for training.
+    - context (ArtifactContext or None): Hands models between stages of the same process.
     """
 
-    def __init__(self, config: TrainingConfig):
+    def __init__(self, config: TrainingConfig, context: Optional[ArtifactContext] = None):
         """
         Initialize Training.
 
         Args:
         - config (TrainingConfig): Configuration for training.
+        - context (ArtifactContext or None): Hands models between stages of the same process.
         """
         self.config = config
+        self.context = context
 
     def get_base_model(self):
         """
-        Load the base model.
+        Load the base model, or take it over in memory from an earlier stage of this process.
         """
-        self.model = tf.keras.models.load_model(
-            self.config.updated_base_model_path
-        )
+        if self.context is not None:
+            self.model = self.context.load_model(self.config.updated_base_model_path)
+        else:
+            self.model = tf.keras.models.load_model(
+                self.config.updated_base_model_path
+            )
 
     def train_valid_generator(self):
         """
         Create data generators for training and validation.
+
+        Uses the tf.data input pipeline when ``params_input_pipeline`` is
+        "tf_data" or "cache", and ImageDataGenerator otherwise.
         """
+        if self.config.params_input_pipeline not in input_pipeline.INPUT_PIPELINES:
+            raise ValueError(f"Unknown input pipeline: {self.config.params_input_pipeline}")
+
+        if self.config.params_input_pipeline != "generator":
+            self._train_valid_dataset()
+            return
+
         datagenerator_kwargs = dict(
             rescale = 1./255,
             validation_split=0.20
@@ -73,9 +96,60 @@ class Training:
             directory=self.config.training_data,
             subset="training",
             shuffle=True,
+            seed=self.config.params_augmentation_seed,
             **dataflow_kwargs
         )
 
+        self.train_samples = self.train_generator.samples
+        self.valid_samples = self.valid_generator.samples
+
+    def _train_valid_dataset(self):
+        """
+        Create tf.data datasets for training and validation.
+
+        Images come from the image cache when ``params_input_pipeline`` is
+        "cache" and are decoded from the dataset directory otherwise. Partial
+        batches are dropped so the datasets hold exactly the
+        ``samples // batch_size`` steps that ``train`` runs per epoch.
+        """
+        dataset_kwargs = dict(
+            image_size=self.config.params_image_size,
+            batch_size=self.config.params_batch_size,
+            validation_split=0.20,
+            drop_remainder=True
+        )
+
+        if self.config.params_input_pipeline == "cache":
+            make_dataset = image_cache.cached_dataset
+            dataset_kwargs["cache_dir"] = self.config.image_cache_dir
+        else:
+            make_dataset = input_pipeline.directory_dataset
+            dataset_kwargs["directory"] = str(self.config.training_data)
+
+        self._make_dataset, self._dataset_kwargs = make_dataset, dataset_kwargs
+        self.valid_generator, self.valid_samples = make_dataset(
+            subset="validation",
+            shuffle=False,
+            **dataset_kwargs
+        )
+
+        self.train_generator, self.train_samples = make_dataset(
+            subset="training",
+            shuffle=True,
+            augmentation=self.config.params_is_augmentation,
+            seed=self.config.params_augmentation_seed,
+            **dataset_kwargs
+        )
+
+    def _hand_over(self):
+        """
+        Save the trained model, in the background and handing it over in memory when running with a context.
+        """
+        if self.context is not None:
+            self.context.put(self.config.trained_model_path, self.model)
+        else:
+            self.save_model(path=self.config.trained_model_path, model=self.model)
+
     @staticmethod
     def save_model(path: Path, model: tf.keras.Model):
         """
@@ -89,20 +163,171 @@ class Training:
 
     def train(self):
         """
-        Train the model.
+        Train the model, resuming from the latest checkpoint if there is one.
+
+        Weights, optimizer state and the position in the run are checkpointed
+        every ``params_checkpoint_every_steps`` batches and after every epoch.
+        With the tf.data pipelines every epoch is a separate ``fit`` over a
+        dataset shuffled with a seed derived from the epoch and the run's
+        seed, which is kept in the checkpoints; after a restart the
+        interrupted epoch replays the same order, skipping the files of the
+        batches it had already trained on before decoding them. Only the
+        augmentation transforms of its remaining batches are drawn afresh.
+        ImageDataGenerator iterators cannot skip, so with them the interrupted
+        epoch restarts from its first batch and runs only the remaining
+        number of steps. With ``params_use_best_checkpoint`` the saved model
+        carries the weights with the lowest validation loss instead of the
+        last ones.
         """
-        self.steps_per_epoch = self.train_generator.samples // self.train_generator.batch_size
-        self.validation_steps = self.valid_generator.samples // self.valid_generator.batch_size
+        self.steps_per_epoch = self.train_samples // self.config.params_batch_size
+        self.validation_steps = self.valid_samples // self.config.params_batch_size
+        timing = TimingCallback()
 
-        self.model.fit(
-            self.train_generator,
-            epochs=self.config.params_epochs,
-            steps_per_epoch=self.steps_per_epoch,
+        if self.context is not None:
+            # The checkpoints' run key covers the base model file, which may still be being saved.
+            self.context.wait(self.config.updated_base_model_path)
+        checkpoints = TrainingCheckpoints(
+            self.config.checkpoint_dir,
+            self.model,
+            max_size_mb=self.config.params_checkpoint_max_size_mb,
+            key=run_key(self.config),
+            seed=self.config.params_augmentation_seed
+        )
+        epoch, step = checkpoints.restore_latest()
+        if step >= self.steps_per_epoch:
+            # Saved after the epoch's last batch but before its end-of-epoch checkpoint.
+            epoch, step = epoch + 1, 0
+        checkpointing = CheckpointCallback(checkpoints, self.config.params_checkpoint_every_steps, step_offset=step)
+
+        fit_kwargs = dict(
             validation_steps=self.validation_steps,
-            validation_data=self.valid_generator
+            validation_data=self.valid_generator,
+            callbacks=[timing, checkpointing]
         )
 
-        self.save_model(
-            path=self.config.trained_model_path,
-            model=self.model
+        if isinstance(self.train_generator, tf.data.Dataset):
+            seed = int(checkpoints.seed.numpy())
+            for current in range(epoch, self.config.params_epochs):
+                skip = step if current == epoch else 0
+                self.model.fit(
+                    timing.inputs(self._train_dataset(seed=seed + current, skip_batches=skip)),
+                    initial_epoch=current,
+                    epochs=current + 1,
+                    steps_per_epoch=self.steps_per_epoch - skip,
+                    **fit_kwargs
+                )
+        else:
+            if step and epoch < self.config.params_epochs:
+                logger.info(f"Cannot skip {step} batches of the generator pipeline; resuming at the start of the epoch")
+                self.model.fit(
+                    timing.inputs(self.train_generator),
+                    initial_epoch=epoch,
+                    epochs=epoch + 1,
+                    steps_per_epoch=self.steps_per_epoch - step,
+                    **fit_kwargs
+                )
+                epoch += 1
+
+            if epoch < self.config.params_epochs:
+                self.model.fit(
+                    timing.inputs(self.train_generator),
+                    initial_epoch=epoch,
+                    epochs=self.config.params_epochs,
+                    steps_per_epoch=self.steps_per_epoch,
+                    **fit_kwargs
+                )
+
+        if self.config.params_use_best_checkpoint:
+            checkpoints.restore_best()
+
+        self._hand_over()
+
+    def _train_dataset(self, seed: int, skip_batches: int = 0) -> tf.data.Dataset:
+        """
+        Build the training dataset of one epoch, shuffled and augmented with ``seed``.
+        """
+        dataset, _ = self._make_dataset(
+            subset="training",
+            shuffle=True,
+            augmentation=self.config.params_is_augmentation,
+            seed=seed,
+            skip_batches=skip_batches,
+            **self._dataset_kwargs
+        )
+        return dataset
+
+    def _all_images(self):
+        """
+        Build an unshuffled, unaugmented dataset over every image and its key.
+
+        Returns:
+        - Tuple[tf.data.Dataset, int, str]: Dataset, number of samples and dataset key.
+        """
+        dataset_kwargs = dict(
+            image_size=self.config.params_image_size,
+            batch_size=self.config.params_batch_size
+        )
+
+        if self.config.params_input_pipeline == "cache":
+            data_key = image_cache.CachedImages(self.config.image_cache_dir).key
+            dataset, samples = image_cache.cached_dataset(cache_dir=self.config.image_cache_dir, **dataset_kwargs)
+        else:
+            directory = str(self.config.training_data)
+            filepaths, _, _ = input_pipeline.list_image_files(directory)
+            data_key = image_cache.cache_key(
+                image_cache.read_files(directory, filepaths),
+                self.config.params_image_size
+            )
+            dataset, samples = input_pipeline.directory_dataset(directory=directory, **dataset_kwargs)
+
+        return dataset, samples, data_key
+
+    def train_bottleneck(self):
+        """
+        Train only the head of the model on cached backbone features.
+
+        The frozen backbone runs once per image and its features are stored
+        memory-mapped under ``bottleneck_dir``; they are reused for as long
+        as the backbone weights and the dataset are unchanged. The head
+        shares its layers with the full model, so the full model saved at
+        the end carries the trained head.
+
+        This mode is not checkpointed: the features already survive a
+        restart, and an interrupted run only retrains the small head.
+        """
+        backbone, head = split_backbone_head(self.model)
+        features = BottleneckFeatures(self.config.bottleneck_dir)
+
+        images, samples, data_key = self._all_images()
+        key = weights_digest(backbone) + data_key
+        if features.is_current(key):
+            logger.info(f"Reusing bottleneck features at {self.config.bottleneck_dir}")
+        else:
+            features.extract(backbone, images, samples, key)
+
+        dataset_kwargs = dict(
+            validation_split=0.20,
+            num_classes=self.model.output_shape[-1],
+            batch_size=self.config.params_batch_size,
+            drop_remainder=True
+        )
+        self.valid_generator, self.valid_samples = features.dataset(subset="validation", **dataset_kwargs)
+        self.train_generator, self.train_samples = features.dataset(subset="training", shuffle=True, **dataset_kwargs)
+
+        head.compile(
+            optimizer=self.model.optimizer.__class__.from_config(self.model.optimizer.get_config()),
+            loss=self.model.loss,
+            metrics=["accuracy"]
         )
+
+        timing = TimingCallback()
+        head.fit(
+            timing.inputs(self.train_generator),
+            epochs=self.config.params_epochs,
+            steps_per_epoch=self.train_samples // self.config.params_batch_size,
+            validation_steps=self.valid_samples // self.config.params_batch_size,
+            validation_data=self.valid_generator,
+            callbacks=[timing]
+        )
+
+        self._hand_over()
@@ -0,0 +1,136 @@
+import os
+import time
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+import tensorflow as tf
+
+from src.logging import logger
+
+
+def snapshot_model(model: tf.keras.Model) -> tf.keras.Model:
+    """
+    Copy a model's architecture, weights and compile settings into an independent model.
+    """
+    copy = tf.keras.models.clone_model(model)
+    copy.set_weights(model.get_weights())
+    if getattr(model, "optimizer", None) is not None:
+        copy.compile(
+            optimizer=model.optimizer.__class__.from_config(model.optimizer.get_config()),
+            loss=model.loss,
+            metrics=["accuracy"]
+        )
+    return copy
+
+
+class ArtifactContext:
+    """
+    Hands live models from one stage to the next when stages share a process.
+
+    A producing stage ``put``s a model under the path it would save it to;
+    the model is saved there on a background thread, so standalone runs of
+    later stages still find the file, while later stages of the same run
+    ``load_model`` the live object without reading the file back. When the
+    next stage modifies the model in place (training the prepared base
+    model), ``put`` saves a snapshot instead, so the file holds the model as
+    it was handed over. Files are written under a temporary name and moved
+    into place, so a reader never sees a partially written model.
+
+    Attributes:
+    - models (Dict[str, tf.keras.Model]): Live models by resolved path.
+    """
+
+    def __init__(self):
+        """
+        Initialize ArtifactContext.
+        """
+        self.models: Dict[str, tf.keras.Model] = {}
+        self._saves: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="artifact-save")
+
+    @staticmethod
+    def _key(path: Path) -> str:
+        return str(Path(path).resolve())
+
+    @staticmethod
+    def _save(path: Path, model: tf.keras.Model):
+        start = time.perf_counter()
+        os.makedirs(path.parent, exist_ok=True)
+        # Keep the suffix: Keras picks the file format from it.
+        tmp = path.with_name(f"{path.stem}.saving{path.suffix}")
+        model.save(tmp)
+        os.replace(tmp, path)
+        logger.info(f"Saved {path} in the background in {time.perf_counter() - start:.1f}s")
+
+    def put(self, path: Path, model: tf.keras.Model, mutable: bool = False):
+        """
+        Hand a model to later stages and save it to ``path`` in the background.
+
+        Args:
+        - path (Path): Path the model is saved to.
+        - model (tf.keras.Model): Model to hand over.
+        - mutable (bool): Whether a later stage modifies the model in place;
+          if so, a snapshot taken now is saved instead of the live model.
+        """
+        key = self._key(path)
+        self.wait(path)
+        to_save = snapshot_model(model) if mutable else model
+        with self._lock:
+            self.models[key] = model
+            self._saves[key] = self._executor.submit(self._save, Path(path), to_save)
+
+    def get(self, path: Path) -> Optional[tf.keras.Model]:
+        """
+        Return the live model handed over for ``path``, or None.
+        """
+        with self._lock:
+            return self.models.get(self._key(path))
+
+    def load_model(self, path: Path, loader: Callable[[Path], tf.keras.Model] = tf.keras.models.load_model):
+        """
+        Return the live model for ``path``, or load the file with ``loader`` if none was handed over.
+        """
+        model = self.get(path)
+        if model is not None:
+            logger.info(f"Using in-memory model for {path}")
+            return model
+        return loader(path)
+
+    def wait(self, path: Optional[Path] = None):
+        """
+        Wait for the background save of ``path``, or of every model if None.
+
+        Raises:
+        - Exception: The error of a failed save.
+        """
+        with self._lock:
+            if path is None:
+                futures = list(self._saves.values())
+            else:
+                futures = [self._saves[self._key(path)]] if self._key(path) in self._saves else []
+        for future in futures:
+            future.result()
+
+    def after_saves(self, fn: Callable[[], None]) -> Future:
+        """
+        Run ``fn`` on the save thread once every save queued so far has finished.
+
+        Returns:
+        - Future: Completes with ``fn``'s result or error.
+        """
+        return self._executor.submit(fn)
+
+    def close(self):
+        """
+        Wait for every pending save and release the live models.
+        """
+        try:
+            self.wait()
+        finally:
+            self._executor.shutdown(wait=True)
+            with self._lock:
+                self.models.clear()
+                self._saves.clear()
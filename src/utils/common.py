@@ -1,7 +1,6 @@
 import os
 import yaml
 import json
-import joblib
 import base64
 from box import ConfigBox
 from pathlib import Path
@@ -81,6 +80,8 @@ def save_bin(data: Any, path: Path):
         data (Any): Data to be saved as binary.
         path (Path): Path to save the binary file.
     """
+    import joblib  # imported on use to keep CLI startup light
+
     joblib.dump(value=data, filename=path)
     logger.info(f"Binary file saved at: {path}")
 
@@ -94,6 +95,8 @@ def load_bin(path: Path) -> Any:
     Returns:
         Any: Loaded object from the binary file.
     """
+    import joblib
+
     data = joblib.load(path)
     logger.info(f"Binary file loaded from: {path}")
     return data
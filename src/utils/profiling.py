@@ -0,0 +1,121 @@
+import os
+import time
+import resource
+import platform
+from pathlib import Path
+from typing import Any, Optional
+
+from src.logging import logger
+
+
+_active = None
+
+
+def _io_counters() -> dict:
+    """
+    Read the bytes this process has read and written, from /proc/self/io.
+
+    ``read_bytes``/``write_bytes`` count storage I/O; ``rchar``/``wchar``
+    also count reads served from the page cache, sockets and pipes. Empty
+    where /proc is not available.
+    """
+    try:
+        with open("/proc/self/io") as f:
+            return {key: int(value) for key, value in (line.split(":") for line in f)}
+    except OSError:
+        return {}
+
+
+def _cpu_seconds() -> float:
+    times = os.times()
+    return times.user + times.system + times.children_user + times.children_system
+
+
+def _peak_rss_bytes() -> int:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS.
+    return peak if platform.system() == "Darwin" else peak * 1024
+
+
+def active_profiler() -> Optional["StageProfiler"]:
+    """
+    Return the profiler of the stage running in this process, if any.
+    """
+    return _active
+
+
+def annotate(name: str, data: Any):
+    """
+    Attach extra data, e.g. Keras step timings, to the running stage's profile.
+
+    Does nothing when no stage is being profiled.
+    """
+    if _active is not None:
+        _active.annotations[name] = data
+
+
+class StageProfiler:
+    """
+    Context manager recording the resources a pipeline stage uses.
+
+    Records wall time, CPU time (including child processes), peak RSS and
+    bytes read and written. Each stage runs in its own process, so peak RSS
+    is the stage's own. With a ``trace_dir`` a TensorFlow profiler trace is
+    captured for the duration of the stage.
+
+    Attributes:
+    - key (str): Key of the profiled stage.
+    - trace_dir (Path or None): Directory for the TensorFlow profiler trace.
+    - annotations (dict): Extra data attached with ``annotate``.
+    - profile (dict): The measurements, filled in on exit.
+    """
+
+    def __init__(self, key: str, trace_dir: Optional[Path] = None):
+        self.key = key
+        self.trace_dir = Path(trace_dir) if trace_dir is not None else None
+        self.annotations = {}
+        self.profile = {}
+
+    def __enter__(self) -> "StageProfiler":
+        global _active
+        _active = self
+        if self.trace_dir is not None:
+            import tensorflow as tf
+            os.makedirs(self.trace_dir, exist_ok=True)
+            tf.profiler.experimental.start(str(self.trace_dir))
+        self._io = _io_counters()
+        self._cpu = _cpu_seconds()
+        self._wall = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        global _active
+        wall = time.perf_counter() - self._wall
+        cpu = _cpu_seconds() - self._cpu
+        io = _io_counters()
+
+        if self.trace_dir is not None:
+            import tensorflow as tf
+            try:
+                tf.profiler.experimental.stop()
+            except Exception as e:
+                logger.warning(f"Could not stop the TensorFlow profiler: {e}")
+
+        self.profile = {
+            "wall_seconds": wall,
+            "cpu_seconds": cpu,
+            "cpu_utilization": cpu / wall if wall else 0.0,
+            "peak_rss_bytes": _peak_rss_bytes(),
+            "read_bytes": io["read_bytes"] - self._io["read_bytes"] if io else None,
+            "write_bytes": io["write_bytes"] - self._io["write_bytes"] if io else None,
+            "read_chars": io["rchar"] - self._io["rchar"] if io else None,
+            "write_chars": io["wchar"] - self._io["wchar"] if io else None,
+            "trace_dir": str(self.trace_dir) if self.trace_dir is not None else None,
+            **self.annotations
+        }
+        logger.info(
+            f"Stage {self.key}: {wall:.1f}s wall, {cpu:.1f}s CPU, "
+            f"peak RSS {self.profile['peak_rss_bytes'] / 2 ** 20:.0f} MB"
+        )
+        _active = None
+        return False
@@ -0,0 +1,379 @@
+import os
+import sys
+import json
+import time
+import uuid
+import fcntl
+import shutil
+import argparse
+import itertools
+import threading
+import subprocess
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
+
+from src.logging import logger
+from src.entity.config_entity import MLflowLoggerConfig
+
+
+PENDING_DIR = "pending"
+ARTIFACTS_DIR = "artifacts"
+RUNS_FILE = "runs.json"
+LOCK_FILE = ".flush.lock"
+# Tag holding a remote run's local id, so a run whose creation was not recorded is found again.
+RUN_TAG = "spool_run_id"
+
+# MLflow's log_batch limits.
+MAX_BATCH_PARAMS = 100
+MAX_BATCH_METRICS = 1000
+
+
+class SpoolingMLflowLogger:
+    """
+    Class to log to MLflow without blocking on the tracking server.
+
+    Every call writes a record to a local spool directory and returns. A
+    background thread flushes the spool to the tracking server, combining
+    consecutive params and metrics of a run into ``log_batch`` calls and
+    retrying failed flushes with exponential backoff. Records stay on disk
+    until the server has accepted them, so anything left when the process
+    exits is flushed by the next logger using the same spool, or by the
+    detached flush process ``close`` starts. Runs are identified locally
+    until their creation is flushed.
+
+    Attributes:
+    - config (MLflowLoggerConfig): Configuration for the logger.
+    """
+
+    _counter = itertools.count()
+
+    def __init__(self, config: MLflowLoggerConfig):
+        """
+        Initialize SpoolingMLflowLogger and start its flush thread.
+
+        Args:
+        - config (MLflowLoggerConfig): Configuration for the logger.
+        """
+        self.config = config
+        self.spool_dir = Path(config.spool_dir)
+        os.makedirs(self.spool_dir / PENDING_DIR, exist_ok=True)
+        os.makedirs(self.spool_dir / ARTIFACTS_DIR, exist_ok=True)
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._idle = threading.Condition()
+        self.closed = False
+        self._thread = threading.Thread(target=self._run, name="mlflow-flush", daemon=True)
+        self._thread.start()
+
+    def _spool(self, run: str, kind: str, data: dict):
+        """
+        Atomically add a record to the spool and wake the flush thread.
+        """
+        # Time first, then a process-wide counter, so records sort in the order they were made.
+        name = f"{time.time_ns():020d}-{next(self._counter):08d}-{uuid.uuid4().hex[:8]}.json"
+        record = {"run": run, "type": kind, "timestamp": int(time.time() * 1000), "data": data}
+        tmp = self.spool_dir / (name + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump(record, f)
+        os.replace(tmp, self.spool_dir / PENDING_DIR / name)
+        self._wakeup.set()
+
+    def start_run(self, run_name: Optional[str] = None) -> str:
+        """
+        Start a run.
+
+        Returns:
+        - str: Local id of the run, to pass to the other calls.
+        """
+        run = uuid.uuid4().hex
+        self._spool(run, "start", {"run_name": run_name})
+        return run
+
+    def log_params(self, run: str, params: Dict[str, Any]):
+        items = [(key, str(value)[:500]) for key, value in params.items()]
+        for start in range(0, len(items), MAX_BATCH_PARAMS):
+            self._spool(run, "params", dict(items[start:start + MAX_BATCH_PARAMS]))
+
+    def log_metrics(self, run: str, metrics: Dict[str, float], step: int = 0):
+        self._spool(run, "metrics", {"values": {key: float(value) for key, value in metrics.items()}, "step": step})
+
+    def log_artifact(self, run: str, path: Path, artifact_path: Optional[str] = None):
+        """
+        Copy a file into the spool and queue its upload.
+        """
+        target = self.spool_dir / ARTIFACTS_DIR / uuid.uuid4().hex / Path(path).name
+        os.makedirs(target.parent)
+        shutil.copy2(path, target)
+        self._spool(run, "artifact", {"path": str(target), "artifact_path": artifact_path})
+
+    def log_model(self, run: str, model, registered_model_name: Optional[str] = None):
+        """
+        Save a Keras model as an MLflow model into the spool and queue its upload under "model".
+
+        The upload is registered under ``registered_model_name`` unless the
+        store is file-based, and loads with ``mlflow.keras.load_model``.
+        """
+        import mlflow.keras
+
+        target = self.spool_dir / ARTIFACTS_DIR / uuid.uuid4().hex / "model"
+        os.makedirs(target.parent)
+        mlflow.keras.save_model(model, target)
+        self._spool(run, "model", {"path": str(target), "registered_model_name": registered_model_name})
+
+    def end_run(self, run: str, status: str = "FINISHED"):
+        self._spool(run, "end", {"status": status})
+
+    def pending(self) -> List[Path]:
+        """
+        Return the spooled records not yet accepted by the tracking server, oldest first.
+        """
+        return sorted((self.spool_dir / PENDING_DIR).glob("*.json"))
+
+    def _run(self):
+        """
+        Flush thread: flush whenever records arrive, backing off after failures.
+        """
+        failures = 0
+        while not self._stopping.is_set():
+            self._wakeup.wait(timeout=self.config.poll_seconds if not failures else
+                              min(self.config.max_backoff_seconds, 2 ** failures))
+            self._wakeup.clear()
+            if not self.pending():
+                failures = 0
+                continue
+            try:
+                flush(self.config)
+                failures = 0
+            except Exception as e:
+                failures += 1
+                if failures <= self.config.max_retries:
+                    logger.warning(f"MLflow flush failed ({e}); retry {failures} of {self.config.max_retries}")
+                else:
+                    logger.error(f"MLflow flush failed {failures} times; records stay spooled in {self.spool_dir}")
+                    failures = self.config.max_retries
+            with self._idle:
+                self._idle.notify_all()
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until the spool is flushed.
+
+        Args:
+        - timeout (float or None): Longest wait in seconds; None waits indefinitely.
+
+        Returns:
+        - bool: True if every record was flushed.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.pending():
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return False
+            self._wakeup.set()
+            with self._idle:
+                self._idle.wait(timeout=1.0 if remaining is None else min(remaining, 1.0))
+        return True
+
+    def close(self, drain_timeout: float = 0.0):
+        """
+        Stop the flush thread, first waiting up to ``drain_timeout`` seconds.
+
+        Records still spooled are handed to a detached flush process, so the
+        caller never waits on the network for longer than ``drain_timeout``.
+        """
+        flushed = self.drain(drain_timeout) if drain_timeout else not self.pending()
+        self.closed = True
+        self._stopping.set()
+        self._wakeup.set()
+        self._thread.join(timeout=1.0)
+        if not flushed and self.pending():
+            logger.info(f"Flushing {len(self.pending())} spooled MLflow records in the background")
+            subprocess.Popen(
+                [sys.executable, "-m", "src.utils.tracking", "--spool-dir", str(self.spool_dir)],
+                start_new_session=True,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL
+            )
+
+
+def _client(config: MLflowLoggerConfig):
+    from mlflow.tracking import MlflowClient
+    return MlflowClient(tracking_uri=config.tracking_uri, registry_uri=config.tracking_uri)
+
+
+def _load_runs(spool_dir: Path) -> dict:
+    if not (spool_dir / RUNS_FILE).exists():
+        return {}
+    with open(spool_dir / RUNS_FILE) as f:
+        return json.load(f)
+
+
+def _save_runs(spool_dir: Path, runs: dict):
+    tmp = spool_dir / (RUNS_FILE + ".tmp")
+    with open(tmp, "w") as f:
+        json.dump(runs, f)
+    os.replace(tmp, spool_dir / RUNS_FILE)
+
+
+def _entities(record: dict, Param, Metric) -> tuple:
+    """
+    Turn a params or metrics record into MLflow Param and Metric entities.
+    """
+    if record["type"] == "params":
+        return [Param(key, value) for key, value in record["data"].items()], []
+    step = record["data"]["step"]
+    return [], [Metric(key, value, record["timestamp"], step) for key, value in record["data"]["values"].items()]
+
+
+def _remote_run(client, config: MLflowLoggerConfig, run: str, run_name: Optional[str], start_time: int) -> str:
+    """
+    Return the id of the remote run created for the local ``run``, creating it if there is none.
+
+    Runs are tagged with their local id, so one created by a flush that
+    stopped before recording it is reused instead of duplicated.
+    """
+    existing = client.search_runs([config.experiment_id], filter_string=f"tags.{RUN_TAG} = '{run}'", max_results=1)
+    if existing:
+        return existing[0].info.run_id
+    tags = {RUN_TAG: run}
+    if run_name:
+        tags["mlflow.runName"] = run_name
+    return client.create_run(config.experiment_id, start_time=start_time, tags=tags).info.run_id
+
+
+def flush(config: MLflowLoggerConfig) -> int:
+    """
+    Send every spooled record to the tracking server, in order.
+
+    Only one process flushes a spool at a time; if another one holds the
+    lock this returns immediately. A record is deleted once the server has
+    accepted it, so a failed flush resumes where it stopped.
+
+    Returns:
+    - int: Number of records flushed.
+    """
+    from mlflow.entities import Metric, Param
+
+    spool_dir = Path(config.spool_dir)
+    with open(spool_dir / LOCK_FILE, "w") as lock:
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return 0
+
+        client = _client(config)
+        runs = _load_runs(spool_dir)
+        files = sorted((spool_dir / PENDING_DIR).glob("*.json"))
+        records = []
+        for file in files:
+            with open(file) as f:
+                records.append((file, json.load(f)))
+
+        flushed = 0
+        i = 0
+        while i < len(records):
+            file, record = records[i]
+            run, kind, data = record["run"], record["type"], record["data"]
+
+            if kind != "start" and run not in runs:
+                logger.warning(f"Dropping spooled MLflow record {file.name} of unknown run {run}")
+                file.unlink()
+                i += 1
+                continue
+
+            if kind == "start":
+                if run not in runs:
+                    runs[run] = _remote_run(client, config, run, data["run_name"], record["timestamp"])
+                    _save_runs(spool_dir, runs)
+                batch = [file]
+
+            elif kind in ("params", "metrics"):
+                # Combine consecutive params/metrics records of the same run into one request.
+                params, metrics, batch = [], [], []
+                j = i
+                while j < len(records) and len(batch) < config.batch_size:
+                    other_file, other = records[j]
+                    if other["run"] != run or other["type"] not in ("params", "metrics"):
+                        break
+                    new_params, new_metrics = _entities(other, Param, Metric)
+                    if batch and (len(params) + len(new_params) > MAX_BATCH_PARAMS
+                                  or len(metrics) + len(new_metrics) > MAX_BATCH_METRICS):
+                        break
+                    params += new_params
+                    metrics += new_metrics
+                    batch.append(other_file)
+                    j += 1
+                client.log_batch(runs[run], metrics=metrics, params=params)
+                i = j - 1
+
+            elif kind == "artifact":
+                client.log_artifact(runs[run], data["path"], data["artifact_path"])
+                shutil.rmtree(Path(data["path"]).parent, ignore_errors=True)
+                batch = [file]
+
+            elif kind == "model":
+                client.log_artifacts(runs[run], data["path"], "model")
+                if data["registered_model_name"] and urlparse(config.tracking_uri).scheme not in ("", "file"):
+                    name = data["registered_model_name"]
+                    if not client.search_registered_models(filter_string=f"name='{name}'"):
+                        client.create_registered_model(name)
+                    source = f"{client.get_run(runs[run]).info.artifact_uri}/model"
+                    client.create_model_version(name, source, runs[run])
+                shutil.rmtree(Path(data["path"]).parent, ignore_errors=True)
+                batch = [file]
+
+            elif kind == "end":
+                client.set_terminated(runs[run], status=data["status"], end_time=record["timestamp"])
+                runs.pop(run, None)
+                _save_runs(spool_dir, runs)
+                batch = [file]
+
+            else:
+                raise ValueError(f"Unknown spooled MLflow record type: {kind}")
+
+            for done in batch:
+                done.unlink()
+            flushed += len(batch)
+            i += 1
+
+        if flushed:
+            logger.info(f"Flushed {flushed} MLflow records to {config.tracking_uri}")
+        return flushed
+
+
+_tracker = None
+_tracker_lock = threading.Lock()
+
+
+def get_mlflow_logger() -> SpoolingMLflowLogger:
+    """
+    Return the process-wide MLflow logger, creating it from config.yaml on first use or after ``close``.
+    """
+    global _tracker
+    with _tracker_lock:
+        if _tracker is None or _tracker.closed:
+            from src.config.configuration import ConfigurationManager
+            _tracker = SpoolingMLflowLogger(ConfigurationManager().get_mlflow_logger_config())
+        return _tracker
+
+
+if __name__ == "__main__":
+    # Detached flush process started by SpoolingMLflowLogger.close.
+    parser = argparse.ArgumentParser(description="Flush a spool of MLflow records, retrying with backoff.")
+    parser.add_argument("--spool-dir", default=None, help="spool to flush; mlflow_logger.spool_dir if omitted")
+    args = parser.parse_args()
+
+    from src.config.configuration import ConfigurationManager
+    config = ConfigurationManager().get_mlflow_logger_config()
+    if args.spool_dir:
+        config = MLflowLoggerConfig(**{**config.__dict__, "spool_dir": Path(args.spool_dir)})
+
+    for attempt in range(config.max_retries + 1):
+        try:
+            flush(config)
+            if not any((Path(config.spool_dir) / PENDING_DIR).glob("*.json")):
+                break
+        except Exception as e:
+            logger.warning(f"MLflow flush failed ({e}); attempt {attempt + 1} of {config.max_retries + 1}")
+        time.sleep(min(config.max_backoff_seconds, 2 ** attempt))
@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+import tensorflow as tf
+
+from src.models.architectures import BACKBONES
+
+
+PREPROCESS = {
+    "mobilenet_v2": tf.keras.applications.mobilenet_v2.preprocess_input,
+    "resnet50": tf.keras.applications.resnet50.preprocess_input,
+    # EfficientNet normalizes inside the model and takes [0, 255] inputs.
+    "efficientnet_b0": lambda x: x,
+}
+
+
+@pytest.mark.parametrize("name", sorted(PREPROCESS))
+def test_adapter_matches_preprocess_input(name, tmp_path):
+    _, adapter = BACKBONES[name]
+    inputs = tf.keras.Input(shape=(4, 4, 3))
+    model = tf.keras.Model(inputs, adapter(inputs))
+    x = np.random.default_rng(0).random((2, 4, 4, 3)).astype(np.float32)
+    expected = PREPROCESS[name](x * 255.0)
+
+    np.testing.assert_allclose(model(x).numpy(), expected, rtol=1e-5, atol=1e-4)
+    # The adapter survives the .h5 round trip the pipeline stages use.
+    model.save(tmp_path / "adapter.h5")
+    reloaded = tf.keras.models.load_model(tmp_path / "adapter.h5", compile=False)
+    np.testing.assert_allclose(reloaded(x).numpy(), expected, rtol=1e-5, atol=1e-4)
+
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+import tensorflow as tf
+from keras.preprocessing.image import apply_affine_transform
+
+from src.preprocess.augmentation import AffineAugmentation
+
+
+def pinned(augmentation: AffineAugmentation, values: list) -> AffineAugmentation:
+    """
+    Make ``_uniform`` return ``values`` in order, one draw per call, for a batch of one.
+    """
+    draws = iter(values)
+    augmentation._uniform = lambda batch_size, low, high: tf.fill([batch_size], float(next(draws)))
+    return augmentation
+
+
+def image(height: int, width: int) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    return rng.uniform(0, 1, (height, width, 3)).astype(np.float32)
+
+
+@pytest.mark.parametrize("size", [(36, 36), (30, 44)])
+@pytest.mark.parametrize("theta, tx, ty, shear, zx, zy", [
+    (20, 0, 0, 0, 1, 1),
+    (0, 0.1, 0, 0, 1, 1),
+    (0, 0, -0.15, 0, 1, 1),
+    (0, 0, 0, 15, 1, 1),
+    (0, 0, 0, 0, 0.8, 1.1),
+    (-25, 0.05, 0.1, 10, 1.1, 0.9)
+])
+def test_matches_keras_apply_affine_transform(size, theta, tx, ty, shear, zx, zy):
+    x = image(*size)
+    augmentation = pinned(AffineAugmentation(horizontal_flip=False), [theta, tx, ty, shear, zx, zy])
+
+    augmented = augmentation(x[np.newaxis]).numpy()[0]
+
+    # Shifts are drawn as fractions and scaled like ImageDataGenerator.get_random_transform.
+    expected = apply_affine_transform(
+        x, theta=theta, tx=tx * size[0], ty=ty * size[1], shear=shear, zx=zx, zy=zy,
+        row_axis=0, col_axis=1, channel_axis=2, fill_mode="nearest", order=1
+    )
+    np.testing.assert_allclose(augmented, expected, atol=1e-4)
+
+
+def test_flip_follows_the_transform():
+    x = image(30, 44)
+    augmentation = pinned(AffineAugmentation(horizontal_flip=True), [20, 0.1, 0, 0, 1, 1, 0.2])
+
+    augmented = augmentation(x[np.newaxis]).numpy()[0]
+
+    expected = apply_affine_transform(
+        x, theta=20, tx=0.1 * 30, row_axis=0, col_axis=1, channel_axis=2, fill_mode="nearest", order=1
+    )
+    np.testing.assert_allclose(augmented, expected[:, ::-1], atol=1e-4)
+
+
+def test_seeded_augmentation_is_deterministic():
+    batch = tf.constant(np.stack([image(16, 16)] * 4))
+
+    first = [AffineAugmentation(seed=3)(batch).numpy() for _ in range(2)]
+    second = AffineAugmentation(seed=3)
+    repeated = [second(batch).numpy(), second(batch).numpy()]
+
+    np.testing.assert_array_equal(first[0], first[1])
+    np.testing.assert_array_equal(first[0], repeated[0])
+    # The generator advances, so the next batch gets new transforms.
+    assert not np.array_equal(repeated[0], repeated[1])
+    assert not np.array_equal(AffineAugmentation(seed=4)(batch).numpy(), first[0])
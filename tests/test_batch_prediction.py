@@ -0,0 +1,84 @@
+import csv
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from src.entity.config_entity import BatchPredictionConfig
+from src.inference import batch_prediction
+from src.inference.batch_prediction import BatchPrediction
+
+
+class CrashingBackend:
+    """
+    Predicts from the mean pixel, raising on call ``crash_on`` like a killed job.
+    """
+
+    calls = 0
+    crash_on = None
+
+    def predict(self, batch):
+        CrashingBackend.calls += 1
+        if CrashingBackend.calls == CrashingBackend.crash_on:
+            raise KeyboardInterrupt
+        mean = batch.mean(axis=(1, 2, 3))
+        return np.stack([mean, 1 - mean], axis=1)
+
+
+@pytest.fixture
+def job(tmp_path, monkeypatch):
+    monkeypatch.setattr(batch_prediction, "load_backend", lambda **kwargs: CrashingBackend())
+    CrashingBackend.calls, CrashingBackend.crash_on = 0, None
+    source = tmp_path / "images"
+    source.mkdir()
+    for i in range(10):
+        Image.fromarray(np.full((4, 4, 3), i * 20, np.uint8)).save(source / f"{i:02d}.png")
+    (source / "05b.png").write_bytes(b"not an image")
+    (tmp_path / "model.h5").write_bytes(b"model")
+    config = BatchPredictionConfig(
+        output_file=tmp_path / "out" / "predictions.csv",
+        progress_file=tmp_path / "out" / "progress.json",
+        path_of_model=tmp_path / "model.h5",
+        tflite_model_path=tmp_path / "model.tflite",
+        params_image_size=[4, 4, 3],
+        params_inference_backend="keras",
+        params_class_names=["adenocarcinoma", "normal"],
+        params_batch_size=2,
+        params_checkpoint_every=2
+    )
+    return BatchPrediction(config), source, config
+
+
+def read_rows(path: Path) -> list:
+    with open(path, newline="") as f:
+        return list(csv.reader(f))
+
+
+def test_resume_truncates_rows_written_after_the_checkpoint(job):
+    prediction, source, config = job
+    CrashingBackend.crash_on = 4
+    with pytest.raises(KeyboardInterrupt):
+        prediction.predict(source)
+    # Three batches reached the file, but only the first two were checkpointed.
+    assert len(read_rows(config.output_file)) == 1 + 6
+
+    progress = prediction.predict(source)
+
+    rows = read_rows(config.output_file)
+    assert rows[0] == ["path", "prob_adenocarcinoma", "prob_normal", "label"]
+    assert [Path(row[0]).name for row in rows[1:]] == [f"{i:02d}.png" for i in range(10)]
+    assert (progress["rows"], progress["skipped"], progress["complete"]) == (10, 1, True)
+
+
+def test_uninterrupted_run_matches_resumed_run(job, tmp_path):
+    prediction, source, config = job
+    CrashingBackend.crash_on = 3
+    with pytest.raises(KeyboardInterrupt):
+        prediction.predict(source)
+    prediction.predict(source)
+    resumed = read_rows(config.output_file)
+
+    CrashingBackend.crash_on = None
+    prediction.predict(source, output=tmp_path / "fresh.csv")
+    assert read_rows(tmp_path / "fresh.csv") == resumed
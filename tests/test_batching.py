@@ -0,0 +1,26 @@
+import numpy as np
+
+from src.inference.batching import MicroBatcher
+
+
+def test_batches_reuse_one_buffer():
+    seen = []
+
+    def predict_fn(batch):
+        seen.append((batch.__array_interface__["data"][0], batch.dtype, len(batch)))
+        np.multiply(batch, 2, out=batch)
+        return batch.sum(axis=1)
+
+    batcher = MicroBatcher(predict_fn, max_batch_size=4, max_wait_ms=200, dtype=np.float32)
+    try:
+        futures = [batcher.submit(np.full(3, i, np.uint8)) for i in range(6)]
+        results = [future.result(5) for future in futures]
+    finally:
+        batcher.close()
+
+    # Items are converted into the float32 buffer, which each batch overwrites in place.
+    assert results == [6.0 * i for i in range(6)]
+    assert [size for _, _, size in seen] == [4, 2]
+    assert len({address for address, _, _ in seen}) == 1
+    assert all(dtype == np.float32 for _, dtype, _ in seen)
+    assert batcher.stats() == {"batches": 2, "items": 6, "mean_batch_size": 3.0}
@@ -0,0 +1,148 @@
+import dataclasses
+from pathlib import Path
+
+import numpy as np
+import pytest
+import tensorflow as tf
+from PIL import Image
+
+from src.entity.config_entity import TrainingConfig
+from src.training.checkpointing import TrainingCheckpoints, run_key
+from src.training.training import Training
+
+
+IMAGE_SIZE = [8, 8, 3]
+
+
+def tiny_model() -> tf.keras.Model:
+    model = tf.keras.Sequential([
+        tf.keras.layers.Flatten(input_shape=IMAGE_SIZE),
+        tf.keras.layers.Dense(2, activation="softmax")
+    ])
+    model.compile(optimizer=tf.keras.optimizers.SGD(0.01), loss="categorical_crossentropy", metrics=["accuracy"])
+    return model
+
+
+def make_dataset_dir(root: Path, per_class: int = 10) -> Path:
+    rng = np.random.default_rng(0)
+    for class_name in ("adenocarcinoma", "normal"):
+        (root / class_name).mkdir(parents=True)
+        for i in range(per_class):
+            Image.fromarray(rng.integers(0, 255, IMAGE_SIZE, dtype=np.uint8)).save(root / class_name / f"{i:03d}.png")
+    return root
+
+
+def training_config(tmp_path: Path, **overrides) -> TrainingConfig:
+    settings = dict(
+        root_dir=tmp_path / "training",
+        trained_model_path=tmp_path / "training" / "model.h5",
+        updated_base_model_path=tmp_path / "base_model_updated.h5",
+        training_data=tmp_path / "data",
+        image_cache_dir=tmp_path / "image_cache",
+        bottleneck_dir=tmp_path / "training" / "bottleneck",
+        checkpoint_dir=tmp_path / "training" / "checkpoints",
+        params_epochs=2,
+        params_batch_size=4,
+        params_is_augmentation=False,
+        params_image_size=IMAGE_SIZE,
+        params_input_pipeline="tf_data",
+        params_training_mode="full",
+        params_checkpoint_every_steps=2,
+        params_checkpoint_max_size_mb=100,
+        params_use_best_checkpoint=False,
+        params_augmentation_seed=7
+    )
+    settings.update(overrides)
+    return TrainingConfig(**settings)
+
+
+def test_rotation_keeps_latest_and_best(tmp_path):
+    model = tiny_model()
+    checkpoints = TrainingCheckpoints(tmp_path, model, max_size_mb=100, key="run")
+    checkpoints.save(1, 0, val_loss=0.5)
+    size = checkpoints.entries[0]["size"]
+    checkpoints.max_size_bytes = 2 * size
+
+    checkpoints.save(1, 2)
+    checkpoints.save(2, 0, val_loss=0.9)
+    checkpoints.save(2, 2)
+
+    assert [(entry["epoch"], entry["step"]) for entry in checkpoints.entries] == [(1, 0), (2, 2)]
+    assert not list(tmp_path.glob("ckpt-0001-000002*"))
+    assert not list(tmp_path.glob("ckpt-0002-000000*"))
+    # The index survives a new instance.
+    assert TrainingCheckpoints(tmp_path, model, max_size_mb=100, key="run").entries == checkpoints.entries
+
+
+def test_restore_latest_falls_back_and_keeps_seed(tmp_path):
+    model = tiny_model()
+    checkpoints = TrainingCheckpoints(tmp_path, model, max_size_mb=100, key="run", seed=123)
+    saved_weights = [w.copy() for w in model.get_weights()]
+    checkpoints.save(1, 0)
+    model.set_weights([w + 1 for w in saved_weights])
+    checkpoints.save(1, 2)
+    for path in tmp_path.glob("ckpt-0001-000002*.index"):
+        path.unlink()
+
+    restored = TrainingCheckpoints(tmp_path, tiny_model(), max_size_mb=100, key="run", seed=None)
+    assert restored.restore_latest() == (1, 0)
+    assert int(restored.seed.numpy()) == 123
+    for weight, expected in zip(restored.model.get_weights(), saved_weights):
+        np.testing.assert_allclose(weight, expected)
+
+
+def test_changed_settings_discard_checkpoints(tmp_path):
+    checkpoints = TrainingCheckpoints(tmp_path, tiny_model(), max_size_mb=100, key="run")
+    checkpoints.save(1, 0)
+
+    fresh = TrainingCheckpoints(tmp_path, tiny_model(), max_size_mb=100, key="other")
+    assert fresh.entries == []
+    assert fresh.restore_latest() == (0, 0)
+    assert not list(tmp_path.glob("ckpt-*"))
+
+
+def test_resumed_epoch_replays_the_same_batches(tmp_path):
+    config = training_config(tmp_path, training_data=make_dataset_dir(tmp_path / "data"))
+    training = Training(config)
+    training.train_valid_generator()
+
+    full = [labels.numpy() for _, labels in training._train_dataset(seed=3)]
+    full_images = [images.numpy() for images, _ in training._train_dataset(seed=3)]
+    resumed = list(training._train_dataset(seed=3, skip_batches=2))
+
+    assert len(resumed) == len(full) - 2
+    for (images, labels), expected_images, expected_labels in zip(resumed, full_images[2:], full[2:]):
+        np.testing.assert_array_equal(labels.numpy(), expected_labels)
+        np.testing.assert_array_equal(images.numpy(), expected_images)
+
+
+@pytest.mark.parametrize("every_n_steps", [2, 4])
+def test_resume_after_checkpoint_on_last_batch(tmp_path, every_n_steps):
+    config = training_config(
+        tmp_path, training_data=make_dataset_dir(tmp_path / "data"), params_checkpoint_every_steps=every_n_steps
+    )
+    tiny_model().save(config.updated_base_model_path)
+
+    # 16 training images in batches of 4: epoch 0 ended at step 4, pre-empted during validation.
+    model = tf.keras.models.load_model(config.updated_base_model_path)
+    TrainingCheckpoints(config.checkpoint_dir, model, max_size_mb=100, key=run_key(config), seed=7).save(0, 4)
+
+    training = Training(config)
+    training.get_base_model()
+    training.train_valid_generator()
+    training.train()
+
+    assert config.trained_model_path.exists()
+    entries = TrainingCheckpoints(config.checkpoint_dir, tiny_model(), max_size_mb=100, key=run_key(config)).entries
+    positions = [(entry["epoch"], entry["step"]) for entry in entries]
+    # Only the second epoch ran, and no mid-epoch checkpoint was written on its last batch.
+    assert positions == ([(0, 4), (1, 2), (2, 0)] if every_n_steps == 2 else [(0, 4), (2, 0)])
+
+
+def test_run_key_ignores_epochs_and_checkpoint_policy(tmp_path):
+    config = training_config(tmp_path)
+    assert run_key(config) == run_key(dataclasses.replace(config, params_epochs=10))
+    assert run_key(config) == run_key(dataclasses.replace(
+        config, params_checkpoint_every_steps=0, params_checkpoint_max_size_mb=1, params_use_best_checkpoint=True
+    ))
+    assert run_key(config) != run_key(dataclasses.replace(config, params_batch_size=8))
@@ -0,0 +1,19 @@
+from types import SimpleNamespace
+
+from src.entity.config_entity import ModelRegistryConfig
+from src.inference import comparison
+from src.inference.comparison import ModelComparison
+from src.models.registry import ModelRegistry
+
+
+def test_groups_fit_the_registry_budget(tmp_path, monkeypatch):
+    registry = ModelRegistry(ModelRegistryConfig(params_memory_budget_mb=2, params_warmup=False))
+    monkeypatch.setattr(comparison, "get_model_registry", lambda: registry)
+    paths = []
+    for name, size_mb in (("a", 1), ("b", 1), ("c", 1), ("d", 3)):
+        paths.append(tmp_path / f"{name}.h5")
+        paths[-1].write_bytes(b"\0" * size_mb * 2 ** 20)
+
+    groups = ModelComparison(SimpleNamespace(params_memory_budget_mb=100))._groups(paths)
+
+    assert groups == [paths[:2], paths[2:3], paths[3:]]
@@ -0,0 +1,61 @@
+from pathlib import Path
+
+import pytest
+import yaml
+
+# src.config imports the top-level packages that `pip install -e .` maps from src/.
+pytest.importorskip("constants.path_conf")
+from src.config.configuration import ConfigurationManager  # noqa: E402
+
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    """
+    Build a ConfigurationManager from the repo's files with some params overridden, run in an empty directory.
+    """
+    monkeypatch.chdir(tmp_path)
+
+    def build(**overrides) -> ConfigurationManager:
+        params = yaml.safe_load((ROOT / "params.yaml").read_text())
+        params.update(overrides)
+        (tmp_path / "params.yaml").write_text(yaml.safe_dump(params))
+        return ConfigurationManager(ROOT / "config" / "config.yaml", tmp_path / "params.yaml", create_dirs=False)
+
+    return build
+
+
+def test_class_names_must_match_classes(manager):
+    with pytest.raises(ValueError, match="CLASSES is 3"):
+        manager(CLASSES=3).get_prediction_config()
+
+
+def test_class_names_must_match_the_dataset(manager, tmp_path):
+    config = manager()
+    assert config.get_prediction_config().params_class_names == ["adenocarcinoma", "normal"]
+
+    data = Path(config.config.data_ingestion.unzip_dir) / "Chest-CT-Scan-data"
+    for name in ("adenocarcinoma", "squamous"):
+        (data / name).mkdir(parents=True)
+    with pytest.raises(ValueError, match="squamous"):
+        config.get_evaluation_config()
+
+    # The image cache's manifest takes precedence over the extracted directories.
+    cache_dir = Path(config.config.image_cache.root_dir)
+    cache_dir.mkdir(parents=True)
+    (cache_dir / "manifest.json").write_text('{"class_names": ["adenocarcinoma", "normal"]}')
+    assert config.get_batch_prediction_config().params_class_names == ["adenocarcinoma", "normal"]
+
+
+def test_create_dirs_false_leaves_no_directories(manager, tmp_path):
+    config = manager()
+    config.get_training_config()
+    config.get_data_ingestion_config()
+    assert list(tmp_path.iterdir()) == [tmp_path / "params.yaml"]
+
+
+def test_registered_model_name_follows_the_backbone(manager):
+    assert manager(BACKBONE="vgg16").get_evaluation_config().registered_model_name == "VGG16Model"
+    assert manager(BACKBONE="resnet50").get_evaluation_config().registered_model_name == "RESNET50Model"
@@ -0,0 +1,135 @@
+import io
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.preprocess import downloader as downloader_module
+from src.preprocess.downloader import Downloader, FileSource, HTTPSource, IncompleteDownload
+from src.utils.common import load_json
+
+
+DATA = bytes(range(256)) * 800
+
+
+class FlakySource:
+    """
+    Serves DATA, cutting the body of the first ``failures`` requests short.
+    """
+
+    def __init__(self, failures: int, announce_size: bool = True):
+        self.failures = failures
+        self.announce_size = announce_size
+        self.offsets = []
+
+    def open(self, offset):
+        self.offsets.append(offset)
+        end = len(DATA)
+        if self.failures:
+            self.failures -= 1
+            end = offset + (len(DATA) - offset) // 2
+        return io.BytesIO(DATA[offset:end]), True, len(DATA) if self.announce_size else None
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(downloader_module.time, "sleep", lambda seconds: None)
+
+
+def make_downloader(tmp_path, source, **kwargs):
+    return Downloader(source, tmp_path / "data.zip", tmp_path / "manifest.json", chunk_size=4096, **kwargs)
+
+
+def test_file_source_download_and_skip(tmp_path):
+    (tmp_path / "remote.zip").write_bytes(DATA)
+    downloader = make_downloader(tmp_path, FileSource((tmp_path / "remote.zip").as_uri()))
+
+    assert downloader.download()
+    assert (tmp_path / "data.zip").read_bytes() == DATA
+    assert load_json(tmp_path / "manifest.json")["sha256"] == hashlib.sha256(DATA).hexdigest()
+    assert not downloader.download()
+
+
+def test_short_read_is_resumed(tmp_path):
+    source = FlakySource(failures=2)
+    downloader = make_downloader(tmp_path, source, max_retries=3)
+
+    assert downloader.download()
+    assert (tmp_path / "data.zip").read_bytes() == DATA
+    # Each retry resumes from the bytes already received.
+    assert source.offsets[0] == 0 and source.offsets[1] > 0 and source.offsets[2] > source.offsets[1]
+
+
+def test_short_read_fails_after_retries(tmp_path):
+    downloader = make_downloader(tmp_path, FlakySource(failures=5), max_retries=2)
+
+    with pytest.raises(IncompleteDownload):
+        downloader.download()
+    assert not (tmp_path / "data.zip").exists()
+    assert not (tmp_path / "manifest.json").exists()
+
+
+def test_oversized_partial_file_restarts(tmp_path):
+    (tmp_path / "data.zip.part").write_bytes(DATA + b"stale")
+    source = FlakySource(failures=0)
+    downloader = make_downloader(tmp_path, source, max_retries=2)
+
+    assert downloader.download()
+    assert (tmp_path / "data.zip").read_bytes() == DATA
+    assert source.offsets == [len(DATA) + 5, 0]
+
+
+def test_unannounced_size_is_not_trusted(tmp_path):
+    downloader = make_downloader(tmp_path, FlakySource(failures=0, announce_size=False))
+
+    assert downloader.download()
+    assert load_json(tmp_path / "manifest.json")["sha256"] is None
+    assert not downloader.is_verified()
+
+
+def test_expected_digest_mismatch(tmp_path):
+    downloader = make_downloader(tmp_path, FlakySource(failures=0), expected_sha256="0" * 64)
+
+    with pytest.raises(ValueError):
+        downloader.download()
+    assert not (tmp_path / "data.zip.part").exists()
+
+
+class TruncatingHandler(BaseHTTPRequestHandler):
+    """
+    Announces the whole of DATA but closes the connection after a fifth of it, except on ranged requests.
+    """
+
+    def do_GET(self):
+        requested = self.headers.get("Range")
+        if requested:
+            start = int(requested.split("=")[1].rstrip("-"))
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{len(DATA) - 1}/{len(DATA)}")
+            self.send_header("Content-Length", str(len(DATA) - start))
+            self.end_headers()
+            self.wfile.write(DATA[start:])
+        else:
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(DATA)))
+            self.end_headers()
+            self.wfile.write(DATA[:len(DATA) // 5])
+        self.close_connection = True
+
+    def log_message(self, *args):
+        pass
+
+
+def test_http_truncated_body_is_resumed(tmp_path):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), TruncatingHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/data.zip"
+        downloader = make_downloader(tmp_path, HTTPSource(url, timeout=5), max_retries=3)
+        assert downloader.download()
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert (tmp_path / "data.zip").read_bytes() == DATA
+    assert load_json(tmp_path / "manifest.json")["sha256"] == hashlib.sha256(DATA).hexdigest()
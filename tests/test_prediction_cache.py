@@ -0,0 +1,128 @@
+import os
+
+import numpy as np
+import pytest
+
+from src.entity.config_entity import PredictionConfig
+from src.inference import prediction as prediction_module
+from src.inference.prediction import Prediction
+from src.inference.prediction_cache import PredictionCache, content_key, model_version
+
+
+def probabilities(value: float) -> np.ndarray:
+    return np.array([value, 1 - value], dtype=np.float32)
+
+
+def test_lru_evicts_least_recently_used():
+    cache = PredictionCache(max_entries=2)
+    cache.put("a", probabilities(0.1))
+    cache.put("b", probabilities(0.2))
+    assert cache.get("a") is not None
+    cache.put("c", probabilities(0.3))
+
+    assert cache.get("b") is None
+    np.testing.assert_array_equal(cache.get("a"), probabilities(0.1))
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["entries"] == 2
+
+
+def test_hit_rate_counts_only_counted_misses():
+    cache = PredictionCache(max_entries=4)
+    cache.put("a", probabilities(0.1))
+    cache.get("a")
+    cache.get("a")
+    cache.get("upload", count_miss=False)
+    cache.get("pixels")
+
+    stats = cache.stats()
+    assert (stats["memory_hits"], stats["misses"]) == (2, 1)
+    assert stats["hit_rate"] == pytest.approx(2 / 3)
+
+
+def test_version_switch_drops_entries_and_stale_puts(tmp_path):
+    cache = PredictionCache(max_entries=4, disk_dir=tmp_path, version="v1")
+    cache.put("a", probabilities(0.1), version="v1")
+    cache.set_version("v2")
+
+    assert cache.get("a") is None
+    assert [path.name for path in tmp_path.iterdir()] == ["v2"]
+    # A prediction that started under the old model is not cached.
+    cache.put("b", probabilities(0.2), version="v1")
+    assert cache.get("b") is None
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_disk_tier_survives_a_restart(tmp_path):
+    PredictionCache(max_entries=4, disk_dir=tmp_path, version="v1").put("a", probabilities(0.1))
+
+    cache = PredictionCache(max_entries=4, disk_dir=tmp_path, version="v1")
+    np.testing.assert_array_equal(cache.get("a"), probabilities(0.1))
+    assert cache.get("a") is not None
+    assert (cache.stats()["disk_hits"], cache.stats()["memory_hits"]) == (1, 1)
+
+
+def test_content_key_matches_str_and_bytes():
+    assert content_key("abc") == content_key(b"abc")
+    assert content_key(np.zeros(3, np.uint8)) != content_key(np.ones(3, np.uint8))
+
+
+class FakeBackend:
+    """
+    Predicts a constant distribution; ``generation`` tells reloads apart.
+    """
+
+    def __init__(self, generation: int):
+        self.generation = generation
+
+    def predict(self, batch):
+        return np.tile(probabilities(0.9), (len(batch), 1))
+
+
+@pytest.fixture
+def served(tmp_path, monkeypatch):
+    """
+    A Prediction over a placeholder model file, with a backend reloaded from a counter.
+    """
+    loads = []
+    monkeypatch.setattr(prediction_module, "load_backend", lambda **kwargs: loads.append(1) or FakeBackend(len(loads)))
+    model_path = tmp_path / "model.h5"
+    model_path.write_bytes(b"v1")
+    config = PredictionConfig(
+        path_of_model=model_path,
+        tflite_model_path=tmp_path / "model.tflite",
+        params_image_size=[8, 8, 3],
+        params_inference_backend="keras",
+        params_class_names=["adenocarcinoma", "normal"],
+        params_max_batch_size=4,
+        params_max_wait_ms=1,
+        cache_dir=tmp_path / "cache",
+        params_cache_size=8,
+        params_cache_disk=False
+    )
+    prediction = Prediction(config)
+    yield prediction, model_path
+    prediction.batcher.close()
+
+
+def test_rewritten_model_is_reloaded_and_switches_the_cache(served):
+    prediction, model_path = served
+    prediction.cache.put("a", probabilities(0.1))
+
+    model_path.write_bytes(b"version 2")
+    prediction._check_model()
+
+    assert prediction.backend.generation == 2
+    assert prediction.cache.version == model_version(model_path)
+    assert prediction.cache.get("a") is None
+
+
+def test_missing_model_file_keeps_serving(served):
+    prediction, model_path = served
+    version = prediction.cache.version
+    os.replace(model_path, model_path.with_name("moved.h5"))
+
+    prediction._check_model()
+    prediction._check_model()
+
+    assert prediction.backend.generation == 1
+    assert prediction.cache.version == version
@@ -0,0 +1,64 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import tensorflow as tf
+
+from src.entity.config_entity import ModelRegistryConfig
+from src.models import registry as registry_module
+from src.models.registry import ModelRegistry
+
+
+@pytest.fixture
+def loads(monkeypatch):
+    """
+    Replace load_model with one that blocks on ``release[path name]`` and counts its calls.
+    """
+    release = {"slow.h5": threading.Event()}
+    calls = []
+
+    def load_model(path):
+        calls.append(path.name)
+        if path.name in release:
+            assert release[path.name].wait(10)
+        if path.name == "broken.h5":
+            raise OSError("truncated model file")
+        return tf.keras.Sequential([tf.keras.layers.Dense(1, input_shape=(2,))])
+
+    monkeypatch.setattr(registry_module.tf.keras.models, "load_model", load_model)
+    return release, calls
+
+
+def make_registry() -> ModelRegistry:
+    return ModelRegistry(ModelRegistryConfig(params_memory_budget_mb=100, params_warmup=False))
+
+
+def test_slow_load_does_not_block_other_models(tmp_path, loads):
+    release, calls = loads
+    for name in ("slow.h5", "fast.h5"):
+        (tmp_path / name).write_bytes(b"model")
+    registry = make_registry()
+    fast = registry.get(tmp_path / "fast.h5")
+
+    with ThreadPoolExecutor(2) as pool:
+        slow = [pool.submit(registry.get, tmp_path / "slow.h5") for _ in range(2)]
+        # Served while slow.h5 is still loading.
+        assert registry.get(tmp_path / "fast.h5") is fast
+        release["slow.h5"].set()
+        first, second = (future.result(10) for future in slow)
+
+    assert first is second
+    assert calls == ["fast.h5", "slow.h5"]
+    assert registry.stats()["misses"] == 2
+
+
+def test_failed_load_is_retried(tmp_path, loads):
+    _, calls = loads
+    (tmp_path / "broken.h5").write_bytes(b"model")
+    registry = make_registry()
+
+    for _ in range(2):
+        with pytest.raises(OSError):
+            registry.get(tmp_path / "broken.h5")
+    assert calls == ["broken.h5", "broken.h5"]
+    assert registry.stats()["models"] == []
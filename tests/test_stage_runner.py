@@ -0,0 +1,197 @@
+import ast
+import sys
+import json
+from pathlib import Path
+
+import pytest
+import tensorflow as tf
+
+from src.entity.config_entity import StageConfig, StageRunnerConfig
+from src.pipeline.scheduler import StageScheduler
+from src.pipeline.stage_runner import StageRunner
+from src.pipeline.stages import build_stages, check_stages
+from src.utils.common import read_yaml
+
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+# Where the fake pipelines below write; set by the ``workdir`` fixture.
+WORKDIR = None
+
+
+class ProducePipeline:
+    """
+    Hands a small model to later stages, saved in the background.
+    """
+
+    def __init__(self, context=None):
+        self.context = context
+
+    def main(self):
+        model = tf.keras.Sequential([tf.keras.layers.Dense(2, input_shape=(3,))])
+        self.context.put(WORKDIR / "model.h5", model)
+
+
+class FailPipeline:
+    """
+    Fails like a pre-empted stage, after noting which stages were recorded while it ran.
+    """
+
+    recorded = None
+
+    def __init__(self, context=None):
+        self.context = context
+
+    def main(self):
+        # Let the save thread drain, as it does while a long stage runs.
+        self.context.after_saves(lambda: None).result()
+        FailPipeline.recorded = list(json.loads((WORKDIR / "state.json").read_text()))
+        raise RuntimeError("pre-empted")
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    monkeypatch.setattr(sys.modules[__name__], "WORKDIR", tmp_path)
+    return tmp_path
+
+
+def runner_config(workdir: Path, params: dict = None, config: dict = None) -> StageRunnerConfig:
+    return StageRunnerConfig(
+        state_file=workdir / "state.json",
+        max_workers=1,
+        report_file=workdir / "report.json",
+        trace_dir=workdir / "traces",
+        trace_stages=[],
+        config=config or {},
+        params=params or {}
+    )
+
+
+def stage(key: str, pipeline: str = "", depends_on=(), outputs=(), **kwargs) -> StageConfig:
+    settings = dict(params=[], config_sections=[], inputs=[], code=[])
+    settings.update(kwargs)
+    return StageConfig(
+        key=key, name=key, pipeline=pipeline, depends_on=list(depends_on), outputs=list(outputs), **settings
+    )
+
+
+def test_in_process_records_stages_before_a_later_failure(workdir):
+    stages = [
+        stage("produce", f"{__name__}:ProducePipeline", outputs=[workdir / "model.h5"]),
+        stage("fail", f"{__name__}:FailPipeline", depends_on=["produce"])
+    ]
+    runner = StageRunner(runner_config(workdir))
+
+    with pytest.raises(RuntimeError):
+        StageScheduler(runner, stages, in_process=True).run()
+
+    # Recorded while the later stage was still running, not only once the run ended.
+    assert FailPipeline.recorded == ["produce"]
+    assert (workdir / "model.h5").exists()
+    state = json.loads((workdir / "state.json").read_text())
+    assert list(state) == ["produce"]
+    assert runner.is_up_to_date(stages[0], runner.fingerprint(stages[0]))
+
+
+def test_fingerprint_tracks_declared_params_config_inputs_and_code(workdir):
+    (workdir / "data.txt").write_text("data")
+    (workdir / "stage.py").write_text("x = 1")
+    declared = stage(
+        "train", params=["EPOCHS"], config_sections=["training"],
+        inputs=[workdir / "data.txt"], code=[workdir / "stage.py"]
+    )
+    params, config = {"EPOCHS": 1, "SEED": 0}, {"training": {"dir": "a"}, "other": {}}
+    fingerprint = lambda: StageRunner(runner_config(workdir, params, config)).fingerprint(declared)
+    original = fingerprint()
+
+    params["SEED"], config["other"] = 1, {"x": 1}
+    assert fingerprint() == original
+    # Rewriting code with the same contents is not a change.
+    (workdir / "stage.py").write_text("x = 1")
+    assert fingerprint() == original
+
+    changes = [
+        lambda: params.update(EPOCHS=2),
+        lambda: config.update(training={"dir": "b"}),
+        lambda: (workdir / "data.txt").write_text("more data"),
+        lambda: (workdir / "stage.py").write_text("x = 2")
+    ]
+    seen = {original}
+    for change in changes:
+        change()
+        seen.add(fingerprint())
+    assert len(seen) == len(changes) + 1
+
+
+def test_changed_outputs_rerun_a_stage(workdir):
+    (workdir / "model.h5").write_text("model")
+    declared = stage("train", outputs=[workdir / "model.h5"])
+    runner = StageRunner(runner_config(workdir))
+    runner.record(declared, runner.fingerprint(declared))
+    assert runner.is_up_to_date(declared, runner.fingerprint(declared))
+
+    (workdir / "model.h5").write_text("edited model")
+    assert not runner.is_up_to_date(declared, runner.fingerprint(declared))
+
+
+def _imported_modules(path: Path) -> set:
+    """
+    Source files of the ``src`` modules imported by the file at ``path``.
+    """
+    def source(module):
+        file = ROOT.joinpath(*module.split(".")).with_suffix(".py")
+        return file if file.exists() else ROOT.joinpath(*module.split("."), "__init__.py")
+
+    found = set()
+    for node in ast.walk(ast.parse(path.read_text())):
+        if isinstance(node, ast.ImportFrom) and (node.module or "").startswith("src"):
+            for alias in node.names:
+                submodule = source(f"{node.module}.{alias.name}")
+                found.add(submodule if submodule.exists() else source(node.module))
+    return found
+
+
+@pytest.mark.parametrize("input_pipeline", ["cache", "tf_data"])
+def test_stage_code_covers_imported_modules(monkeypatch, input_pipeline):
+    monkeypatch.chdir(ROOT)
+    params = read_yaml(Path("params.yaml"))
+    params.INPUT_PIPELINE = input_pipeline
+    # Logging and step names do not change what a stage produces.
+    ignored = {ROOT / "src" / "logging.py", ROOT / "src" / "constants" / "constants.py"}
+
+    for declared in build_stages(read_yaml(Path("config/config.yaml")), params):
+        code = [ROOT / path for path in declared.code]
+        pending, imported = [ROOT.joinpath(*declared.pipeline.split(":")[0].split(".")).with_suffix(".py")], set()
+        while pending:
+            path = pending.pop()
+            if path not in imported:
+                imported.add(path)
+                pending.extend(_imported_modules(path))
+
+        missing = [
+            str(path.relative_to(ROOT)) for path in imported - ignored
+            if not any(path == covered or covered in path.parents for covered in code)
+        ]
+        assert missing == [], declared.key
+
+
+def test_image_cache_stage_only_with_the_cache_pipeline(monkeypatch):
+    monkeypatch.chdir(ROOT)
+    config, params = read_yaml(Path("config/config.yaml")), read_yaml(Path("params.yaml"))
+    image_cache_dir = Path(config.image_cache.root_dir)
+
+    params.INPUT_PIPELINE = "cache"
+    cached = {declared.key: declared for declared in build_stages(config, params)}
+    assert "image_cache" in cached["training"].depends_on
+    assert image_cache_dir in cached["evaluation"].inputs
+    # Evaluation logs to the tracking server configured there.
+    assert "mlflow_logger" in cached["evaluation"].config_sections
+
+    params.INPUT_PIPELINE = "tf_data"
+    stages = build_stages(config, params)
+    assert "image_cache" not in [declared.key for declared in stages]
+    assert check_stages(stages, config, params) == []
+    for declared in stages:
+        assert "image_cache" not in declared.depends_on
+        assert image_cache_dir not in declared.inputs, declared.key
@@ -0,0 +1,70 @@
+from types import SimpleNamespace
+
+import numpy as np
+import tensorflow as tf
+
+from src.models import tflite_export
+from src.models.tflite_export import TFLiteExport
+from src.preprocess import input_pipeline
+
+
+class ShapeRecordingBackend:
+    """
+    Predicts the first class and records the batch shape of every call.
+    """
+
+    def __init__(self):
+        self.shapes = []
+
+    def predict(self, batch):
+        self.shapes.append(batch.shape)
+        return np.tile([1.0, 0.0], (len(batch), 1))
+
+
+def test_latency_is_timed_apart_from_the_accuracy_pass(monkeypatch):
+    export = TFLiteExport(SimpleNamespace(params_latency_samples=5))
+    labels = tf.one_hot([0, 0, 1, 0], 2)
+    batches = [(tf.zeros([4, 2, 2, 3]), labels), (tf.zeros([4, 2, 2, 3]), labels)]
+    monkeypatch.setattr(export, "_validation_dataset", lambda: batches)
+    backend = ShapeRecordingBackend()
+
+    result = export.measure(backend)
+
+    assert result["accuracy"] == 0.75
+    # Both full batches first, then a warm-up and five timed batch-1 calls.
+    assert backend.shapes == [(4, 2, 2, 3)] * 2 + [(1, 2, 2, 3)] * 6
+    assert result["latency_ms_mean"] is not None
+
+
+def test_calibration_samples_only_training_images(tmp_path, monkeypatch):
+    filepaths = [f"{name}/{i:02d}.png" for name in ("adenocarcinoma", "normal") for i in range(10)]
+    labels = [0] * 10 + [1] * 10
+    monkeypatch.setattr(input_pipeline, "list_image_files", lambda directory: (filepaths, labels, ["a", "n"]))
+    monkeypatch.setattr(input_pipeline, "load_image", lambda path, image_size: tf.constant(float(filepaths.index(path))))
+    export = TFLiteExport(SimpleNamespace(training_data=tmp_path, params_calibration_samples=100, params_image_size=[1]))
+
+    calibrated = sorted(int(batch[0].numpy()[0] * 255 + 0.5) for batch in export._representative_dataset())
+
+    validation = input_pipeline.subset_indices(labels, "validation", validation_split=0.30)
+    assert calibrated == sorted(set(range(20)) - set(validation))
+
+
+def test_stale_model_is_removed_when_no_variant_fits_the_budget(tmp_path, monkeypatch):
+    (tmp_path / "model.h5").write_bytes(b"keras")
+    (tmp_path / "model.tflite").write_bytes(b"selected by an earlier run")
+    export = TFLiteExport(SimpleNamespace(
+        root_dir=tmp_path, trained_model_path=tmp_path / "model.h5", tflite_model_path=tmp_path / "model.tflite",
+        params_quantizations=["dynamic_range", "int8"], params_accuracy_budget=0.01
+    ))
+    keras_backend = SimpleNamespace(model=None)
+    monkeypatch.setattr(tflite_export, "KerasBackend", lambda path: keras_backend)
+    monkeypatch.setattr(tflite_export, "TFLiteBackend", lambda path: path)
+    monkeypatch.setattr(export, "convert", lambda quantization: b"tflite")
+    monkeypatch.setattr(export, "measure", lambda backend: {
+        "accuracy": 0.9 if backend is keras_backend else 0.8, "latency_ms_mean": 1.0, "latency_ms_p50": 1.0
+    })
+
+    export.export()
+
+    assert not (tmp_path / "model.tflite").exists()
+    assert (tmp_path / "model_int8.tflite").exists()
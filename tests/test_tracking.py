@@ -0,0 +1,159 @@
+import json
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+import tensorflow as tf
+
+from src.entity.config_entity import MLflowLoggerConfig
+from src.utils import tracking
+from src.utils.tracking import SpoolingMLflowLogger, flush, RUN_TAG
+
+
+class FakeClient:
+    """
+    Records the calls flush makes; ``fail_on`` names a method that raises once.
+    """
+
+    def __init__(self):
+        self.calls = []
+        self.runs = {}
+        self.fail_on = None
+
+    def _call(self, name, *args):
+        if self.fail_on == name:
+            self.fail_on = None
+            raise ConnectionError(f"{name} failed")
+        self.calls.append((name, *args))
+
+    def search_runs(self, experiment_ids, filter_string, max_results):
+        tag = filter_string.split("'")[1]
+        return [SimpleNamespace(info=SimpleNamespace(run_id=run_id)) for run_id, tags in self.runs.items()
+                if tags.get(RUN_TAG) == tag]
+
+    def create_run(self, experiment_id, start_time, tags):
+        self._call("create_run", tags.get("mlflow.runName"))
+        run_id = f"remote-{len(self.runs)}"
+        self.runs[run_id] = tags
+        return SimpleNamespace(info=SimpleNamespace(run_id=run_id))
+
+    def log_batch(self, run_id, metrics, params):
+        self._call("log_batch", run_id, sorted(p.key for p in params), sorted((m.key, m.step) for m in metrics))
+
+    def log_artifact(self, run_id, path, artifact_path):
+        self._call("log_artifact", run_id, Path(path).name, artifact_path)
+
+    def set_terminated(self, run_id, status, end_time):
+        self._call("set_terminated", run_id, status)
+
+
+def logger_config(tmp_path: Path, **overrides) -> MLflowLoggerConfig:
+    settings = dict(
+        tracking_uri=(tmp_path / "mlruns").as_uri(),
+        spool_dir=tmp_path / "spool",
+        experiment_id="0",
+        batch_size=3,
+        max_retries=2,
+        max_backoff_seconds=1,
+        poll_seconds=3600,
+        drain_timeout=0
+    )
+    settings.update(overrides)
+    return MLflowLoggerConfig(**settings)
+
+
+@pytest.fixture
+def spool(tmp_path, monkeypatch):
+    """
+    A logger whose flush thread never runs on its own, and the fake client flush uses.
+    """
+    client = FakeClient()
+    monkeypatch.setattr(tracking, "_client", lambda config: client)
+    monkeypatch.setattr(SpoolingMLflowLogger, "_run", lambda self: None)
+    config = logger_config(tmp_path)
+    return SpoolingMLflowLogger(config), config, client
+
+
+def test_flush_keeps_order_and_batches_consecutive_records(spool, tmp_path):
+    logger, config, client = spool
+    first = logger.start_run("first")
+    logger.log_params(first, {"a": 1, "b": 2})
+    for step in range(4):
+        logger.log_metrics(first, {"loss": 1.0 / (step + 1)}, step=step)
+    second = logger.start_run("second")
+    logger.log_metrics(second, {"accuracy": 0.5})
+    logger.log_metrics(first, {"loss": 0.1}, step=4)
+    (tmp_path / "notes.txt").write_text("notes")
+    logger.log_artifact(first, tmp_path / "notes.txt", "reports")
+    logger.end_run(first)
+    logger.end_run(second)
+
+    assert flush(config) == 12
+    assert client.calls == [
+        ("create_run", "first"),
+        # batch_size 3: params plus two metrics records, then the other two.
+        ("log_batch", "remote-0", ["a", "b"], [("loss", 0), ("loss", 1)]),
+        ("log_batch", "remote-0", [], [("loss", 2), ("loss", 3)]),
+        ("create_run", "second"),
+        ("log_batch", "remote-1", [], [("accuracy", 0)]),
+        ("log_batch", "remote-0", [], [("loss", 4)]),
+        ("log_artifact", "remote-0", "notes.txt", "reports"),
+        ("set_terminated", "remote-0", "FINISHED"),
+        ("set_terminated", "remote-1", "FINISHED"),
+    ]
+    assert logger.pending() == []
+    assert json.loads((config.spool_dir / tracking.RUNS_FILE).read_text()) == {}
+
+
+def test_failed_flush_resumes_where_it_stopped(spool):
+    logger, config, client = spool
+    run = logger.start_run()
+    logger.log_metrics(run, {"loss": 1.0})
+    logger.end_run(run)
+
+    client.fail_on = "set_terminated"
+    with pytest.raises(ConnectionError):
+        flush(config)
+    assert len(logger.pending()) == 1
+
+    assert flush(config) == 1
+    assert [call[0] for call in client.calls] == ["create_run", "log_batch", "set_terminated"]
+
+
+def test_run_created_before_a_crash_is_not_duplicated(spool, monkeypatch):
+    logger, config, client = spool
+    run = logger.start_run("evaluation")
+    logger.end_run(run)
+
+    save_runs = tracking._save_runs
+    def crash(spool_dir, runs):
+        monkeypatch.setattr(tracking, "_save_runs", save_runs)
+        raise OSError("killed")
+    monkeypatch.setattr(tracking, "_save_runs", crash)
+
+    with pytest.raises(OSError):
+        flush(config)
+    assert flush(config) == 2
+    assert [call[0] for call in client.calls] == ["create_run", "set_terminated"]
+    assert client.runs["remote-0"][RUN_TAG] == run
+
+
+def test_logged_model_loads_with_mlflow(tmp_path, monkeypatch):
+    import mlflow.keras
+    from mlflow.tracking import MlflowClient
+
+    monkeypatch.setattr(SpoolingMLflowLogger, "_run", lambda self: None)
+    config = logger_config(tmp_path)
+    logger = SpoolingMLflowLogger(config)
+    model = tf.keras.Sequential([tf.keras.layers.Dense(2, input_shape=(3,))])
+
+    run = logger.start_run()
+    logger.log_model(run, model, registered_model_name="VGG16Model")
+    logger.end_run(run)
+    flush(config)
+
+    remote = MlflowClient(tracking_uri=config.tracking_uri).search_runs(["0"])[0]
+    mlflow.set_tracking_uri(config.tracking_uri)
+    loaded = mlflow.keras.load_model(f"runs:/{remote.info.run_id}/model")
+    assert loaded.output_shape == model.output_shape
+    assert not list((config.spool_dir / tracking.ARTIFACTS_DIR).iterdir())
@@ -0,0 +1,63 @@
+import os
+import shutil
+
+import numpy as np
+import pytest
+import tensorflow as tf
+
+from src.models import weights_store
+from src.models.weights_store import WeightsStore
+
+
+def tiny_backbone(seed: int) -> tf.keras.Model:
+    tf.keras.utils.set_random_seed(seed)
+    return tf.keras.Sequential([tf.keras.layers.Dense(4, input_shape=(3,)), tf.keras.layers.Dense(2)])
+
+
+@pytest.fixture
+def hashes(monkeypatch):
+    """
+    Count the files whose digest is computed.
+    """
+    counted = []
+    sha256sum = weights_store.sha256sum
+    monkeypatch.setattr(weights_store, "sha256sum", lambda path: counted.append(path) or sha256sum(path))
+    return counted
+
+
+def test_load_restores_weights_and_verifies_once(tmp_path, hashes):
+    store = WeightsStore(tmp_path / "store")
+    source = tiny_backbone(0)
+    store.add(WeightsStore.key("tiny", False), source)
+
+    for _ in range(2):
+        model = tiny_backbone(1)
+        store.load(model, "tiny", include_top=False)
+        for loaded, expected in zip(model.get_weights(), source.get_weights()):
+            np.testing.assert_array_equal(loaded, expected)
+    # Hashed when added; verified loads on the same machine skip the digest.
+    assert len(hashes) == 1
+
+
+def test_copied_store_is_verified_where_it_lands(tmp_path, hashes):
+    store = WeightsStore(tmp_path / "store")
+    store.add(WeightsStore.key("tiny", False), tiny_backbone(0))
+
+    # Like `cp -a`: contents, manifest and timestamps all copied.
+    shutil.copytree(tmp_path / "store", tmp_path / "offline", copy_function=shutil.copy2)
+    path = tmp_path / "offline" / "tiny_notop.npy"
+    stat = path.stat()
+    with open(path, "r+b") as f:
+        f.seek(-4, os.SEEK_END)
+        f.write(b"\x00\x00\x80\x7f")
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    with pytest.raises(ValueError, match="SHA-256 mismatch"):
+        WeightsStore(tmp_path / "offline", offline=True).load(tiny_backbone(1), "tiny", include_top=False)
+    assert hashes[-1] == path
+
+
+def test_offline_missing_weights_raise(tmp_path):
+    store = WeightsStore(tmp_path / "store", offline=True)
+    with pytest.raises(FileNotFoundError, match="offline"):
+        store.load(tiny_backbone(0), "vgg16", include_top=False)